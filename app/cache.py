@@ -0,0 +1,103 @@
+"""Bounded in-memory caches shared by the engine and API layers."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, Optional, Tuple, TypeVar
+
+from .models import CacheStats
+
+ValueT = TypeVar("ValueT")
+
+
+class LRUCache(Generic[ValueT]):
+    """Thread-safe least-recently-used cache bounded by entries and bytes.
+
+    Callers supply the approximate size of each value when storing it; entries
+    are evicted from the cold end until both bounds hold again. Values larger
+    than the byte bound are never stored. With ``ttl_seconds`` set, entries
+    older than the TTL are treated as misses and dropped on access.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        max_entries: int,
+        max_bytes: int,
+        ttl_seconds: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._name = name
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[ValueT, int, float]]" = OrderedDict()
+        self._size_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the cache can hold any entries at all."""
+        return self._max_entries > 0 and self._max_bytes > 0
+
+    def get(self, key: Hashable) -> Optional[ValueT]:
+        """Return the cached value for ``key`` and mark it recently used."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[2] <= self._clock():
+                del self._entries[key]
+                self._size_bytes -= entry[1]
+                self._expirations += 1
+                entry = None
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, value: ValueT, size_bytes: int) -> None:
+        """Store ``value`` under ``key``, evicting cold entries as required."""
+        if not self.enabled or size_bytes > self._max_bytes:
+            return
+        expires_at = self._clock() + self._ttl_seconds if self._ttl_seconds else float("inf")
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size_bytes -= previous[1]
+            self._entries[key] = (value, size_bytes, expires_at)
+            self._size_bytes += size_bytes
+            while len(self._entries) > self._max_entries or self._size_bytes > self._max_bytes:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._size_bytes -= evicted_size
+                self._evictions += 1
+
+    def clear(self) -> None:
+        """Drop every entry while keeping the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._size_bytes = 0
+
+    def stats(self) -> CacheStats:
+        """Return a snapshot of the cache counters."""
+        with self._lock:
+            return CacheStats(
+                name=self._name,
+                entries=len(self._entries),
+                size_bytes=self._size_bytes,
+                max_entries=self._max_entries,
+                max_bytes=self._max_bytes,
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                expirations=self._expirations,
+                ttl_seconds=self._ttl_seconds,
+            )
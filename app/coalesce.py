@@ -0,0 +1,66 @@
+"""Single-flight coalescing of concurrent identical requests."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, Generic, Hashable, Tuple, TypeVar
+
+ResultT = TypeVar("ResultT")
+
+
+class SingleFlight(Generic[ResultT]):
+    """Share one in-flight call per key between concurrent callers.
+
+    A flight started at ``t`` answers every caller for its key that arrives
+    while it is running or before ``t + window_seconds``. Failed flights are
+    not reused once they finish, and successful ones are forgotten when their
+    window closes, so many distinct keys do not accumulate. Must be used from
+    a single event loop.
+    """
+
+    def __init__(self, window_seconds: float = 0.0) -> None:
+        self._window_seconds = window_seconds
+        self._flights: Dict[Hashable, Tuple[float, "asyncio.Future[ResultT]"]] = {}
+        self.leaders = 0
+        self.followers = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[ResultT]]) -> ResultT:
+        """Await the shared flight for ``key``, starting one with ``fn`` if needed."""
+        now = time.monotonic()
+        flight = self._flights.get(key)
+        if flight is not None and self._reusable(flight, now):
+            self.followers += 1
+            return await asyncio.shield(flight[1])
+
+        self.leaders += 1
+        future = asyncio.ensure_future(fn())
+        self._flights[key] = (now, future)
+        future.add_done_callback(lambda done: self._expire(key, done, now))
+        return await asyncio.shield(future)
+
+    def _reusable(self, flight: Tuple[float, "asyncio.Future[ResultT]"], now: float) -> bool:
+        """Whether a flight may still answer new callers."""
+        started_at, future = flight
+        if not future.done():
+            return True
+        if future.cancelled() or future.exception() is not None:
+            return False
+        return now - started_at < self._window_seconds
+
+    def _expire(self, key: Hashable, future: "asyncio.Future[ResultT]", started_at: float) -> None:
+        """Drop a failed flight now and a successful one once its window closes."""
+        if future.cancelled() or future.exception() is not None:
+            self._forget(key, future)
+            return
+        remaining = started_at + self._window_seconds - time.monotonic()
+        if remaining <= 0:
+            self._forget(key, future)
+        else:
+            asyncio.get_running_loop().call_later(remaining, self._forget, key, future)
+
+    def _forget(self, key: Hashable, future: "asyncio.Future[ResultT]") -> None:
+        """Remove the flight for ``key`` if it is still ``future``."""
+        flight = self._flights.get(key)
+        if flight is not None and flight[1] is future:
+            del self._flights[key]
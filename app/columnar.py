@@ -0,0 +1,210 @@
+"""Columnar containers used by the risk engine's vectorised scoring path."""
+
+from __future__ import annotations
+
+import hashlib
+import sys
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Final, List, Optional, Sequence, Set, Tuple, Union
+
+import numpy as np
+
+from .models import (
+    CentralityReport,
+    DeploymentDecision,
+    GraphEdge,
+    HistoricalRecord,
+    ServiceMetrics,
+    SimulationResult,
+    SimulationSummary,
+)
+
+# Column order of the metric matrix held by ``ServiceScoreTable``.
+METRIC_COLUMNS: Final[Tuple[str, ...]] = (
+    "dependency_impact_score",
+    "rollback_rate",
+    "change_frequency",
+    "error_spike_history",
+    "latency_instability",
+    "risk_score",
+)
+
+# Decision codes are the index of the decision within this tuple.
+DECISION_ORDER: Final[Tuple[DeploymentDecision, ...]] = (
+    DeploymentDecision.AUTO_APPROVE,
+    DeploymentDecision.MANUAL_REVIEW,
+    DeploymentDecision.BLOCK_DEPLOYMENT,
+)
+
+RISK_COLUMN: Final[int] = METRIC_COLUMNS.index("risk_score")
+BLOCK_CODE: Final[int] = DECISION_ORDER.index(DeploymentDecision.BLOCK_DEPLOYMENT)
+
+
+@dataclass(frozen=True, eq=False)
+class ServiceScoreTable:
+    """Per-service metrics stored as NumPy columns rather than pydantic models."""
+
+    service_names: Tuple[str, ...]
+    metrics: np.ndarray
+    decision_codes: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.service_names)
+
+    @property
+    def risk_scores(self) -> np.ndarray:
+        """Return the risk score column."""
+        return self.metrics[:, RISK_COLUMN]
+
+    def column(self, name: str) -> np.ndarray:
+        """Return a single metric column by name."""
+        return self.metrics[:, METRIC_COLUMNS.index(name)]
+
+    def decisions(self) -> List[DeploymentDecision]:
+        """Decode the decision column into enum members."""
+        return [DECISION_ORDER[code] for code in self.decision_codes.tolist()]
+
+    def to_models(self) -> List[ServiceMetrics]:
+        """Materialise the table as ``ServiceMetrics`` models for API responses."""
+        rows = self.metrics.tolist()
+        return [
+            ServiceMetrics(
+                service_name=name,
+                **dict(zip(METRIC_COLUMNS, row)),
+                decision=DECISION_ORDER[code],
+            )
+            for name, row, code in zip(self.service_names, rows, self.decision_codes.tolist())
+        ]
+
+    def row(self, index: int) -> ServiceMetrics:
+        """Materialise a single service as a ``ServiceMetrics`` model."""
+        return ServiceMetrics(
+            service_name=self.service_names[index],
+            **dict(zip(METRIC_COLUMNS, self.metrics[index].tolist())),
+            decision=DECISION_ORDER[int(self.decision_codes[index])],
+        )
+
+    def blocked_services(self) -> Set[str]:
+        """Return the names of services whose decision blocks deployment."""
+        return {self.service_names[index] for index in np.flatnonzero(self.decision_codes == BLOCK_CODE)}
+
+    @classmethod
+    def from_models(cls, services: Sequence[ServiceMetrics]) -> "ServiceScoreTable":
+        """Build a table from ``ServiceMetrics`` models, keeping their order."""
+        metrics = np.array(
+            [[getattr(service, column) for column in METRIC_COLUMNS] for service in services],
+            dtype=float,
+        ).reshape(len(services), len(METRIC_COLUMNS))
+        codes = np.array([DECISION_ORDER.index(service.decision) for service in services], np.int8)
+        return cls(
+            service_names=intern_names(tuple(service.service_name for service in services)),
+            metrics=metrics,
+            decision_codes=codes,
+        )
+
+
+@dataclass(frozen=True, eq=False)
+class ColumnarResult:
+    """Internal struct-of-arrays form of a simulation result.
+
+    Metric columns, int8 decision codes and int32 edge endpoints (indices into
+    ``table.service_names``) are plain NumPy arrays and service names are
+    interned, so stored runs cost a few bytes per service. Pydantic models are
+    only built by ``to_model`` when a response is serialised.
+    """
+
+    table: ServiceScoreTable
+    edge_sources: np.ndarray
+    edge_targets: np.ndarray
+    summary: SimulationSummary
+    centrality: Optional[CentralityReport] = None
+
+    @property
+    def service_names(self) -> Tuple[str, ...]:
+        """Service names in result order."""
+        return self.table.service_names
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the run's arrays, excluding shared interned names."""
+        arrays = (self.table.metrics, self.table.decision_codes, self.edge_sources, self.edge_targets)
+        return sum(array.nbytes for array in arrays)
+
+    def fingerprint(self) -> str:
+        """Digest of names, metrics, decisions and edges; the timestamp is excluded."""
+        hasher = hashlib.sha256("\0".join(self.service_names).encode())
+        for array in (self.table.metrics, self.table.decision_codes, self.edge_sources, self.edge_targets):
+            hasher.update(np.ascontiguousarray(array).tobytes())
+        return hasher.hexdigest()
+
+    def edge_names(self) -> List[Tuple[str, str]]:
+        """Return edges as ``(source, target)`` service name pairs."""
+        names = self.table.service_names
+        return [
+            (names[source], names[target])
+            for source, target in zip(self.edge_sources.tolist(), self.edge_targets.tolist())
+        ]
+
+    def service_metric(self, service_name: str) -> Optional[ServiceMetrics]:
+        """Materialise the metrics of one service, or ``None`` if it is absent."""
+        try:
+            return self.table.row(self.table.service_names.index(service_name))
+        except ValueError:
+            return None
+
+    def highest_risk_metric(self) -> ServiceMetrics:
+        """Materialise the metrics of the highest risk service."""
+        return self.table.row(int(np.argmax(self.table.risk_scores)))
+
+    def to_model(self) -> SimulationResult:
+        """Materialise the full pydantic ``SimulationResult``."""
+        return SimulationResult(
+            summary=self.summary,
+            services=self.table.to_models(),
+            edges=[GraphEdge(source=u, target=v) for u, v in self.edge_names()],
+            centrality=self.centrality,
+        )
+
+    def to_history_record(self) -> HistoricalRecord:
+        """Materialise the pydantic ``HistoricalRecord`` for this run."""
+        return HistoricalRecord(summary=self.summary, services=self.table.to_models())
+
+    @classmethod
+    def from_model(cls, result: Union[SimulationResult, HistoricalRecord]) -> "ColumnarResult":
+        """Convert a pydantic result or history record into columnar form."""
+        table = ServiceScoreTable.from_models(result.services)
+        position = {name: index for index, name in enumerate(table.service_names)}
+        edges = getattr(result, "edges", [])
+        return cls(
+            table=table,
+            edge_sources=np.array([position[edge.source] for edge in edges], dtype=np.int32),
+            edge_targets=np.array([position[edge.target] for edge in edges], dtype=np.int32),
+            summary=result.summary,
+            centrality=getattr(result, "centrality", None),
+        )
+
+
+# Anything the engine and storage accept as a past or current run.
+HistoryEntry = Union[ColumnarResult, HistoricalRecord]
+ResultLike = Union[ColumnarResult, SimulationResult]
+
+
+def as_columnar(result: Union[ColumnarResult, SimulationResult, HistoricalRecord]) -> ColumnarResult:
+    """Return ``result`` in columnar form, converting pydantic models if needed."""
+    if isinstance(result, ColumnarResult):
+        return result
+    return ColumnarResult.from_model(result)
+
+
+@lru_cache(maxsize=32)
+def intern_names(names: Tuple[str, ...]) -> Tuple[str, ...]:
+    """Return a shared tuple of interned names so stored runs reuse one copy."""
+    return tuple(sys.intern(name) for name in names)
+
+
+@lru_cache(maxsize=32)
+def name_order(names: Tuple[str, ...]) -> Tuple[np.ndarray, Tuple[str, ...]]:
+    """Return the permutation sorting ``names`` and the shared sorted tuple."""
+    order = np.array(sorted(range(len(names)), key=names.__getitem__), dtype=np.int64)
+    return order, intern_names(tuple(names[index] for index in order))
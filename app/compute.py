@@ -0,0 +1,116 @@
+"""Bounded executor for simulation and rendering work dispatched from async handlers."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+from .models import ComputeMode, ComputeStats
+
+ResultT = TypeVar("ResultT")
+
+
+class ComputeQueueFull(RuntimeError):
+    """Raised when the compute executor cannot accept more work."""
+
+
+class ComputeExecutor:
+    """Dedicated worker pool so heavy requests cannot starve lightweight routes.
+
+    ``run`` admits at most ``max_workers + max_queue`` tasks and raises
+    ``ComputeQueueFull`` beyond that. Tasks always start on a compute thread,
+    which can touch in-process state such as engine caches. In ``process``
+    mode, the picklable CPU-bound part of a task is handed to a process pool
+    via ``offload``.
+    """
+
+    def __init__(self, mode: ComputeMode, max_workers: int, max_queue: int) -> None:
+        self._mode = mode
+        self._max_workers = max_workers
+        self._max_queue = max_queue
+        self._threads = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="compute")
+        self._processes: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+        self._peak_queued = 0
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+
+    @property
+    def uses_processes(self) -> bool:
+        """Whether ``offload`` runs work in worker processes."""
+        return self._mode == ComputeMode.PROCESS
+
+    async def run(self, fn: Callable[..., ResultT], *args: Any, **kwargs: Any) -> ResultT:
+        """Run ``fn`` on a compute thread and await its result."""
+        with self._lock:
+            if self._pending >= self._max_workers + self._max_queue:
+                self._rejected += 1
+                raise ComputeQueueFull("Compute queue is full; retry later.")
+            self._pending += 1
+            self._submitted += 1
+            self._peak_queued = max(self._peak_queued, self._pending - self._running)
+        try:
+            future = self._threads.submit(self._track, fn, *args, **kwargs)
+        except BaseException:
+            with self._lock:
+                self._pending -= 1
+            raise
+        return await asyncio.wrap_future(future)
+
+    def offload(self, fn: Callable[..., ResultT], *args: Any) -> ResultT:
+        """Run picklable ``fn`` in a worker process, or inline in ``thread`` mode."""
+        if not self.uses_processes:
+            return fn(*args)
+        with self._lock:
+            if self._processes is None:
+                self._processes = ProcessPoolExecutor(max_workers=self._max_workers)
+            pool = self._processes
+        return pool.submit(fn, *args).result()
+
+    def stats(self) -> ComputeStats:
+        """Return queue depth and throughput counters."""
+        with self._lock:
+            return ComputeStats(
+                mode=self._mode,
+                max_workers=self._max_workers,
+                max_queue=self._max_queue,
+                running=self._running,
+                queued=self._pending - self._running,
+                peak_queued=self._peak_queued,
+                submitted=self._submitted,
+                completed=self._completed,
+                failed=self._failed,
+                rejected=self._rejected,
+            )
+
+    def shutdown(self) -> None:
+        """Stop the worker threads and processes."""
+        self._threads.shutdown(cancel_futures=True)
+        with self._lock:
+            if self._processes is not None:
+                self._processes.shutdown(cancel_futures=True)
+                self._processes = None
+
+    def _track(self, fn: Callable[..., ResultT], *args: Any, **kwargs: Any) -> ResultT:
+        """Run ``fn`` while keeping the running and completion counters current."""
+        with self._lock:
+            self._running += 1
+        succeeded = False
+        try:
+            result = fn(*args, **kwargs)
+            succeeded = True
+            return result
+        finally:
+            with self._lock:
+                self._running -= 1
+                self._pending -= 1
+                if succeeded:
+                    self._completed += 1
+                else:
+                    self._failed += 1
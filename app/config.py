@@ -8,6 +8,8 @@ from typing import Final, List
 
 from pydantic import BaseSettings, validator
 
+from .models import CentralityStrategy, ClusterRisk, ComputeMode, HistoryBackendKind, LayoutAlgorithm
+
 # Default microservice names to simulate within the dependency graph.
 DEFAULT_SERVICE_NAMES: Final[List[str]] = [
     "auth-service",
@@ -38,6 +40,11 @@ DEFAULT_DEPENDENCY_CANDIDATES: Final[dict[str, list[str]]] = {
     "billing-service": ["payment-service", "reporting-service"],
 }
 
+# In-memory cost of one service in one retained run: six float64 metrics and
+# an int8 decision in the history ring, plus the per-service series index's
+# risk, decision and timestamp columns held at twice the retention.
+HISTORY_BYTES_PER_SERVICE_RUN: Final[int] = 6 * 8 + 1 + 2 * (8 + 1 + 8)
+
 
 class Settings(BaseSettings):
     """Strongly typed application settings sourced from environment variables."""
@@ -45,9 +52,47 @@ class Settings(BaseSettings):
     service_names: List[str] = DEFAULT_SERVICE_NAMES
     dependency_candidates: dict[str, list[str]] = DEFAULT_DEPENDENCY_CANDIDATES
     history_limit: int = 5
+    history_max_bytes: int = 256 * 1024 * 1024
+    history_backend: HistoryBackendKind = HistoryBackendKind.MEMORY
+    history_db_path: Path = Path("history.sqlite3")
+    history_log_directory: Path = Path("history_log")
+    history_log_flush_runs: int = 64
     export_directory: Path = Path("exports")
-    graph_image_path: Path = Path("graph.png")
-    barchart_image_path: Path = Path("barchart.png")
+    ensemble_batch_size: int = 256
+    ensemble_max_runs: int = 100_000
+    ensemble_workers: int = 1
+    centrality_strategy: CentralityStrategy = CentralityStrategy.EXACT
+    centrality_pivots: int = 64
+    centrality_min_pivots: int = 16
+    centrality_latency_budget_ms: float = 250.0
+    centrality_ops_per_ms: float = 1500.0
+    centrality_confidence: float = 0.95
+    centrality_cache_max_entries: int = 4096
+    centrality_cache_max_bytes: int = 64 * 1024 * 1024
+    result_cache_max_entries: int = 1024
+    result_cache_max_bytes: int = 16 * 1024 * 1024
+    result_cache_ttl_seconds: float = 3600.0
+    compute_mode: ComputeMode = ComputeMode.THREAD
+    compute_workers: int = 2
+    compute_max_queue: int = 32
+    cicd_coalesce_window_seconds: float = 1.0
+    job_max_concurrency: int = 2
+    job_max_queued: int = 100
+    job_ttl_seconds: float = 900.0
+    render_cache_max_entries: int = 64
+    render_cache_max_bytes: int = 32 * 1024 * 1024
+    layout_algorithm: LayoutAlgorithm = LayoutAlgorithm.AUTO
+    layout_large_graph_threshold: int = 500
+    layout_cache_max_entries: int = 256
+    layout_cache_max_bytes: int = 16 * 1024 * 1024
+    layout_warm_start_max_change: float = 0.2
+    layout_warm_start_iterations: int = 15
+    prerender_enabled: bool = False
+    prerender_dpis: List[int] = [220]
+    viz_max_graph_nodes: int = 200
+    viz_max_clusters: int = 150
+    viz_cluster_risk: ClusterRisk = ClusterRisk.MAX
+    viz_max_bars: int = 40
 
     class Config:
         """Pydantic configuration."""
@@ -60,8 +105,131 @@ class Settings(BaseSettings):
         """Ensure that the rolling history limit remains within sensible bounds."""
         if value < 1:
             raise ValueError("history_limit must be at least 1")
-        if value > 20:
-            raise ValueError("history_limit must not exceed 20")
+        if value > 100_000:
+            raise ValueError("history_limit must not exceed 100000")
+        return value
+
+    @validator("history_max_bytes")
+    def _validate_history_max_bytes(cls, value: int, values: dict) -> int:
+        """The preallocated hot tier must fit the memory budget for the configured services."""
+        if value < 1:
+            raise ValueError("history_max_bytes must be at least 1")
+        limit = values.get("history_limit")
+        services = values.get("service_names")
+        if limit is not None and services is not None:
+            needed = limit * len(services) * HISTORY_BYTES_PER_SERVICE_RUN
+            if needed > value:
+                raise ValueError(
+                    f"history_limit={limit} with {len(services)} services needs about"
+                    f" {needed} bytes of memory, above history_max_bytes={value}"
+                )
+        return value
+
+    @validator("ensemble_batch_size", "ensemble_max_runs", "ensemble_workers")
+    def _validate_ensemble_sizes(cls, value: int) -> int:
+        """Ensure ensemble sizing parameters are positive."""
+        if value < 1:
+            raise ValueError("ensemble sizes must be at least 1")
+        return value
+
+    @validator("compute_workers", "job_max_concurrency", "job_max_queued", "history_log_flush_runs")
+    def _validate_worker_counts(cls, value: int) -> int:
+        """Worker pools, job queues and log buffers need room for at least one item."""
+        if value < 1:
+            raise ValueError("worker, queue and buffer sizes must be at least 1")
+        return value
+
+    @validator("job_ttl_seconds")
+    def _validate_job_ttl(cls, value: float) -> float:
+        """Finished jobs must stay retrievable for a positive interval."""
+        if value <= 0:
+            raise ValueError("job_ttl_seconds must be positive")
+        return value
+
+    @validator("compute_max_queue")
+    def _validate_compute_max_queue(cls, value: int) -> int:
+        """A zero queue only admits as many tasks as there are workers."""
+        if value < 0:
+            raise ValueError("compute_max_queue must not be negative")
+        return value
+
+    @validator("cicd_coalesce_window_seconds")
+    def _validate_cicd_coalesce_window(cls, value: float) -> float:
+        """Zero limits coalescing to requests overlapping an in-flight run."""
+        if value < 0:
+            raise ValueError("cicd_coalesce_window_seconds must not be negative")
+        return value
+
+    @validator("centrality_pivots", "centrality_min_pivots")
+    def _validate_centrality_pivots(cls, value: int) -> int:
+        """Sampled betweenness needs at least two pivots to be meaningful."""
+        if value < 2:
+            raise ValueError("centrality pivots must be at least 2")
+        return value
+
+    @validator("centrality_latency_budget_ms", "centrality_ops_per_ms")
+    def _validate_centrality_budget(cls, value: float) -> float:
+        """Ensure the latency model parameters are positive."""
+        if value <= 0:
+            raise ValueError("centrality budget parameters must be positive")
+        return value
+
+    @validator("centrality_confidence")
+    def _validate_centrality_confidence(cls, value: float) -> float:
+        """Keep the reported confidence level strictly between 0 and 1."""
+        if not 0 < value < 1:
+            raise ValueError("centrality_confidence must be between 0 and 1")
+        return value
+
+    @validator(
+        "centrality_cache_max_entries",
+        "centrality_cache_max_bytes",
+        "result_cache_max_entries",
+        "result_cache_max_bytes",
+        "render_cache_max_entries",
+        "render_cache_max_bytes",
+        "layout_cache_max_entries",
+        "layout_cache_max_bytes",
+    )
+    def _validate_cache_bounds(cls, value: int) -> int:
+        """Cache bounds may be zero to disable caching but never negative."""
+        if value < 0:
+            raise ValueError("cache bounds must not be negative")
+        return value
+
+    @validator("result_cache_ttl_seconds")
+    def _validate_result_cache_ttl(cls, value: float) -> float:
+        """Cached results must expire after a positive interval."""
+        if value <= 0:
+            raise ValueError("result_cache_ttl_seconds must be positive")
+        return value
+
+    @validator("layout_large_graph_threshold", "layout_warm_start_iterations")
+    def _validate_layout_sizes(cls, value: int) -> int:
+        """Layout thresholds and iteration counts must be positive."""
+        if value < 1:
+            raise ValueError("layout sizes must be at least 1")
+        return value
+
+    @validator("layout_warm_start_max_change")
+    def _validate_layout_warm_start_max_change(cls, value: float) -> float:
+        """The tolerated edge change is a share of the edge union."""
+        if not 0 <= value <= 1:
+            raise ValueError("layout_warm_start_max_change must be between 0 and 1")
+        return value
+
+    @validator("prerender_dpis")
+    def _validate_prerender_dpis(cls, value: List[int]) -> List[int]:
+        """Pre-rendered sizes must be ones the image endpoints can request."""
+        if any(not 50 <= dpi <= 600 for dpi in value):
+            raise ValueError("prerender_dpis must be between 50 and 600")
+        return value
+
+    @validator("viz_max_graph_nodes", "viz_max_clusters", "viz_max_bars")
+    def _validate_viz_limits(cls, value: int) -> int:
+        """Charts must be allowed at least one node, cluster or bar."""
+        if value < 1:
+            raise ValueError("visualisation limits must be at least 1")
         return value
 
     @validator("export_directory", pre=True)
@@ -0,0 +1,124 @@
+"""Aggregation of Monte Carlo ensemble runs into risk distributions."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Optional, Tuple
+
+import numpy as np
+
+from .columnar import DECISION_ORDER
+from .models import EnsembleResult, ServiceRiskDistribution
+
+# Percentiles reported for every service, in the order of the model fields.
+_PERCENTILES = (50, 90, 99)
+
+# Risk scores are hundredths in 0..100, so each service has this many possible values.
+_RISK_BINS = 10_001
+
+
+def _empty_bins() -> np.ndarray:
+    """Empty histogram key or count array."""
+    return np.empty(0, dtype=np.int64)
+
+
+@dataclass
+class EnsembleAccumulator:
+    """Partial aggregate of ensemble runs that can be merged with others.
+
+    Risk scores are rounded to two decimals by the engine, so each service's
+    scores are kept as counts per hundredth. The histogram is sparse: sorted
+    ``service * _RISK_BINS + hundredths`` keys with their counts. Memory is
+    bounded by services times distinct scores, never by the number of runs,
+    and merging partial aggregates is exact.
+    """
+
+    service_names: Tuple[str, ...]
+    decision_counts: np.ndarray
+    risk_bins: np.ndarray = field(default_factory=_empty_bins)
+    risk_counts: np.ndarray = field(default_factory=_empty_bins)
+
+    @classmethod
+    def empty(cls, service_names: Tuple[str, ...]) -> "EnsembleAccumulator":
+        """Create an accumulator with no runs for the given services."""
+        counts = np.zeros((len(service_names), len(DECISION_ORDER)), dtype=np.int64)
+        return cls(service_names=tuple(service_names), decision_counts=counts)
+
+    @property
+    def n_runs(self) -> int:
+        """Number of runs folded into this accumulator."""
+        return int(self.decision_counts[0].sum()) if len(self.decision_counts) else 0
+
+    def add(self, risk_scores: np.ndarray, decision_codes: np.ndarray) -> None:
+        """Fold a ``(runs, services)`` block of scores and decision codes in."""
+        centis = np.rint(risk_scores * 100).astype(np.int64)
+        keys = np.arange(centis.shape[1]) * _RISK_BINS + centis
+        self._fold(keys.ravel(), np.ones(keys.size, dtype=np.int64))
+        for code in range(len(DECISION_ORDER)):
+            self.decision_counts[:, code] += (decision_codes == code).sum(axis=0)
+
+    def merge(self, other: "EnsembleAccumulator") -> None:
+        """Combine another partial aggregate over the same services into this one."""
+        if other.service_names != self.service_names:
+            raise ValueError("Cannot merge ensembles over different services.")
+        self._fold(other.risk_bins, other.risk_counts)
+        self.decision_counts += other.decision_counts
+
+    def summarise(self, seed: Optional[int] = None) -> EnsembleResult:
+        """Reduce the accumulated runs into per-service risk distributions."""
+        n_runs = self.n_runs
+        if not n_runs:
+            raise ValueError("Cannot summarise an empty ensemble.")
+        services = self.risk_bins // _RISK_BINS
+        values = (self.risk_bins % _RISK_BINS) / 100
+        totals = np.bincount(services, values * self.risk_counts, minlength=len(self.service_names))
+        means = np.round(totals / n_runs, 2).tolist()
+        percentiles = np.round(self._percentiles(values, n_runs), 2).tolist()
+        probabilities = (self.decision_counts / n_runs).tolist()
+
+        services = [
+            ServiceRiskDistribution(
+                service_name=name,
+                mean_risk=mean,
+                p50_risk=p50,
+                p90_risk=p90,
+                p99_risk=p99,
+                decision_probabilities=dict(zip(DECISION_ORDER, shares)),
+            )
+            for name, mean, (p50, p90, p99), shares in zip(
+                self.service_names, means, percentiles, probabilities
+            )
+        ]
+        return EnsembleResult(
+            n_runs=n_runs,
+            seed=seed,
+            services=services,
+            generated_at_utc=datetime.now(timezone.utc),
+        )
+
+    def _fold(self, bins: np.ndarray, counts: np.ndarray) -> None:
+        """Add ``counts`` at histogram keys ``bins``, keeping keys sorted and unique."""
+        keys, inverse = np.unique(np.concatenate([self.risk_bins, bins]), return_inverse=True)
+        weights = np.concatenate([self.risk_counts, counts])
+        self.risk_bins = keys
+        self.risk_counts = np.bincount(inverse, weights, minlength=len(keys)).astype(np.int64)
+
+    def _percentiles(self, values: np.ndarray, n_runs: int) -> np.ndarray:
+        """``(services, len(_PERCENTILES))`` linear-interpolated percentiles from the histogram.
+
+        Keys sort by service first and every service holds ``n_runs`` scores,
+        so the ``r``-th smallest score of service ``s`` is where the cumulative
+        count first exceeds ``s * n_runs + r``. Matches ``np.percentile``.
+        """
+        cumulative = np.cumsum(self.risk_counts)
+        position = (n_runs - 1) * np.asarray(_PERCENTILES) / 100
+        lower = np.floor(position).astype(np.int64)
+        upper = np.minimum(lower + 1, n_runs - 1)
+        offsets = np.arange(len(self.service_names))[:, None] * n_runs
+
+        def score_at(rank: np.ndarray) -> np.ndarray:
+            return values[np.searchsorted(cumulative, offsets + rank, side="right")]
+
+        below, above = score_at(lower), score_at(upper)
+        return below + (above - below) * (position - lower)
@@ -0,0 +1,252 @@
+"""Streaming encoders that turn stored runs into export payloads."""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+import zlib
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from .columnar import DECISION_ORDER, METRIC_COLUMNS, ColumnarResult
+from .models import ExportFormat
+from .timestamps import epoch_micros
+
+if TYPE_CHECKING:  # pragma: no cover
+    import pyarrow as pa
+
+# Same columns, in the same order, as ``RiskEngine.results_to_dataframe``.
+EXPORT_COLUMNS = ("service_name", *METRIC_COLUMNS, "decision", "timestamp_utc")
+
+MEDIA_TYPES: Dict[ExportFormat, str] = {
+    ExportFormat.CSV: "text/csv",
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.PARQUET: "application/vnd.apache.parquet",
+    ExportFormat.ARROW: "application/vnd.apache.arrow.file",
+}
+
+FILE_EXTENSIONS: Dict[ExportFormat, str] = {
+    ExportFormat.CSV: ".csv",
+    ExportFormat.NDJSON: ".ndjson",
+    ExportFormat.PARQUET: ".parquet",
+    ExportFormat.ARROW: ".arrow",
+}
+
+# Rows gathered into each Parquet row group or Arrow record batch.
+ROWS_PER_BATCH = 65_536
+
+_DECISION_LABELS = tuple(decision.value for decision in DECISION_ORDER)
+
+
+def negotiate_format(accept: Optional[str]) -> ExportFormat:
+    """Pick the first export format named in an ``Accept`` header, defaulting to CSV."""
+    if accept:
+        for media_range in accept.split(","):
+            media_type = media_range.split(";")[0].strip().lower()
+            for export_format, candidate in MEDIA_TYPES.items():
+                if media_type == candidate:
+                    return export_format
+    return ExportFormat.CSV
+
+
+def iter_export(runs: Iterable[ColumnarResult], export_format: ExportFormat) -> Iterator[bytes]:
+    """Encode ``runs`` in ``export_format`` as a stream of byte chunks.
+
+    ``runs`` is consumed once and lazily by every format.
+    """
+    if export_format == ExportFormat.CSV:
+        return iter_csv(runs)
+    if export_format == ExportFormat.NDJSON:
+        return iter_ndjson(runs)
+    if export_format == ExportFormat.PARQUET:
+        return iter_parquet(runs)
+    return iter_arrow(runs)
+
+
+def iter_csv(runs: Iterable[ColumnarResult]) -> Iterator[bytes]:
+    """Yield a CSV header and then one encoded chunk per run.
+
+    Runs are consumed lazily, so memory is bounded by the largest single run
+    rather than by the number of runs exported.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(EXPORT_COLUMNS)
+    yield _drain(buffer)
+    for run in runs:
+        timestamp = run.summary.timestamp_utc.isoformat()
+        writer.writerows(
+            (name, *metrics, _DECISION_LABELS[code], timestamp)
+            for name, metrics, code in zip(
+                run.service_names, run.table.metrics.tolist(), run.table.decision_codes.tolist()
+            )
+        )
+        yield _drain(buffer)
+
+
+def iter_ndjson(runs: Iterable[ColumnarResult]) -> Iterator[bytes]:
+    """Yield one JSON object per service row, one chunk per run."""
+    for run in runs:
+        timestamp = run.summary.timestamp_utc.isoformat()
+        lines = [
+            json.dumps(
+                {
+                    "service_name": name,
+                    **dict(zip(METRIC_COLUMNS, metrics)),
+                    "decision": _DECISION_LABELS[code],
+                    "timestamp_utc": timestamp,
+                }
+            )
+            for name, metrics, code in zip(
+                run.service_names, run.table.metrics.tolist(), run.table.decision_codes.tolist()
+            )
+        ]
+        yield ("\n".join(lines) + "\n").encode("utf-8") if lines else b""
+
+
+def iter_parquet(runs: Iterable[ColumnarResult]) -> Iterator[bytes]:
+    """Yield a Parquet file written one row group per ``ROWS_PER_BATCH`` rows.
+
+    ``service_name`` and ``decision`` are dictionary-encoded columns.
+    """
+    # pyarrow is only needed, and only imported, for the binary formats.
+    import pyarrow.parquet as pq
+
+    sink = _ChunkSink()
+    with pq.ParquetWriter(sink, export_schema(), compression="zstd") as writer:
+        for batch in _record_batches(runs):
+            writer.write_batch(batch)
+            yield sink.drain()
+    yield sink.drain()
+
+
+def iter_arrow(runs: Iterable[ColumnarResult]) -> Iterator[bytes]:
+    """Yield an Arrow IPC file that readers can memory-map without copying.
+
+    ``service_name`` dictionary growth is written as dictionary deltas.
+    """
+    import pyarrow as pa
+
+    sink = _ChunkSink()
+    options = pa.ipc.IpcWriteOptions(emit_dictionary_deltas=True)
+    with pa.ipc.new_file(sink, export_schema(), options=options) as writer:
+        for batch in _record_batches(runs):
+            writer.write_batch(batch)
+            yield sink.drain()
+    yield sink.drain()
+
+
+def export_schema() -> "pa.Schema":
+    """Arrow schema shared by the Parquet and Arrow IPC exports."""
+    import pyarrow as pa
+
+    return pa.schema(
+        [
+            ("service_name", pa.dictionary(pa.int32(), pa.string())),
+            *[(column, pa.float64()) for column in METRIC_COLUMNS],
+            ("decision", pa.dictionary(pa.int8(), pa.string())),
+            ("timestamp_utc", pa.timestamp("us", tz="UTC")),
+        ]
+    )
+
+
+def gzip_chunks(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """Compress a byte stream into a single gzip member incrementally."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def _record_batches(runs: Iterable[ColumnarResult]) -> Iterator["pa.RecordBatch"]:
+    """Group runs into record batches of about ``ROWS_PER_BATCH`` rows.
+
+    The ``service_name`` dictionary only ever grows, so every batch's
+    dictionary extends the previous one and Arrow IPC files can carry it as
+    deltas. Runs are read once; columns are sliced from each run's arrays.
+    """
+    import pyarrow as pa
+
+    name_codes: Dict[str, int] = {}
+    decision_dictionary = pa.array(_DECISION_LABELS, pa.string())
+    schema = export_schema()
+
+    pending: List[Tuple[np.ndarray, np.ndarray, np.ndarray, int]] = []
+    rows = 0
+
+    def build() -> "pa.RecordBatch":
+        indices = np.concatenate([entry[0] for entry in pending])
+        metrics = np.concatenate([entry[1] for entry in pending])
+        codes = np.concatenate([entry[2] for entry in pending])
+        timestamps = np.repeat(
+            np.array([entry[3] for entry in pending], dtype="datetime64[us]"),
+            [len(entry[0]) for entry in pending],
+        )
+        name_dictionary = pa.array(list(name_codes), pa.string())
+        return pa.RecordBatch.from_arrays(
+            [
+                pa.DictionaryArray.from_arrays(pa.array(indices, pa.int32()), name_dictionary),
+                *[pa.array(metrics[:, index]) for index in range(len(METRIC_COLUMNS))],
+                pa.DictionaryArray.from_arrays(pa.array(codes, pa.int8()), decision_dictionary),
+                pa.array(timestamps, pa.timestamp("us", tz="UTC")),
+            ],
+            schema=schema,
+        )
+
+    for run in runs:
+        pending.append(
+            (
+                np.array(
+                    [name_codes.setdefault(name, len(name_codes)) for name in run.service_names],
+                    dtype=np.int32,
+                ),
+                run.table.metrics.copy(),
+                run.table.decision_codes.copy(),
+                epoch_micros(run.summary.timestamp_utc),
+            )
+        )
+        rows += len(run.service_names)
+        if rows >= ROWS_PER_BATCH:
+            yield build()
+            pending, rows = [], 0
+    if pending:
+        yield build()
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands written bytes back through ``drain``."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:  # type: ignore[override]
+        chunk = bytes(data)
+        self._chunks.append(chunk)
+        self._position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        """Return and forget the bytes written since the last call."""
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _drain(buffer: io.StringIO) -> bytes:
+    """Return and clear the text written to ``buffer`` as UTF-8."""
+    data = buffer.getvalue().encode("utf-8")
+    buffer.seek(0)
+    buffer.truncate()
+    return data
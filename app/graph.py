@@ -0,0 +1,280 @@
+"""Array-backed dependency graph with integer service identifiers."""
+
+from __future__ import annotations
+
+import hashlib
+import random
+from dataclasses import dataclass
+from typing import Dict, Iterator, Mapping, Optional, Sequence, Tuple
+
+import networkx as nx
+import numpy as np
+
+# Upper bound on ``sources x edges`` elements processed per Brandes batch,
+# which keeps the working set of the vectorised passes around 32 MiB.
+_BRANDES_BATCH_ELEMENTS = 4_000_000
+
+
+@dataclass(frozen=True)
+class DependencyGraph:
+    """Directed graph stored as CSR (out-edges) and CSC (in-edges) arrays.
+
+    Edges are de-duplicated, self-loops are dropped and edges are kept sorted
+    by ``(source, target)``, so ``sources``/``targets`` double as the CSR
+    column arrays. ``in_order`` permutes edges into CSC order.
+    """
+
+    names: Tuple[str, ...]
+    sources: np.ndarray
+    targets: np.ndarray
+    out_indptr: np.ndarray
+    in_indptr: np.ndarray
+    in_order: np.ndarray
+
+    @classmethod
+    def from_edges(
+        cls,
+        names: Sequence[str],
+        sources: np.ndarray,
+        targets: np.ndarray,
+    ) -> "DependencyGraph":
+        """Build a graph over ``names`` from parallel source/target index arrays."""
+        n_nodes = len(names)
+        sources = np.asarray(sources, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.int64)
+        keys = np.unique(sources[sources != targets] * n_nodes + targets[sources != targets])
+        sources = (keys // max(n_nodes, 1)).astype(np.int32)
+        targets = (keys % max(n_nodes, 1)).astype(np.int32)
+
+        in_order = np.lexsort((sources, targets)).astype(np.int32)
+        return cls(
+            names=tuple(names),
+            sources=sources,
+            targets=targets,
+            out_indptr=_indptr(sources, n_nodes),
+            in_indptr=_indptr(targets[in_order], n_nodes),
+            in_order=in_order,
+        )
+
+    @classmethod
+    def from_networkx(cls, graph: nx.DiGraph) -> "DependencyGraph":
+        """Convert a ``networkx`` graph, keeping its node order."""
+        names = [str(node) for node in graph.nodes()]
+        index = {node: position for position, node in enumerate(graph.nodes())}
+        edges = np.array([(index[u], index[v]) for u, v in graph.edges()], dtype=np.int64)
+        edges = edges.reshape(-1, 2)
+        return cls.from_edges(names, edges[:, 0], edges[:, 1])
+
+    @property
+    def n_nodes(self) -> int:
+        """Number of services in the graph."""
+        return len(self.names)
+
+    @property
+    def n_edges(self) -> int:
+        """Number of dependency edges in the graph."""
+        return int(self.sources.size)
+
+    def in_degree(self) -> np.ndarray:
+        """Return the in-degree of every node."""
+        return np.diff(self.in_indptr)
+
+    def out_degree(self) -> np.ndarray:
+        """Return the out-degree of every node."""
+        return np.diff(self.out_indptr)
+
+    def isolates(self) -> np.ndarray:
+        """Return indices of nodes without any incident edge."""
+        return np.flatnonzero((self.in_degree() + self.out_degree()) == 0)
+
+    def with_edges(self, sources: np.ndarray, targets: np.ndarray) -> "DependencyGraph":
+        """Return a new graph with the given edges added."""
+        return DependencyGraph.from_edges(
+            self.names,
+            np.concatenate((self.sources, sources)),
+            np.concatenate((self.targets, targets)),
+        )
+
+    def edge_names(self) -> Iterator[Tuple[str, str]]:
+        """Yield edges as ``(source, target)`` service name pairs."""
+        names = self.names
+        for source, target in zip(self.sources.tolist(), self.targets.tolist()):
+            yield names[source], names[target]
+
+    def digest(self) -> str:
+        """Return a canonical digest of the node order and sorted edge list."""
+        hasher = hashlib.sha256("\0".join(self.names).encode())
+        hasher.update(self.sources.tobytes())
+        hasher.update(self.targets.tobytes())
+        return hasher.hexdigest()
+
+    def to_networkx(self) -> nx.DiGraph:
+        """Convert to a ``networkx`` graph for compatibility."""
+        graph = nx.DiGraph()
+        graph.add_nodes_from(self.names)
+        graph.add_edges_from(self.edge_names())
+        return graph
+
+    def betweenness(self, k: Optional[int] = None, seed: Optional[int] = None) -> np.ndarray:
+        """Normalised betweenness matching ``nx.betweenness_centrality``.
+
+        With ``k`` pivots the sources are drawn exactly as networkx draws them
+        for the same integer ``seed`` and the result is rescaled by ``n / k``.
+        """
+        n_nodes = self.n_nodes
+        if k is None:
+            pivots: Sequence[int] = range(n_nodes)
+        else:
+            pivots = random.Random(seed).sample(range(n_nodes), k)
+
+        raw = np.zeros(n_nodes)
+        batch = max(1, _BRANDES_BATCH_ELEMENTS // max(self.n_edges, n_nodes, 1))
+        pivots = np.asarray(pivots, dtype=np.int64)
+        for start in range(0, len(pivots), batch):
+            raw += self._brandes_dependencies(pivots[start : start + batch])
+
+        if n_nodes <= 2:
+            return raw
+        scale = 1 / ((n_nodes - 1) * (n_nodes - 2))
+        if k is not None:
+            scale *= n_nodes / k
+        return raw * scale
+
+    def _brandes_dependencies(self, pivots: np.ndarray) -> np.ndarray:
+        """Sum of Brandes dependencies for a batch of BFS sources.
+
+        All sources in the batch advance one BFS level at a time. Each level
+        expands the frontier's CSR rows with array operations. State is kept
+        in flat ``source * n + node`` arrays, so every edge is still visited
+        once per source, as in Brandes' algorithm.
+        """
+        n_nodes = self.n_nodes
+        out_degree = self.out_degree()
+        offsets = np.arange(len(pivots), dtype=np.int64) * n_nodes
+        frontier = offsets + pivots
+        distance = np.full(len(pivots) * n_nodes, -1, dtype=np.int32)
+        sigma = np.zeros(len(pivots) * n_nodes)
+        distance[frontier] = 0
+        sigma[frontier] = 1.0
+
+        shortest_path_edges = []
+        level = 0
+        while frontier.size:
+            nodes = frontier % n_nodes
+            counts = out_degree[nodes]
+            total = int(counts.sum())
+            if not total:
+                break
+            parents = np.repeat(frontier, counts)
+            first_edge = np.repeat(self.out_indptr[nodes] - (np.cumsum(counts) - counts), counts)
+            children = parents - np.repeat(nodes, counts) + self.targets[first_edge + np.arange(total)]
+
+            level += 1
+            unseen = children[distance[children] == -1]
+            distance[unseen] = level
+            on_path = distance[children] == level
+            parents, children = parents[on_path], children[on_path]
+            np.add.at(sigma, children, sigma[parents])
+            shortest_path_edges.append((parents, children))
+            frontier = np.unique(children)
+
+        delta = np.zeros_like(sigma)
+        for parents, children in reversed(shortest_path_edges):
+            np.add.at(delta, parents, sigma[parents] / sigma[children] * (1.0 + delta[children]))
+
+        delta[offsets + pivots] = 0.0
+        return delta.reshape(len(pivots), n_nodes).sum(axis=0)
+
+
+@dataclass(frozen=True)
+class TopologySampler:
+    """Dependency candidate map compiled into padded index arrays.
+
+    Row ``i`` describes service ``targets[i]``. ``table[i, :counts[i]]`` holds
+    its candidate dependency IDs and ``max_edges[i]`` the most edges it may
+    draw. Sampling a graph then takes a few vectorised RNG calls.
+    """
+
+    names: Tuple[str, ...]
+    targets: np.ndarray
+    table: np.ndarray
+    counts: np.ndarray
+    max_edges: np.ndarray
+
+    @classmethod
+    def compile(
+        cls,
+        service_names: Sequence[str],
+        dependency_candidates: Mapping[str, Sequence[str]],
+    ) -> "TopologySampler":
+        """Assign integer IDs and pad every service's candidate list."""
+        services = list(dict.fromkeys(service_names))
+        rows = [(service, dependency_candidates.get(service, [])) for service in services]
+        rows = [(service, list(candidates)) for service, candidates in rows if candidates]
+
+        # Configured services first, then candidates that are not services.
+        names = tuple(dict.fromkeys([*services, *(c for _, candidates in rows for c in candidates)]))
+        index: Dict[str, int] = {name: position for position, name in enumerate(names)}
+
+        width = max((len(candidates) for _, candidates in rows), default=0)
+        table = np.zeros((len(rows), width), dtype=np.int32)
+        counts = np.zeros(len(rows), dtype=np.int64)
+        for row, (_, candidates) in enumerate(rows):
+            table[row, : len(candidates)] = [index[candidate] for candidate in candidates]
+            counts[row] = len(candidates)
+
+        return cls(
+            names=names,
+            targets=np.array([index[service] for service, _ in rows], dtype=np.int32),
+            table=table,
+            counts=counts,
+            max_edges=np.maximum(1, counts // 2),
+        )
+
+    @property
+    def max_edge_count(self) -> int:
+        """Upper bound on edges a sampled graph can contain, including repairs."""
+        return int(self.max_edges.sum()) + len(self.names)
+
+    def digest(self) -> str:
+        """Return a digest of the service names and compiled candidate table."""
+        hasher = hashlib.sha256("\0".join(self.names).encode())
+        for array in (self.targets, self.table, self.counts, self.max_edges):
+            hasher.update(array.tobytes())
+        return hasher.hexdigest()
+
+    def sample(self, rng: np.random.Generator) -> DependencyGraph:
+        """Draw a random dependency graph.
+
+        Every service draws ``0..max_edges`` dependencies uniformly without
+        replacement from its candidates. Isolated services are then linked
+        from a uniformly chosen other service.
+        """
+        edge_counts = rng.integers(0, self.max_edges + 1)
+
+        # Ranking i.i.d. uniform keys gives a uniformly random permutation of
+        # each row; its first ``edge_counts`` entries are a uniform subset.
+        width = self.table.shape[1]
+        keys = rng.random((len(self.counts), width))
+        keys[np.arange(width) >= self.counts[:, None]] = np.inf
+        ranked = np.argsort(keys, axis=1)
+        chosen = np.arange(width) < edge_counts[:, None]
+        rows = np.nonzero(chosen)[0]
+        sources = self.table[rows, ranked[chosen]]
+        graph = DependencyGraph.from_edges(self.names, sources, self.targets[rows])
+
+        isolated = graph.isolates()
+        if isolated.size and len(self.names) > 1:
+            others = rng.integers(0, len(self.names) - 1, size=isolated.size)
+            others += others >= isolated
+            graph = graph.with_edges(others, isolated)
+        return graph
+
+
+def _indptr(sorted_rows: np.ndarray, n_rows: int) -> np.ndarray:
+    """Return CSR row pointers for row indices that are already sorted."""
+    counts = np.bincount(sorted_rows, minlength=n_rows) if sorted_rows.size else np.zeros(n_rows, int)
+    indptr = np.zeros(n_rows + 1, dtype=np.int64)
+    np.cumsum(counts, out=indptr[1:])
+    return indptr
+
@@ -0,0 +1,271 @@
+"""Pluggable persistence backends for simulation history."""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Protocol, Sequence, runtime_checkable
+
+import numpy as np
+
+from .columnar import (
+    BLOCK_CODE,
+    METRIC_COLUMNS,
+    ColumnarResult,
+    ServiceScoreTable,
+    intern_names,
+)
+from .config import Settings
+from .models import CentralityReport, HistoryBackendKind, SimulationSummary
+from .series import ServiceSeries
+from .timestamps import as_utc
+
+
+class HistoryBackend(Protocol):
+    """Durable store that every recorded run is appended to."""
+
+    def append(self, run: ColumnarResult) -> None:
+        """Persist ``run``."""
+
+    def recent(self, limit: int) -> List[ColumnarResult]:
+        """Return up to ``limit`` most recent runs, oldest first."""
+
+    def iter_runs(
+        self, start: Optional[datetime] = None, end: Optional[datetime] = None
+    ) -> Iterator[ColumnarResult]:
+        """Yield the runs recorded within ``[start, end)``, oldest first, in bounded memory."""
+
+    def close(self) -> None:
+        """Release any resources held by the backend."""
+
+
+@runtime_checkable
+class SeriesHistoryBackend(Protocol):
+    """Backend that answers per-service trend queries beyond the hot tier."""
+
+    def service_series(
+        self,
+        service_name: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> Optional[ServiceSeries]:
+        """Return one service's risk score and decision within ``[start, end)``."""
+
+
+class MemoryHistoryBackend:
+    """Non-durable backend keeping nothing beyond the storage's hot tier."""
+
+    def append(self, run: ColumnarResult) -> None:
+        """Discard ``run``; the hot tier already holds it."""
+
+    def recent(self, limit: int) -> List[ColumnarResult]:
+        """Return no runs, since nothing survives a restart."""
+        return []
+
+    def iter_runs(
+        self, start: Optional[datetime] = None, end: Optional[datetime] = None
+    ) -> Iterator[ColumnarResult]:
+        """Yield no runs; only the hot tier holds them."""
+        return iter(())
+
+    def close(self) -> None:
+        """Nothing to release."""
+
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp_utc TEXT NOT NULL,
+    average_risk REAL NOT NULL,
+    highest_risk_service TEXT NOT NULL,
+    highest_risk_score REAL NOT NULL,
+    centrality TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_runs_timestamp ON runs (timestamp_utc);
+CREATE TABLE IF NOT EXISTS service_metrics (
+    run_id INTEGER NOT NULL REFERENCES runs (run_id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    service_name TEXT NOT NULL,
+    {", ".join(f"{column} REAL NOT NULL" for column in METRIC_COLUMNS)},
+    decision INTEGER NOT NULL,
+    PRIMARY KEY (run_id, position)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_service_metrics_service ON service_metrics (service_name, run_id);
+CREATE TABLE IF NOT EXISTS edges (
+    run_id INTEGER NOT NULL REFERENCES runs (run_id) ON DELETE CASCADE,
+    source INTEGER NOT NULL,
+    target INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_edges_run ON edges (run_id);
+"""
+
+# Runs loaded per query when streaming a time range.
+PAGE_RUNS = 64
+
+_RUN_SELECT = (
+    "SELECT run_id, timestamp_utc, average_risk, highest_risk_service,"
+    " highest_risk_score, centrality FROM runs"
+)
+_METRIC_SELECT = ", ".join(METRIC_COLUMNS)
+_METRIC_PLACEHOLDERS = ", ".join("?" * (len(METRIC_COLUMNS) + 4))
+
+
+class SQLiteHistoryBackend:
+    """SQLite history in WAL mode with normalised run, metric and edge tables.
+
+    Each run is written in a single transaction: one ``runs`` row, then the
+    service metrics and edges via ``executemany``. Edge endpoints are stored
+    as positions into the run's service list.
+    """
+
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(str(path), check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.execute("PRAGMA foreign_keys=ON")
+            self._connection.executescript(_SCHEMA)
+
+    def append(self, run: ColumnarResult) -> None:
+        """Insert ``run`` and all its rows in one transaction."""
+        summary = run.summary
+        centrality = run.centrality.json() if run.centrality is not None else None
+        services = zip(run.service_names, run.table.metrics.tolist(), run.table.decision_codes.tolist())
+        edges = list(zip(run.edge_sources.tolist(), run.edge_targets.tolist()))
+
+        with self._lock, self._connection:
+            cursor = self._connection.execute(
+                "INSERT INTO runs (timestamp_utc, average_risk, highest_risk_service,"
+                " highest_risk_score, centrality) VALUES (?, ?, ?, ?, ?)",
+                (
+                    summary.timestamp_utc.isoformat(),
+                    summary.average_risk,
+                    summary.highest_risk_service,
+                    summary.highest_risk_score,
+                    centrality,
+                ),
+            )
+            run_id = cursor.lastrowid
+            self._connection.executemany(
+                f"INSERT INTO service_metrics (run_id, position, service_name, {_METRIC_SELECT},"
+                f" decision) VALUES ({_METRIC_PLACEHOLDERS})",
+                [
+                    (run_id, position, name, *metrics, code)
+                    for position, (name, metrics, code) in enumerate(services)
+                ],
+            )
+            self._connection.executemany(
+                "INSERT INTO edges (run_id, source, target) VALUES (?, ?, ?)",
+                [(run_id, source, target) for source, target in edges],
+            )
+
+    def recent(self, limit: int) -> List[ColumnarResult]:
+        """Load the ``limit`` most recent runs, oldest first."""
+        with self._lock:
+            runs = self._connection.execute(
+                f"{_RUN_SELECT} ORDER BY run_id DESC LIMIT ?", (limit,)
+            ).fetchall()[::-1]
+            return self._load(runs)
+
+    def iter_runs(
+        self, start: Optional[datetime] = None, end: Optional[datetime] = None
+    ) -> Iterator[ColumnarResult]:
+        """Yield the runs recorded within ``[start, end)``, ``PAGE_RUNS`` at a time.
+
+        Timestamps are stored as UTC ISO strings, which sort chronologically.
+        """
+        conditions, bounds = ["run_id > ?"], []
+        if start is not None:
+            conditions.append("timestamp_utc >= ?")
+            bounds.append(as_utc(start).isoformat())
+        if end is not None:
+            conditions.append("timestamp_utc < ?")
+            bounds.append(as_utc(end).isoformat())
+        query = f"{_RUN_SELECT} WHERE {' AND '.join(conditions)} ORDER BY run_id LIMIT ?"
+        last_run = 0
+        while True:
+            with self._lock:
+                runs = self._connection.execute(query, (last_run, *bounds, PAGE_RUNS)).fetchall()
+                page = self._load(runs)
+            if not page:
+                return
+            yield from page
+            last_run = runs[-1][0]
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
+
+    def _load(self, runs: Sequence[tuple]) -> List[ColumnarResult]:
+        """Rebuild ``runs`` rows, in run order, with their metrics and edges; caller holds the lock."""
+        if not runs:
+            return []
+        first_run, last_run = runs[0][0], runs[-1][0]
+        metric_rows = self._connection.execute(
+            f"SELECT run_id, service_name, {_METRIC_SELECT}, decision FROM service_metrics"
+            " WHERE run_id BETWEEN ? AND ? ORDER BY run_id, position",
+            (first_run, last_run),
+        ).fetchall()
+        edge_rows = self._connection.execute(
+            "SELECT run_id, source, target FROM edges WHERE run_id BETWEEN ? AND ? ORDER BY rowid",
+            (first_run, last_run),
+        ).fetchall()
+
+        metrics_by_run: Dict[int, List[tuple]] = {}
+        for row in metric_rows:
+            metrics_by_run.setdefault(row[0], []).append(row[1:])
+        edges_by_run: Dict[int, List[tuple]] = {}
+        for run_id, source, target in edge_rows:
+            edges_by_run.setdefault(run_id, []).append((source, target))
+
+        return [
+            _build_run(row, metrics_by_run.get(row[0], []), edges_by_run.get(row[0], []))
+            for row in runs
+        ]
+
+
+def _build_run(
+    run_row: tuple, metric_rows: Sequence[tuple], edge_rows: Sequence[tuple]
+) -> ColumnarResult:
+    """Reassemble a ``ColumnarResult`` from its normalised rows."""
+    _, timestamp, average_risk, highest_service, highest_score, centrality = run_row
+    names = intern_names(tuple(row[0] for row in metric_rows))
+    metrics = np.array([row[1:-1] for row in metric_rows], dtype=float).reshape(
+        len(metric_rows), len(METRIC_COLUMNS)
+    )
+    codes = np.array([row[-1] for row in metric_rows], dtype=np.int8)
+    edges = np.array(edge_rows, dtype=np.int32).reshape(-1, 2)
+    blocked = [name for name, code in zip(names, codes.tolist()) if code == BLOCK_CODE]
+    return ColumnarResult(
+        table=ServiceScoreTable(service_names=names, metrics=metrics, decision_codes=codes),
+        edge_sources=edges[:, 0],
+        edge_targets=edges[:, 1],
+        summary=SimulationSummary(
+            average_risk=average_risk,
+            highest_risk_service=highest_service,
+            highest_risk_score=highest_score,
+            blocked_services=blocked,
+            blocked_count=len(blocked),
+            timestamp_utc=datetime.fromisoformat(timestamp),
+        ),
+        centrality=CentralityReport.parse_raw(centrality) if centrality else None,
+    )
+
+
+def open_backend(settings: Settings) -> HistoryBackend:
+    """Instantiate the history backend selected by ``settings``."""
+    if settings.history_backend == HistoryBackendKind.SQLITE:
+        return SQLiteHistoryBackend(settings.history_db_path)
+    if settings.history_backend == HistoryBackendKind.PARQUET:
+        # pyarrow is only needed, and only imported, for the Parquet log.
+        from .history_log import ParquetHistoryLog
+
+        return ParquetHistoryLog(
+            settings.history_log_directory, flush_runs=settings.history_log_flush_runs
+        )
+    return MemoryHistoryBackend()
@@ -0,0 +1,376 @@
+"""Append-only history log stored as day-partitioned Parquet segments."""
+
+from __future__ import annotations
+
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from .columnar import BLOCK_CODE, METRIC_COLUMNS, ColumnarResult, ServiceScoreTable, intern_names
+from .models import CentralityReport, SimulationSummary
+from .series import ServiceSeries
+from .timestamps import as_utc, epoch_micros, utc_day
+
+_TIMESTAMP = pa.timestamp("us", tz="UTC")
+
+# One row per service per run; the table trend queries read.
+METRICS_SCHEMA = pa.schema(
+    [
+        ("run_id", pa.int64()),
+        ("timestamp_utc", _TIMESTAMP),
+        ("position", pa.int32()),
+        ("service_name", pa.string()),
+        *[(column, pa.float64()) for column in METRIC_COLUMNS],
+        ("decision", pa.int8()),
+    ]
+)
+
+# One row per run with the data needed to rebuild a full result.
+RUNS_SCHEMA = pa.schema(
+    [
+        ("run_id", pa.int64()),
+        ("timestamp_utc", _TIMESTAMP),
+        ("average_risk", pa.float64()),
+        ("highest_risk_service", pa.string()),
+        ("highest_risk_score", pa.float64()),
+        ("centrality", pa.string()),
+        ("edge_sources", pa.list_(pa.int32())),
+        ("edge_targets", pa.list_(pa.int32())),
+    ]
+)
+
+_PARTITIONING = ds.partitioning(pa.schema([("date", pa.string())]), flavor="hive")
+
+
+class ParquetHistoryLog:
+    """History backend buffering runs and flushing them as Parquet segments.
+
+    Segments are written under ``runs/date=YYYY-MM-DD/`` and
+    ``metrics/date=YYYY-MM-DD/`` once ``flush_runs`` runs are buffered, when
+    the UTC day changes, and on ``close``. Each file is immutable and
+    ``compression``-encoded. ``scan`` prunes day partitions and pushes column
+    selection and row filters down to the Parquet reader. Buffered runs are
+    included in reads but lost on a crash.
+    """
+
+    def __init__(self, directory: Path, flush_runs: int = 64, compression: str = "zstd") -> None:
+        self._directory = directory
+        self._flush_runs = flush_runs
+        self._compression = compression
+        self._buffer: List[Tuple[int, ColumnarResult]] = []
+        self._last_run_id = 0
+        self._lock = threading.Lock()
+
+    def append(self, run: ColumnarResult) -> None:
+        """Buffer ``run``, flushing first if it starts a new day."""
+        with self._lock:
+            if self._buffer and _day(self._buffer[-1][1]) != _day(run):
+                self._flush_locked()
+            timestamp_us = _timestamp_us(run)
+            self._last_run_id = max(self._last_run_id + 1, timestamp_us)
+            self._buffer.append((self._last_run_id, run))
+            if len(self._buffer) >= self._flush_runs:
+                self._flush_locked()
+
+    def flush(self) -> None:
+        """Write buffered runs out as new segments."""
+        with self._lock:
+            self._flush_locked()
+
+    def close(self) -> None:
+        """Flush any buffered runs."""
+        self.flush()
+
+    def scan(
+        self,
+        columns: Sequence[str],
+        service_names: Optional[Sequence[str]] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> pa.Table:
+        """Read ``columns`` of the metrics log, filtered by service and time range.
+
+        Only day partitions overlapping ``[start, end)`` are opened and only
+        the requested columns are decoded. Rows come back in run order.
+        """
+        row_filter = _metrics_filter(service_names, start, end)
+        read_columns = list(dict.fromkeys(["run_id", *columns]))
+        with self._lock:
+            buffered = self._metrics_table(self._buffer)
+        parts = [buffered.filter(row_filter).select(read_columns)]
+        dataset = self._dataset("metrics", METRICS_SCHEMA)
+        if dataset is not None:
+            partition_filter = _partition_filter(start, end)
+            combined = row_filter if partition_filter is None else row_filter & partition_filter
+            parts.insert(0, dataset.to_table(columns=read_columns, filter=combined))
+        table = pa.concat_tables(parts).sort_by("run_id")
+        return table.select(list(columns))
+
+    def metric_series(
+        self,
+        service_name: str,
+        metric: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Return ``(timestamps, values)`` of one metric for one service."""
+        table = self.scan(["timestamp_utc", metric], [service_name], start, end)
+        timestamps = table.column("timestamp_utc").to_numpy().astype("datetime64[us]")
+        return timestamps, table.column(metric).to_numpy()
+
+    def service_series(
+        self,
+        service_name: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> Optional[ServiceSeries]:
+        """Risk score and decision of one service, or ``None`` if it has no rows in range.
+
+        Like ``metric_series``, a single pushed-down ``scan`` reading only
+        the three columns involved.
+        """
+        table = self.scan(["timestamp_utc", "risk_score", "decision"], [service_name], start, end)
+        if not table.num_rows:
+            return None
+        return ServiceSeries(
+            timestamps=table.column("timestamp_utc").to_numpy().astype("datetime64[us]"),
+            risk_scores=table.column("risk_score").to_numpy(),
+            decision_codes=table.column("decision").to_numpy().astype(np.int8),
+        )
+
+    def recent(self, limit: int) -> List[ColumnarResult]:
+        """Rebuild the ``limit`` most recent runs, oldest first."""
+        with self._lock:
+            buffered = [run for _, run in self._buffer[-limit:]]
+        needed = limit - len(buffered)
+        if needed <= 0:
+            return buffered
+
+        runs_dir = self._directory / "runs"
+        days = sorted((path.name for path in runs_dir.glob("date=*")), reverse=True) if runs_dir.exists() else []
+        tables: List[pa.Table] = []
+        found = 0
+        for day in days:
+            table = pq.read_table(runs_dir / day, schema=RUNS_SCHEMA)
+            tables.append(table)
+            found += table.num_rows
+            if found >= needed:
+                break
+        if not tables:
+            return buffered
+
+        runs = pa.concat_tables(tables).sort_by("run_id")
+        runs = runs.slice(max(0, runs.num_rows - needed))
+        run_ids = runs.column("run_id")
+        metrics_dir = self._directory / "metrics"
+        metrics = pa.concat_tables(
+            [
+                pq.read_table(
+                    metrics_dir / day,
+                    schema=METRICS_SCHEMA,
+                    filters=[("run_id", ">=", run_ids[0].as_py())],
+                )
+                for day in days[: len(tables)]
+                if (metrics_dir / day).exists()
+            ]
+            or [METRICS_SCHEMA.empty_table()]
+        ).sort_by([("run_id", "ascending"), ("position", "ascending")])
+        return [*_rebuild_runs(runs, metrics), *buffered]
+
+    def iter_runs(
+        self, start: Optional[datetime] = None, end: Optional[datetime] = None
+    ) -> Iterator[ColumnarResult]:
+        """Yield the runs recorded within ``[start, end)``, oldest first.
+
+        Runs are rebuilt one segment at a time, so memory is bounded by
+        ``flush_runs``. Segments and buffered runs are listed up front, so a
+        flush while streaming neither skips nor repeats runs.
+        """
+        row_filter = _metrics_filter(None, start, end)
+        with self._lock:
+            segments = [
+                (partition.name, segment.name)
+                for partition in self._partitions("runs", start, end)
+                for segment in sorted(partition.glob("part-*.parquet"), key=_segment_order)
+            ]
+            buffered = [run for _, run in self._buffer]
+        for partition, name in segments:
+            runs = pq.read_table(
+                self._directory / "runs" / partition / name, schema=RUNS_SCHEMA, filters=row_filter
+            ).sort_by("run_id")
+            if not runs.num_rows:
+                continue
+            run_ids = runs.column("run_id")
+            metrics = pq.read_table(
+                self._directory / "metrics" / partition / name,
+                schema=METRICS_SCHEMA,
+                filters=[("run_id", ">=", run_ids[0].as_py()), ("run_id", "<=", run_ids[-1].as_py())],
+            ).sort_by([("run_id", "ascending"), ("position", "ascending")])
+            yield from _rebuild_runs(runs, metrics)
+        lower = None if start is None else epoch_micros(start)
+        upper = None if end is None else epoch_micros(end)
+        for run in buffered:
+            timestamp_us = _timestamp_us(run)
+            if (lower is None or timestamp_us >= lower) and (upper is None or timestamp_us < upper):
+                yield run
+
+    def _partitions(self, kind: str, start: Optional[datetime], end: Optional[datetime]) -> List[Path]:
+        """Day partitions of ``kind`` overlapping ``[start, end)``, oldest first."""
+        root = self._directory / kind
+        if not root.exists():
+            return []
+        first = None if start is None else f"date={utc_day(start)}"
+        last = None if end is None else f"date={utc_day(end)}"
+        return [
+            partition
+            for partition in sorted(root.glob("date=*"))
+            if (first is None or partition.name >= first) and (last is None or partition.name <= last)
+        ]
+
+    def _flush_locked(self) -> None:
+        """Write the buffer as one segment per day; caller holds the lock."""
+        if not self._buffer:
+            return
+        by_day: Dict[str, List[Tuple[int, ColumnarResult]]] = {}
+        for run_id, run in self._buffer:
+            by_day.setdefault(_day(run), []).append((run_id, run))
+        for day, entries in by_day.items():
+            name = f"part-{entries[0][0]}.parquet"
+            for kind, table in (("runs", _runs_table(entries)), ("metrics", self._metrics_table(entries))):
+                partition = self._directory / kind / f"date={day}"
+                partition.mkdir(parents=True, exist_ok=True)
+                temporary = partition / f".{name}.tmp"
+                pq.write_table(table, temporary, compression=self._compression)
+                temporary.replace(partition / name)
+        self._buffer = []
+
+    def _dataset(self, kind: str, schema: pa.Schema) -> Optional[ds.Dataset]:
+        """Open the on-disk dataset of ``kind``, or ``None`` if nothing was flushed."""
+        root = self._directory / kind
+        if not any(root.glob("date=*/*.parquet")):
+            return None
+        return ds.dataset(
+            root,
+            schema=schema.append(pa.field("date", pa.string())),
+            format="parquet",
+            partitioning=_PARTITIONING,
+            exclude_invalid_files=False,
+            ignore_prefixes=["."],
+        )
+
+    @staticmethod
+    def _metrics_table(entries: Sequence[Tuple[int, ColumnarResult]]) -> pa.Table:
+        """Flatten buffered runs into one metrics row per service."""
+        if not entries:
+            return METRICS_SCHEMA.empty_table()
+        counts = [len(run.service_names) for _, run in entries]
+        metrics = np.concatenate([run.table.metrics for _, run in entries])
+        columns = {
+            "run_id": np.repeat([run_id for run_id, _ in entries], counts),
+            "timestamp_utc": np.repeat([_timestamp_us(run) for _, run in entries], counts),
+            "position": np.concatenate([np.arange(count, dtype=np.int32) for count in counts]),
+            "service_name": [name for _, run in entries for name in run.service_names],
+            **{column: metrics[:, index] for index, column in enumerate(METRIC_COLUMNS)},
+            "decision": np.concatenate([run.table.decision_codes for _, run in entries]),
+        }
+        return pa.table(columns, schema=METRICS_SCHEMA)
+
+
+def _runs_table(entries: Sequence[Tuple[int, ColumnarResult]]) -> pa.Table:
+    """Build the per-run table for buffered runs."""
+    return pa.table(
+        {
+            "run_id": [run_id for run_id, _ in entries],
+            "timestamp_utc": [_timestamp_us(run) for _, run in entries],
+            "average_risk": [run.summary.average_risk for _, run in entries],
+            "highest_risk_service": [run.summary.highest_risk_service for _, run in entries],
+            "highest_risk_score": [run.summary.highest_risk_score for _, run in entries],
+            "centrality": [run.centrality.json() if run.centrality else None for _, run in entries],
+            "edge_sources": [run.edge_sources.tolist() for _, run in entries],
+            "edge_targets": [run.edge_targets.tolist() for _, run in entries],
+        },
+        schema=RUNS_SCHEMA,
+    )
+
+
+def _rebuild_runs(runs: pa.Table, metrics: pa.Table) -> List[ColumnarResult]:
+    """Reassemble ``ColumnarResult`` objects from run and metric rows."""
+    metric_run_ids = metrics.column("run_id").to_numpy()
+    metric_values = np.column_stack([metrics.column(column).to_numpy() for column in METRIC_COLUMNS])
+    names = metrics.column("service_name").to_pylist()
+    codes = metrics.column("decision").to_numpy()
+
+    results = []
+    for row in runs.to_pylist():
+        lower, upper = np.searchsorted(metric_run_ids, [row["run_id"], row["run_id"] + 1])
+        service_names = intern_names(tuple(names[lower:upper]))
+        decision_codes = codes[lower:upper].astype(np.int8)
+        blocked = [
+            name for name, code in zip(service_names, decision_codes.tolist()) if code == BLOCK_CODE
+        ]
+        results.append(
+            ColumnarResult(
+                table=ServiceScoreTable(service_names, metric_values[lower:upper].copy(), decision_codes),
+                edge_sources=np.array(row["edge_sources"], dtype=np.int32),
+                edge_targets=np.array(row["edge_targets"], dtype=np.int32),
+                summary=SimulationSummary(
+                    average_risk=row["average_risk"],
+                    highest_risk_service=row["highest_risk_service"],
+                    highest_risk_score=row["highest_risk_score"],
+                    blocked_services=blocked,
+                    blocked_count=len(blocked),
+                    timestamp_utc=row["timestamp_utc"],
+                ),
+                centrality=CentralityReport.parse_raw(row["centrality"]) if row["centrality"] else None,
+            )
+        )
+    return results
+
+
+def _metrics_filter(
+    service_names: Optional[Sequence[str]],
+    start: Optional[datetime],
+    end: Optional[datetime],
+) -> pc.Expression:
+    """Row predicate on service name and timestamp."""
+    expression = pc.scalar(True)
+    if service_names is not None:
+        expression &= pc.field("service_name").isin(list(service_names))
+    if start is not None:
+        expression &= pc.field("timestamp_utc") >= pa.scalar(as_utc(start), _TIMESTAMP)
+    if end is not None:
+        expression &= pc.field("timestamp_utc") < pa.scalar(as_utc(end), _TIMESTAMP)
+    return expression
+
+
+def _partition_filter(start: Optional[datetime], end: Optional[datetime]) -> Optional[pc.Expression]:
+    """Predicate on the ``date`` partition key covering ``[start, end)``."""
+    expression = None
+    if start is not None:
+        expression = pc.field("date") >= utc_day(start)
+    if end is not None:
+        upper = pc.field("date") <= utc_day(end)
+        expression = upper if expression is None else expression & upper
+    return expression
+
+
+def _segment_order(path: Path) -> int:
+    """First run id of a segment, from its ``part-<run_id>.parquet`` name."""
+    return int(path.stem.split("-", 1)[1])
+
+
+def _day(run: ColumnarResult) -> str:
+    """UTC date partition key of a run."""
+    return utc_day(run.summary.timestamp_utc)
+
+
+def _timestamp_us(run: ColumnarResult) -> int:
+    """Run timestamp as microseconds since the epoch."""
+    return epoch_micros(run.summary.timestamp_utc)
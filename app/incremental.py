@@ -0,0 +1,251 @@
+"""Incrementally maintained dependency metrics for a live service topology."""
+
+from __future__ import annotations
+
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+import networkx as nx
+import numpy as np
+
+Edge = Tuple[str, str]
+
+
+class TopologyVerificationError(RuntimeError):
+    """Raised when incremental betweenness diverges from a full recomputation."""
+
+
+class TopologySnapshot(NamedTuple):
+    """Consistent, read-only view of a live topology and its metrics."""
+
+    nodes: Tuple[str, ...]
+    edges: Tuple[Edge, ...]
+    betweenness: np.ndarray
+    normalised_in_degree: np.ndarray
+
+
+@dataclass(frozen=True)
+class TopologyUpdate:
+    """Outcome of applying an edge delta to the live topology."""
+
+    added: int
+    removed: int
+    affected_sources: int
+    max_verification_error: Optional[float] = None
+
+
+class IncrementalDependencyMetrics:
+    """Betweenness and in-degree for a directed topology, updated per edge delta.
+
+    Inserting or deleting edge ``(u, v)`` only changes the shortest-path DAG of
+    sources ``s`` that reach ``u`` with ``d(s, u) + 1 <= d(s, v)``. For those
+    sources the old single-source Brandes dependencies are subtracted and the
+    new ones added; every other source's contribution is left untouched.
+
+    With ``verify=True`` each update is checked against a full
+    ``nx.betweenness_centrality`` recomputation and a
+    ``TopologyVerificationError`` is raised when they disagree beyond
+    ``tolerance``. A failed ``apply`` leaves the topology as it was.
+    """
+
+    def __init__(
+        self,
+        nodes: Sequence[str],
+        edges: Iterable[Edge] = (),
+        *,
+        verify: bool = False,
+        tolerance: float = 1e-9,
+    ) -> None:
+        self._nodes: Tuple[str, ...] = tuple(dict.fromkeys(nodes))
+        self._index: Dict[str, int] = {node: index for index, node in enumerate(self._nodes)}
+        self._graph = nx.DiGraph()
+        self._graph.add_nodes_from(self._nodes)
+        for source, target in edges:
+            self._check_edge(source, target)
+            self._graph.add_edge(source, target)
+        self._verify = verify
+        self._tolerance = tolerance
+        self._lock = threading.Lock()
+        self._recompute()
+
+    @property
+    def nodes(self) -> Tuple[str, ...]:
+        """Services tracked by the topology, in index order."""
+        return self._nodes
+
+    @property
+    def edge_count(self) -> int:
+        """Number of dependency edges currently in the topology."""
+        return self._graph.number_of_edges()
+
+    def snapshot(self) -> TopologySnapshot:
+        """Return the current edges and metrics under the update lock."""
+        with self._lock:
+            return TopologySnapshot(
+                nodes=self._nodes,
+                edges=tuple(self._graph.edges()),
+                betweenness=self._normalised_betweenness(),
+                normalised_in_degree=self._normalised_in_degree(),
+            )
+
+    def to_networkx(self) -> nx.DiGraph:
+        """Return a copy of the topology as a ``networkx`` graph."""
+        with self._lock:
+            return self._graph.copy()
+
+    def add_edge(self, source: str, target: str) -> TopologyUpdate:
+        """Insert a single dependency edge."""
+        return self.apply(added=[(source, target)])
+
+    def remove_edge(self, source: str, target: str) -> TopologyUpdate:
+        """Delete a single dependency edge."""
+        return self.apply(removed=[(source, target)])
+
+    def apply(
+        self, added: Iterable[Edge] = (), removed: Iterable[Edge] = ()
+    ) -> TopologyUpdate:
+        """Apply removals then insertions, updating only affected sources.
+
+        The graph and betweenness are restored if any step, including
+        verification, fails.
+        """
+        added, removed = list(added), list(removed)
+        for source, target in added + removed:
+            self._check_edge(source, target)
+
+        with self._lock:
+            graph, raw = self._graph.copy(), self._raw.copy()
+            try:
+                added_count = removed_count = affected = 0
+                for source, target in removed:
+                    if self._graph.has_edge(source, target):
+                        affected += self._update(source, target, insert=False)
+                        removed_count += 1
+                for source, target in added:
+                    if not self._graph.has_edge(source, target):
+                        affected += self._update(source, target, insert=True)
+                        added_count += 1
+
+                error = self._verification_error() if self._verify else None
+                if error is not None and error > self._tolerance:
+                    raise TopologyVerificationError(
+                        f"Incremental betweenness diverged from full recomputation by {error:.3g}"
+                    )
+            except BaseException:
+                self._graph, self._raw = graph, raw
+                raise
+        return TopologyUpdate(added_count, removed_count, affected, error)
+
+    def verify(self) -> float:
+        """Return the max deviation from a full ``nx.betweenness_centrality`` run."""
+        with self._lock:
+            return self._verification_error()
+
+    def _update(self, source: str, target: str, *, insert: bool) -> int:
+        """Apply one edge change and patch the affected sources' contributions."""
+        to_source = self._reverse_distances(source)
+        to_target = self._reverse_distances(target)
+        affected: List[str] = []
+        for node, distance in to_source.items():
+            through_edge = distance + 1
+            current = to_target.get(node)
+            if insert and (current is None or through_edge <= current):
+                affected.append(node)
+            elif not insert and current == through_edge:
+                affected.append(node)
+
+        # Patching costs two single-source passes per affected source; past
+        # half the graph a full recomputation is cheaper.
+        patch = 2 * len(affected) < len(self._nodes)
+        if patch:
+            for node in affected:
+                self._raw -= self._single_source_dependencies(node)
+        if insert:
+            self._graph.add_edge(source, target)
+        else:
+            self._graph.remove_edge(source, target)
+        if patch:
+            for node in affected:
+                self._raw += self._single_source_dependencies(node)
+        else:
+            self._recompute()
+        return len(affected)
+
+    def _recompute(self) -> None:
+        """Rebuild raw betweenness from every source."""
+        self._raw = np.zeros(len(self._nodes))
+        for node in self._nodes:
+            self._raw += self._single_source_dependencies(node)
+
+    def _reverse_distances(self, target: str) -> Dict[str, int]:
+        """Breadth-first distances from every node that can reach ``target``."""
+        distances = {target: 0}
+        queue = deque([target])
+        while queue:
+            node = queue.popleft()
+            for predecessor in self._graph.predecessors(node):
+                if predecessor not in distances:
+                    distances[predecessor] = distances[node] + 1
+                    queue.append(predecessor)
+        return distances
+
+    def _single_source_dependencies(self, source: str) -> np.ndarray:
+        """Brandes dependency accumulation for a single unweighted source."""
+        sigma = {source: 1.0}
+        distance = {source: 0}
+        predecessors: Dict[str, List[str]] = {source: []}
+        order: List[str] = []
+        queue = deque([source])
+        while queue:
+            node = queue.popleft()
+            order.append(node)
+            for successor in self._graph.successors(node):
+                if successor not in distance:
+                    distance[successor] = distance[node] + 1
+                    sigma[successor] = 0.0
+                    predecessors[successor] = []
+                    queue.append(successor)
+                if distance[successor] == distance[node] + 1:
+                    sigma[successor] += sigma[node]
+                    predecessors[successor].append(node)
+
+        dependencies = np.zeros(len(self._nodes))
+        delta = dict.fromkeys(order, 0.0)
+        for node in reversed(order):
+            coefficient = (1.0 + delta[node]) / sigma[node]
+            for predecessor in predecessors[node]:
+                delta[predecessor] += sigma[predecessor] * coefficient
+            if node != source:
+                dependencies[self._index[node]] = delta[node]
+        return dependencies
+
+    def _normalised_betweenness(self) -> np.ndarray:
+        """Scale raw betweenness like ``nx.betweenness_centrality(normalized=True)``."""
+        n_nodes = len(self._nodes)
+        if n_nodes <= 2:
+            return self._raw.copy()
+        return self._raw / ((n_nodes - 1) * (n_nodes - 2))
+
+    def _normalised_in_degree(self) -> np.ndarray:
+        """Return in-degree divided by the maximum in-degree."""
+        in_degree = np.fromiter(
+            (self._graph.in_degree(node) for node in self._nodes), float, len(self._nodes)
+        )
+        max_in_degree = in_degree.max() if len(in_degree) else 0.0
+        return in_degree / max_in_degree if max_in_degree else in_degree
+
+    def _verification_error(self) -> float:
+        """Compare the maintained betweenness against a full recomputation."""
+        expected = nx.betweenness_centrality(self._graph, normalized=True, weight=None)
+        reference = np.fromiter((expected[node] for node in self._nodes), float, len(self._nodes))
+        return float(np.abs(self._normalised_betweenness() - reference).max(initial=0.0))
+
+    def _check_edge(self, source: str, target: str) -> None:
+        """Reject self-loops and edges referencing unknown services."""
+        if source == target:
+            raise ValueError(f"Self-dependency is not allowed: {source}")
+        for node in (source, target):
+            if node not in self._index:
+                raise ValueError(f"Unknown service in topology edge: {node}")
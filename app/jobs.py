@@ -0,0 +1,177 @@
+"""In-process queue for long-running simulation jobs."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, Optional, Union
+
+from .compute import ComputeQueueFull
+from .models import EnsembleResult, JobInfo, JobKind, JobStatus, SimulationResult
+
+JobResult = Union[SimulationResult, EnsembleResult]
+
+_FINISHED = (JobStatus.SUCCEEDED, JobStatus.FAILED, JobStatus.CANCELLED)
+
+
+class JobQueueFull(RuntimeError):
+    """Raised when too many jobs are queued or running."""
+
+
+class JobCancelled(Exception):
+    """Raised inside job work once cancellation has been requested."""
+
+
+class JobControl:
+    """Progress and cancellation channel shared between a job and its work."""
+
+    def __init__(self) -> None:
+        self._cancelled = threading.Event()
+        self.progress = 0.0
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether cancellation has been requested."""
+        return self._cancelled.is_set()
+
+    def cancel(self) -> None:
+        """Request cancellation; work stops at its next ``report`` call."""
+        self._cancelled.set()
+
+    def report(self, done: int, total: int) -> None:
+        """Record progress from any thread, raising ``JobCancelled`` if cancelled."""
+        if self.cancelled:
+            raise JobCancelled()
+        self.progress = done / total if total else 1.0
+
+
+@dataclass
+class _Job:
+    """Book-keeping for one submitted job."""
+
+    job_id: str
+    kind: JobKind
+    control: JobControl
+    created_at: datetime
+    status: JobStatus = JobStatus.QUEUED
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    result: Optional[JobResult] = None
+    error: Optional[str] = None
+    task: Optional["asyncio.Task[None]"] = field(default=None, repr=False)
+
+
+JobWork = Callable[[JobControl], Awaitable[JobResult]]
+
+
+class JobManager:
+    """Run submitted jobs with bounded concurrency and keep results until they expire.
+
+    At most ``max_concurrency`` jobs run at once and at most ``max_jobs`` may be
+    queued or running. Finished jobs are dropped ``ttl_seconds`` after they
+    finish. Work rejected by a saturated compute executor is retried after
+    ``retry_delay`` seconds rather than failing the job. Must be used from a
+    single event loop.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        max_jobs: int,
+        ttl_seconds: float,
+        retry_delay: float = 0.1,
+    ) -> None:
+        self._max_jobs = max_jobs
+        self._ttl = timedelta(seconds=ttl_seconds)
+        self._retry_delay = retry_delay
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self._jobs: Dict[str, _Job] = {}
+
+    def submit(self, kind: JobKind, work: JobWork) -> JobInfo:
+        """Queue ``work`` and return its initial status."""
+        self._purge_expired()
+        active = sum(job.status not in _FINISHED for job in self._jobs.values())
+        if active >= self._max_jobs:
+            raise JobQueueFull("Too many jobs are queued; retry later.")
+
+        job = _Job(uuid.uuid4().hex, kind, JobControl(), datetime.now(timezone.utc))
+        self._jobs[job.job_id] = job
+        job.task = asyncio.get_running_loop().create_task(self._run(job, work))
+        return self._info(job)
+
+    def get(self, job_id: str) -> Optional[JobInfo]:
+        """Return the status of ``job_id``, or ``None`` if unknown or expired."""
+        self._purge_expired()
+        job = self._jobs.get(job_id)
+        return self._info(job) if job is not None else None
+
+    def cancel(self, job_id: str) -> Optional[JobInfo]:
+        """Cancel a queued or running job; finished jobs are left unchanged."""
+        self._purge_expired()
+        job = self._jobs.get(job_id)
+        if job is None:
+            return None
+        if job.status not in _FINISHED:
+            job.control.cancel()
+            if job.task is not None:
+                job.task.cancel()
+            self._finish(job, JobStatus.CANCELLED)
+        return self._info(job)
+
+    async def _run(self, job: _Job, work: JobWork) -> None:
+        """Wait for a slot, run ``work`` and record its outcome."""
+        try:
+            async with self._slots:
+                job.status = JobStatus.RUNNING
+                job.started_at = datetime.now(timezone.utc)
+                while True:
+                    try:
+                        job.result = await work(job.control)
+                        break
+                    except ComputeQueueFull:
+                        await asyncio.sleep(self._retry_delay)
+            job.control.progress = 1.0
+            self._finish(job, JobStatus.SUCCEEDED)
+        except (asyncio.CancelledError, JobCancelled):
+            self._finish(job, JobStatus.CANCELLED)
+        except Exception as exc:  # noqa: BLE001 - reported to the client
+            job.error = str(exc) or type(exc).__name__
+            self._finish(job, JobStatus.FAILED)
+
+    @staticmethod
+    def _finish(job: _Job, status: JobStatus) -> None:
+        """Move ``job`` to a terminal state once."""
+        if job.status in _FINISHED:
+            return
+        job.status = status
+        job.finished_at = datetime.now(timezone.utc)
+
+    def _purge_expired(self) -> None:
+        """Drop finished jobs whose results have expired."""
+        now = datetime.now(timezone.utc)
+        expired = [
+            job_id
+            for job_id, job in self._jobs.items()
+            if job.finished_at is not None and job.finished_at + self._ttl <= now
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def _info(self, job: _Job) -> JobInfo:
+        """Describe ``job`` for API responses."""
+        return JobInfo(
+            job_id=job.job_id,
+            kind=job.kind,
+            status=job.status,
+            progress=job.control.progress,
+            created_at_utc=job.created_at,
+            started_at_utc=job.started_at,
+            finished_at_utc=job.finished_at,
+            expires_at_utc=job.finished_at + self._ttl if job.finished_at else None,
+            error=job.error,
+            simulation=job.result if job.kind == JobKind.SIMULATION else None,
+            ensemble=job.result if job.kind == JobKind.ENSEMBLE else None,
+        )
@@ -0,0 +1,337 @@
+"""Cached, warm-started node layouts for dependency graph rendering."""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Optional, Tuple
+
+import networkx as nx
+import numpy as np
+
+from .cache import LRUCache
+from .columnar import ColumnarResult
+from .models import CacheStats, LayoutAlgorithm
+
+# Matches the spring constant the renderer has always used.
+_SPRING_K = 0.7
+_COLD_ITERATIONS = 50
+
+
+@dataclass(frozen=True, eq=False)
+class Layout:
+    """Node positions for one topology, scaled to ``[-1, 1]``."""
+
+    topology_hash: str
+    names: Tuple[str, ...]
+    positions: np.ndarray
+    edges: FrozenSet[Tuple[str, str]]
+    algorithm: LayoutAlgorithm
+    warm_started: bool
+    digest: str
+
+    def position_map(self) -> Dict[str, np.ndarray]:
+        """Positions keyed by service name, as ``networkx`` drawing expects."""
+        return dict(zip(self.names, self.positions))
+
+
+def topology_hash(run: ColumnarResult) -> str:
+    """Digest of a run's service names and sorted edge list."""
+    order = np.lexsort((run.edge_targets, run.edge_sources))
+    hasher = hashlib.sha256("\0".join(run.service_names).encode())
+    hasher.update(np.ascontiguousarray(run.edge_sources[order], dtype=np.int32).tobytes())
+    hasher.update(np.ascontiguousarray(run.edge_targets[order], dtype=np.int32).tobytes())
+    return hasher.hexdigest()
+
+
+class LayoutEngine:
+    """Compute node positions once per topology and reuse them.
+
+    Layouts are cached per ``topology_hash``. A topology that is not cached
+    but whose edges differ from the previous layout's by at most
+    ``warm_start_max_change`` (as a share of their union) starts from the
+    previous positions and runs only ``warm_start_iterations`` iterations, so
+    small edits barely move the picture. ``AUTO`` uses ``networkx``'s spring
+    layout up to ``large_graph_threshold`` services and ``barnes_hut_layout``
+    above it.
+    """
+
+    def __init__(
+        self,
+        algorithm: LayoutAlgorithm = LayoutAlgorithm.AUTO,
+        *,
+        large_graph_threshold: int = 500,
+        max_entries: int = 256,
+        max_bytes: int = 16 * 1024 * 1024,
+        warm_start_max_change: float = 0.2,
+        warm_start_iterations: int = 15,
+        seed: int = 42,
+    ) -> None:
+        self._algorithm = algorithm
+        self._large_graph_threshold = large_graph_threshold
+        self._warm_start_max_change = warm_start_max_change
+        self._warm_start_iterations = warm_start_iterations
+        self._seed = seed
+        self._cache: LRUCache[Layout] = LRUCache("layout", max_entries=max_entries, max_bytes=max_bytes)
+        self._previous: Optional[Layout] = None
+        self._lock = threading.Lock()
+
+    def stats(self) -> CacheStats:
+        """Counters of the layout cache."""
+        return self._cache.stats()
+
+    def cached(self, run: ColumnarResult) -> Optional[Layout]:
+        """Return the cached layout of the run's topology, if any."""
+        return self._cache.get(topology_hash(run))
+
+    def layout(self, run: ColumnarResult) -> Layout:
+        """Return the layout of the run's topology, computing it on a miss."""
+        return self.cached(run) or self.build(run)
+
+    def build(self, run: ColumnarResult) -> Layout:
+        """Compute and cache a layout without consulting the cache first."""
+        key = topology_hash(run)
+        names = run.service_names
+        edges = frozenset(run.edge_names())
+        algorithm = self._resolve(len(names))
+        with self._lock:
+            previous = self._previous
+        initial = self._warm_start(previous, names, edges)
+
+        if algorithm == LayoutAlgorithm.BARNES_HUT:
+            positions = barnes_hut_layout(
+                len(names),
+                run.edge_sources,
+                run.edge_targets,
+                initial=initial,
+                iterations=self._warm_start_iterations if initial is not None else _COLD_ITERATIONS,
+                temperature=0.02 if initial is not None else 0.1,
+                seed=self._seed,
+            )
+        else:
+            positions = _spring_layout(
+                names,
+                edges,
+                initial,
+                self._warm_start_iterations if initial is not None else _COLD_ITERATIONS,
+                self._seed,
+            )
+
+        positions = np.clip(positions, -1.0, 1.0)
+        layout = Layout(
+            topology_hash=key,
+            names=names,
+            positions=positions,
+            edges=edges,
+            algorithm=algorithm,
+            warm_started=initial is not None,
+            digest=hashlib.sha256(positions.tobytes()).hexdigest()[:16],
+        )
+        self._cache.put(key, layout, positions.nbytes + 64 * (len(names) + len(edges)))
+        with self._lock:
+            self._previous = layout
+        return layout
+
+    def _resolve(self, n_services: int) -> LayoutAlgorithm:
+        """Pick the concrete algorithm for a graph of ``n_services``."""
+        if self._algorithm != LayoutAlgorithm.AUTO:
+            return self._algorithm
+        if n_services > self._large_graph_threshold:
+            return LayoutAlgorithm.BARNES_HUT
+        return LayoutAlgorithm.SPRING
+
+    def _warm_start(
+        self,
+        previous: Optional[Layout],
+        names: Tuple[str, ...],
+        edges: FrozenSet[Tuple[str, str]],
+    ) -> Optional[np.ndarray]:
+        """Initial positions from ``previous`` if the topology changed only slightly.
+
+        Services absent from ``previous`` start at the position of a placed
+        neighbour, or at the origin if they have none.
+        """
+        if previous is None:
+            return None
+        union = len(edges | previous.edges)
+        changed = len(edges ^ previous.edges)
+        if union and changed / union > self._warm_start_max_change:
+            return None
+        known = previous.position_map()
+        if not known.keys() & set(names):
+            return None
+
+        positions = np.zeros((len(names), 2))
+        placed = np.zeros(len(names), dtype=bool)
+        index = {name: position for position, name in enumerate(names)}
+        for name, position in index.items():
+            if name in known:
+                positions[position] = known[name]
+                placed[position] = True
+        for source, target in edges:
+            for node, neighbour in ((source, target), (target, source)):
+                if not placed[index[node]] and placed[index[neighbour]]:
+                    positions[index[node]] = known[neighbour]
+        return positions
+
+
+def _spring_layout(
+    names: Tuple[str, ...],
+    edges: FrozenSet[Tuple[str, str]],
+    initial: Optional[np.ndarray],
+    iterations: int,
+    seed: int,
+) -> np.ndarray:
+    """Run ``networkx``'s Fruchterman-Reingold layout, optionally from ``initial``."""
+    graph = nx.DiGraph()
+    graph.add_nodes_from(names)
+    graph.add_edges_from(sorted(edges))
+    pos = dict(zip(names, initial)) if initial is not None else None
+    result = nx.spring_layout(graph, pos=pos, iterations=iterations, seed=seed, k=_SPRING_K)
+    return np.array([result[name] for name in names], dtype=float).reshape(len(names), 2)
+
+
+def barnes_hut_layout(
+    n_nodes: int,
+    sources: np.ndarray,
+    targets: np.ndarray,
+    *,
+    initial: Optional[np.ndarray] = None,
+    iterations: int = _COLD_ITERATIONS,
+    temperature: float = 0.1,
+    seed: int = 42,
+    leaf_size: int = 1,
+) -> np.ndarray:
+    """Fruchterman-Reingold layout with O(n log n) approximate repulsion.
+
+    Space is divided into a quadtree of uniform grids. At each level a cell
+    is repelled by the centres of mass of the cells in its interaction list:
+    the children of its parent cell's neighbours that are not adjacent to
+    it. Only nodes in adjacent cells of the finest grid, sized for about
+    ``leaf_size`` nodes per cell, interact exactly. Unlike
+    ``nx.spring_layout`` on large graphs this needs no SciPy. Returns
+    positions rescaled to ``[-1, 1]``.
+    """
+    if n_nodes == 0:
+        return np.zeros((0, 2))
+    if n_nodes == 1:
+        return np.zeros((1, 2))
+
+    rng = np.random.default_rng(seed)
+    if initial is None:
+        pos = rng.random((n_nodes, 2))
+    else:
+        pos = _to_unit_square(np.asarray(initial, dtype=float))
+        pos += rng.normal(scale=1e-4, size=pos.shape)
+    k = 1.0 / np.sqrt(n_nodes)
+    levels = max(2, int(np.ceil(np.log2(np.sqrt(n_nodes / leaf_size)))))
+    cooling = temperature / (iterations + 1)
+    sources = np.asarray(sources, dtype=np.intp)
+    targets = np.asarray(targets, dtype=np.intp)
+
+    for _ in range(iterations):
+        lower = pos.min(axis=0)
+        span = max(float((pos.max(axis=0) - lower).max()), 1e-9)
+        unit = (pos - lower) / span
+        displacement = np.zeros_like(pos)
+
+        for level in range(2, levels + 1):
+            displacement += _far_field(pos, unit, level, k)
+        displacement += _near_field(pos, unit, levels, k)
+
+        delta = pos[sources] - pos[targets]
+        distance = np.sqrt((delta**2).sum(axis=1))[:, None]
+        pull = delta * distance / k
+        for axis in range(2):
+            displacement[:, axis] -= np.bincount(sources, pull[:, axis], minlength=n_nodes)
+            displacement[:, axis] += np.bincount(targets, pull[:, axis], minlength=n_nodes)
+
+        length = np.maximum(np.sqrt((displacement**2).sum(axis=1)), 1e-12)[:, None]
+        pos += displacement / length * np.minimum(length, temperature)
+        temperature = max(temperature - cooling, 1e-4)
+
+    return nx.rescale_layout(pos - pos.mean(axis=0))
+
+
+def _flat_cells(unit: np.ndarray, side: int) -> np.ndarray:
+    """Row-major cell index of unit-square positions on a ``side`` x ``side`` grid."""
+    cell = np.minimum((unit * side).astype(np.intp), side - 1)
+    return cell[:, 0] * side + cell[:, 1]
+
+
+def _far_field(pos: np.ndarray, unit: np.ndarray, level: int, k: float) -> np.ndarray:
+    """Repulsion between each occupied cell and its interaction list at ``level``.
+
+    Forces are evaluated at cell centres of mass and shared by every node in
+    the cell, so the cost is linear in occupied cells rather than nodes.
+    """
+    side = 2**level
+    flat = _flat_cells(unit, side)
+    mass = np.bincount(flat, minlength=side * side).astype(float)
+    centre = np.stack(
+        [np.bincount(flat, pos[:, axis], minlength=side * side) for axis in range(2)], axis=1
+    ) / np.maximum(mass, 1)[:, None]
+
+    occupied = np.flatnonzero(mass)
+    own_x, own_y = np.divmod(occupied, side)
+    span = np.arange(6)
+    cx = (2 * (own_x // 2 - 1))[:, None, None] + span[None, :, None]
+    cy = (2 * (own_y // 2 - 1))[:, None, None] + span[None, None, :]
+    valid = (
+        (cx >= 0)
+        & (cx < side)
+        & (cy >= 0)
+        & (cy < side)
+        & ((np.abs(cx - own_x[:, None, None]) > 1) | (np.abs(cy - own_y[:, None, None]) > 1))
+    )
+    index = np.where(valid, cx * side + cy, 0)
+    weight = np.where(valid, mass[index], 0.0)
+    delta = centre[occupied][:, None, None, :] - centre[index]
+    distance2 = np.maximum((delta**2).sum(axis=-1), 1e-12)
+    force = np.zeros((side * side, 2))
+    force[occupied] = (delta * (k * k * weight / distance2)[..., None]).sum(axis=(1, 2))
+    return force[flat]
+
+
+def _near_field(pos: np.ndarray, unit: np.ndarray, level: int, k: float) -> np.ndarray:
+    """Exact repulsion between nodes in adjacent cells of the finest grid."""
+    n_nodes = len(pos)
+    side = 2**level
+    flat = _flat_cells(unit, side)
+    cell = np.stack(np.divmod(flat, side), axis=1)
+    order = np.argsort(flat, kind="stable")
+    sorted_cells = flat[order]
+    all_cells = np.arange(side * side)
+    starts = np.searchsorted(sorted_cells, all_cells, side="left")
+    ends = np.searchsorted(sorted_cells, all_cells, side="right")
+
+    displacement = np.zeros_like(pos)
+    nodes = np.arange(n_nodes)
+    for dx in (-1, 0, 1):
+        for dy in (-1, 0, 1):
+            nx_, ny_ = cell[:, 0] + dx, cell[:, 1] + dy
+            inside = (nx_ >= 0) & (nx_ < side) & (ny_ >= 0) & (ny_ < side)
+            neighbour = np.where(inside, nx_ * side + ny_, 0)
+            counts = np.where(inside, ends[neighbour] - starts[neighbour], 0)
+            total = int(counts.sum())
+            if total == 0:
+                continue
+            i = np.repeat(nodes, counts)
+            offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+            j = order[np.repeat(starts[neighbour], counts) + offsets]
+            keep = i != j
+            i, j = i[keep], j[keep]
+            delta = pos[i] - pos[j]
+            distance2 = np.maximum((delta**2).sum(axis=1), 1e-12)
+            push = delta * (k * k / distance2)[:, None]
+            for axis in range(2):
+                displacement[:, axis] += np.bincount(i, push[:, axis], minlength=n_nodes)
+    return displacement
+
+
+def _to_unit_square(positions: np.ndarray) -> np.ndarray:
+    """Affinely map ``positions`` into ``[0, 1]``, preserving aspect ratio."""
+    lower = positions.min(axis=0)
+    span = max(float((positions.max(axis=0) - lower).max()), 1e-9)
+    return (positions - lower) / span
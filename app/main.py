@@ -3,30 +3,134 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
-from typing import Optional
+from functools import partial
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
 
-from fastapi import Depends, FastAPI, HTTPException
+from fastapi import Body, Depends, FastAPI, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 
+from .cache import LRUCache
+from .centrality import CentralityOptions
+from .coalesce import SingleFlight
+from .columnar import DECISION_ORDER, ColumnarResult, HistoryEntry
+from .compute import ComputeExecutor, ComputeQueueFull
 from .config import Settings, get_settings
+from .exporters import FILE_EXTENSIONS, MEDIA_TYPES, gzip_chunks, iter_export, negotiate_format
+from .history import open_backend
+from .incremental import IncrementalDependencyMetrics, TopologyUpdate, TopologyVerificationError
+from .jobs import JobControl, JobManager, JobQueueFull, JobResult
+from .layout import Layout, LayoutEngine, topology_hash
 from .models import (
+    CacheStats,
+    CentralityStrategy,
+    CICDBatchResponse,
     CICDHookRequest,
     CICDHookResponse,
+    ComputeStats,
+    DeploymentDecision,
+    EnsembleResult,
+    ExportFormat,
     ExportResponse,
+    ExportScope,
+    GraphEdge,
+    GraphLayout,
     HealthResponse,
+    HistoricalRecord,
     HistoricalSimulationResult,
+    JobInfo,
+    JobKind,
+    LayoutNode,
+    RenderKind,
+    ServiceHistoryPoint,
+    ServiceHistoryResponse,
     ServiceMetrics,
+    SimulationJobRequest,
     SimulationResult,
     SummaryResponse,
+    TopologyDelta,
+    TopologyRequest,
+    TopologyResponse,
 )
+from .parallel import ParallelEnsembleExecutor, simulate_in_worker
+from .prerender import Prerenderer
 from .risk_engine import RiskEngine
 from .storage import SimulationStorage
-from .viz import render_dependency_graph, render_risk_barchart
+from .viz import DEFAULT_DPI, RENDERERS, render_etag
 
 settings: Settings = get_settings()
 risk_engine = RiskEngine(settings=settings)
-simulation_storage = SimulationStorage(settings=settings)
+simulation_storage = SimulationStorage(settings=settings, backend=open_backend(settings))
+ensemble_executor: Optional[ParallelEnsembleExecutor] = (
+    ParallelEnsembleExecutor(max_workers=settings.ensemble_workers)
+    if settings.ensemble_workers > 1
+    else None
+)
+compute_executor = ComputeExecutor(
+    settings.compute_mode,
+    max_workers=settings.compute_workers,
+    max_queue=settings.compute_max_queue,
+)
+cicd_flight: SingleFlight[ColumnarResult] = SingleFlight(settings.cicd_coalesce_window_seconds)
+render_cache: LRUCache[bytes] = LRUCache(
+    "render",
+    max_entries=settings.render_cache_max_entries,
+    max_bytes=settings.render_cache_max_bytes,
+)
+render_flight: SingleFlight[bytes] = SingleFlight()
+layout_engine = LayoutEngine(
+    settings.layout_algorithm,
+    large_graph_threshold=settings.layout_large_graph_threshold,
+    max_entries=settings.layout_cache_max_entries,
+    max_bytes=settings.layout_cache_max_bytes,
+    warm_start_max_change=settings.layout_warm_start_max_change,
+    warm_start_iterations=settings.layout_warm_start_iterations,
+)
+layout_flight: SingleFlight[Layout] = SingleFlight()
+# Called with each newly recorded run; must return quickly.
+post_simulation_hooks: List[Callable[[ColumnarResult], None]] = []
+job_manager = JobManager(
+    max_concurrency=settings.job_max_concurrency,
+    max_jobs=settings.job_max_queued,
+    ttl_seconds=settings.job_ttl_seconds,
+)
+
+
+async def _prerender(run: ColumnarResult, kind: RenderKind, dpi: int) -> None:
+    """Fill the render cache for one image variant through the request layout and render paths.
+
+    Raises ``ComputeQueueFull`` when the compute queue has no room, which
+    drops the rest of the prerender.
+    """
+    layout = await _layout(run, compute_executor) if _uses_layout(kind, run) else None
+    options = _render_options(kind)
+    etag = render_etag(kind, run, dpi, layout, **options)
+    await _cached_render(etag, kind, run, dpi, layout, options, compute_executor)
+
+
+def _render_options(kind: RenderKind) -> Dict[str, object]:
+    """Configured keyword arguments for the ``kind`` renderer."""
+    if kind == RenderKind.GRAPH:
+        return {
+            "max_nodes": settings.viz_max_graph_nodes,
+            "max_clusters": settings.viz_max_clusters,
+            "cluster_risk": settings.viz_cluster_risk,
+        }
+    return {"max_bars": settings.viz_max_bars}
+
+
+def _uses_layout(kind: RenderKind, run: ColumnarResult) -> bool:
+    """Whether rendering ``kind`` for ``run`` draws every service at its layout position."""
+    return kind == RenderKind.GRAPH and len(run.service_names) <= settings.viz_max_graph_nodes
+
+
+prerenderer: Optional[Prerenderer] = None
+if settings.prerender_enabled:
+    prerenderer = Prerenderer(
+        _prerender,
+        [(kind, dpi) for dpi in settings.prerender_dpis for kind in (RenderKind.GRAPH, RenderKind.BARCHART)],
+    )
+    post_simulation_hooks.append(prerenderer.schedule)
 
 app = FastAPI(
     title="Rolling Update Risk Estimator",
@@ -45,6 +149,23 @@ app.add_middleware(
 )
 
 
+@app.on_event("shutdown")
+def _shutdown_executors() -> None:
+    """Stop background worker processes when the application exits."""
+    compute_executor.shutdown()
+    if prerenderer is not None:
+        prerenderer.shutdown()
+    if ensemble_executor is not None:
+        ensemble_executor.shutdown()
+    simulation_storage.close()
+
+
+@app.exception_handler(ComputeQueueFull)
+async def _compute_queue_full(request: Request, exc: ComputeQueueFull) -> JSONResponse:
+    """Shed load with 503 once the compute queue is saturated."""
+    return JSONResponse(status_code=503, content={"detail": str(exc)}, headers={"Retry-After": "1"})
+
+
 def get_engine() -> RiskEngine:
     """FastAPI dependency returning the singleton risk engine."""
     return risk_engine
@@ -55,12 +176,58 @@ def get_storage() -> SimulationStorage:
     return simulation_storage
 
 
+def get_compute() -> ComputeExecutor:
+    """FastAPI dependency returning the compute executor for heavy work."""
+    return compute_executor
+
+
+def get_centrality_options(
+    centrality: Optional[CentralityStrategy] = Query(
+        None, description="Betweenness strategy: exact, sampled or auto"
+    ),
+    centrality_pivots: Optional[int] = Query(
+        None, ge=2, description="Sampled source nodes for the sampled strategy"
+    ),
+    centrality_budget_ms: Optional[float] = Query(
+        None, gt=0, description="Latency budget used by the auto strategy"
+    ),
+) -> CentralityOptions:
+    """FastAPI dependency collecting per-request centrality overrides."""
+    return CentralityOptions(
+        strategy=centrality,
+        pivots=centrality_pivots,
+        latency_budget_ms=centrality_budget_ms,
+    )
+
+
 @app.get("/health", response_model=HealthResponse, tags=["Operational"])
 def health_check() -> HealthResponse:
     """Return a simple heartbeat payload."""
     return HealthResponse(status="ok", timestamp_utc=datetime.now(timezone.utc))
 
 
+@app.get(
+    "/cache/stats",
+    response_model=List[CacheStats],
+    summary="Inspect in-memory cache counters",
+    tags=["Operational"],
+)
+def cache_stats(engine: RiskEngine = Depends(get_engine)) -> List[CacheStats]:
+    """Return hit, miss and eviction counters for the service's caches."""
+    return [*engine.cache_stats(), render_cache.stats(), layout_engine.stats()]
+
+
+@app.get(
+    "/compute/stats",
+    response_model=ComputeStats,
+    summary="Inspect compute executor queue depth",
+    tags=["Operational"],
+)
+def compute_stats(compute: ComputeExecutor = Depends(get_compute)) -> ComputeStats:
+    """Return running, queued and rejected task counters of the compute executor."""
+    return compute.stats()
+
+
 @app.post(
     "/simulate",
     response_model=SimulationResult,
@@ -113,19 +280,22 @@ def health_check() -> HealthResponse:
         }
     },
 )
-def simulate(
+async def simulate(
     engine: RiskEngine = Depends(get_engine),
     storage: SimulationStorage = Depends(get_storage),
+    compute: ComputeExecutor = Depends(get_compute),
     seed: Optional[int] = None,
+    centrality: CentralityOptions = Depends(get_centrality_options),
 ) -> SimulationResult:
     """
     Execute a new simulation run using the current history context.
 
     The response includes service-level metrics, dependency edges, and
-    aggregated summary statistics.
+    aggregated summary statistics, plus the centrality strategy used for
+    dependency impact scores and its error bound.
     """
-    result = _execute_simulation(engine, storage, seed=seed)
-    return result
+    result = await _execute_simulation(engine, storage, compute, seed=seed, centrality=centrality)
+    return result.to_model()
 
 
 @app.post(
@@ -134,22 +304,205 @@ def simulate(
     summary="Run simulation and include history",
     tags=["Simulation"],
 )
-def simulate_with_history(
+async def simulate_with_history(
     engine: RiskEngine = Depends(get_engine),
     storage: SimulationStorage = Depends(get_storage),
+    compute: ComputeExecutor = Depends(get_compute),
     seed: Optional[int] = None,
+    centrality: CentralityOptions = Depends(get_centrality_options),
 ) -> HistoricalSimulationResult:
     """Execute a simulation and return the result with historical context."""
-    result = _execute_simulation(engine, storage, seed=seed)
+    run = await _execute_simulation(engine, storage, compute, seed=seed, centrality=centrality)
+    result = run.to_model()
     history = storage.history
     return HistoricalSimulationResult(
         summary=result.summary,
         services=result.services,
         edges=result.edges,
+        centrality=result.centrality,
         history=history,
     )
 
 
+@app.post(
+    "/simulate/ensemble",
+    response_model=EnsembleResult,
+    summary="Run a Monte Carlo ensemble of simulations",
+    tags=["Simulation"],
+)
+async def simulate_ensemble(
+    engine: RiskEngine = Depends(get_engine),
+    storage: SimulationStorage = Depends(get_storage),
+    compute: ComputeExecutor = Depends(get_compute),
+    n_runs: int = Query(100, ge=1, le=settings.ensemble_max_runs),
+    seed: Optional[int] = None,
+    centrality: CentralityOptions = Depends(get_centrality_options),
+) -> EnsembleResult:
+    """
+    Run ``n_runs`` simulations in one batched computation.
+
+    Returns per-service mean, p50, p90 and p99 risk together with the share of
+    runs that produced each deployment decision. Ensemble runs are not
+    recorded in the simulation history.
+    """
+    return await compute.run(
+        engine.run_ensemble,
+        n_runs,
+        seed=seed,
+        history=storage.latest_context(),
+        executor=ensemble_executor,
+        centrality=centrality,
+    )
+
+
+@app.post(
+    "/jobs/simulate",
+    response_model=JobInfo,
+    status_code=202,
+    summary="Queue a simulation or ensemble job",
+    tags=["Jobs"],
+)
+async def submit_simulation_job(
+    payload: SimulationJobRequest,
+    engine: RiskEngine = Depends(get_engine),
+    storage: SimulationStorage = Depends(get_storage),
+    compute: ComputeExecutor = Depends(get_compute),
+) -> JobInfo:
+    """
+    Queue a simulation and return immediately with a job id to poll.
+
+    Single simulations are recorded in the history like ``/simulate``;
+    ensembles report progress per batch and are not recorded.
+    """
+    if payload.kind == JobKind.ENSEMBLE and payload.n_runs > settings.ensemble_max_runs:
+        raise HTTPException(status_code=422, detail="n_runs exceeds ENSEMBLE_MAX_RUNS.")
+    centrality = CentralityOptions(
+        strategy=payload.centrality,
+        pivots=payload.centrality_pivots,
+        latency_budget_ms=payload.centrality_budget_ms,
+    )
+
+    async def work(control: JobControl) -> JobResult:
+        if payload.kind == JobKind.ENSEMBLE:
+            return await compute.run(
+                engine.run_ensemble,
+                payload.n_runs,
+                seed=payload.seed,
+                history=storage.latest_context(),
+                executor=ensemble_executor,
+                centrality=centrality,
+                progress=control.report,
+            )
+        result = await _execute_simulation(engine, storage, compute, payload.seed, centrality)
+        return result.to_model()
+
+    try:
+        return job_manager.submit(payload.kind, work)
+    except JobQueueFull as exc:
+        raise HTTPException(status_code=503, detail=str(exc), headers={"Retry-After": "1"}) from exc
+
+
+@app.get(
+    "/jobs/{job_id}",
+    response_model=JobInfo,
+    summary="Poll a job's status, progress and result",
+    tags=["Jobs"],
+)
+async def get_job(job_id: str) -> JobInfo:
+    """Return the current state of a job; results are kept until ``expires_at_utc``."""
+    info = job_manager.get(job_id)
+    if info is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired job.")
+    return info
+
+
+@app.delete(
+    "/jobs/{job_id}",
+    response_model=JobInfo,
+    summary="Cancel a queued or running job",
+    tags=["Jobs"],
+)
+async def cancel_job(job_id: str) -> JobInfo:
+    """Cancel a job; a cancelled simulation is not recorded in the history."""
+    info = job_manager.cancel(job_id)
+    if info is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired job.")
+    return info
+
+
+@app.put(
+    "/topology",
+    response_model=TopologyResponse,
+    summary="Replace the live service topology",
+    tags=["Topology"],
+)
+async def put_topology(
+    payload: TopologyRequest,
+    engine: RiskEngine = Depends(get_engine),
+    compute: ComputeExecutor = Depends(get_compute),
+) -> TopologyResponse:
+    """
+    Load a live dependency topology that subsequent simulations score against.
+
+    Betweenness is computed once here, on the compute executor, and then
+    maintained incrementally by ``PATCH /topology``.
+    """
+    services = payload.services or settings.service_names
+    try:
+        topology = await compute.run(
+            IncrementalDependencyMetrics,
+            services,
+            [(edge.source, edge.target) for edge in payload.edges],
+            verify=payload.verify,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+    engine.attach_topology(topology)
+    return _topology_response(topology, TopologyUpdate(topology.edge_count, 0, len(topology.nodes)))
+
+
+@app.patch(
+    "/topology",
+    response_model=TopologyResponse,
+    summary="Apply edge changes to the live topology",
+    tags=["Topology"],
+)
+async def patch_topology(
+    payload: TopologyDelta,
+    engine: RiskEngine = Depends(get_engine),
+    compute: ComputeExecutor = Depends(get_compute),
+) -> TopologyResponse:
+    """Insert and delete dependency edges; centrality is updated on the compute executor."""
+    topology = engine.live_topology
+    if topology is None:
+        raise HTTPException(status_code=404, detail="No live topology loaded.")
+    try:
+        update = await compute.run(
+            topology.apply,
+            added=[(edge.source, edge.target) for edge in payload.added],
+            removed=[(edge.source, edge.target) for edge in payload.removed],
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+    except TopologyVerificationError as exc:
+        # The topology rolled the delta back, so the client can retry safely.
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
+    return _topology_response(topology, update)
+
+
+@app.delete(
+    "/topology",
+    status_code=204,
+    response_class=Response,
+    summary="Return to randomly generated topologies",
+    tags=["Topology"],
+)
+def delete_topology(engine: RiskEngine = Depends(get_engine)) -> Response:
+    """Detach the live topology so simulations generate random graphs again."""
+    engine.attach_topology(None)
+    return Response(status_code=204)
+
+
 @app.get(
     "/services",
     response_model=SimulationResult,
@@ -164,6 +517,59 @@ def get_services(storage: SimulationStorage = Depends(get_storage)) -> Simulatio
     return latest
 
 
+@app.get(
+    "/services/{service_name}/history",
+    response_model=ServiceHistoryResponse,
+    summary="Retrieve one service's risk over time",
+    tags=["Insights"],
+)
+def get_service_history(
+    service_name: str,
+    storage: SimulationStorage = Depends(get_storage),
+    start: Optional[datetime] = Query(None, description="Inclusive lower bound (UTC if naive)"),
+    end: Optional[datetime] = Query(None, description="Exclusive upper bound (UTC if naive)"),
+    max_points: Optional[int] = Query(
+        None, ge=1, le=10_000, description="Downsample to at most this many points"
+    ),
+) -> ServiceHistoryResponse:
+    """Return the indexed risk score and decision of ``service_name``, oldest first."""
+    series = storage.service_series(service_name, start, end)
+    if series is None:
+        raise HTTPException(status_code=404, detail=f"No history for service '{service_name}'.")
+    total = len(series)
+    if max_points is not None:
+        series = series.downsample(max_points)
+    timestamps = series.timestamps.astype(datetime).tolist()
+    return ServiceHistoryResponse(
+        service_name=service_name,
+        total_points=total,
+        points=[
+            ServiceHistoryPoint(
+                timestamp_utc=timestamp.replace(tzinfo=timezone.utc),
+                risk_score=risk,
+                decision=DECISION_ORDER[code],
+            )
+            for timestamp, risk, code in zip(
+                timestamps, series.risk_scores.tolist(), series.decision_codes.tolist()
+            )
+        ],
+    )
+
+
+@app.get(
+    "/history",
+    response_model=List[HistoricalRecord],
+    summary="Retrieve recent simulation history",
+    tags=["Insights"],
+)
+def get_history(
+    storage: SimulationStorage = Depends(get_storage),
+    limit: int = Query(20, ge=1, le=1000),
+) -> List[HistoricalRecord]:
+    """Return up to ``limit`` recent runs, oldest first, including persisted runs."""
+    return [run.to_history_record() for run in storage.recent_runs(limit)]
+
+
 @app.get(
     "/summary",
     response_model=SummaryResponse,
@@ -172,7 +578,7 @@ def get_services(storage: SimulationStorage = Depends(get_storage)) -> Simulatio
 )
 def get_summary(storage: SimulationStorage = Depends(get_storage)) -> SummaryResponse:
     """Return summary metrics from the most recent simulation."""
-    latest = storage.latest_result
+    latest = storage.latest_run
     if latest is None:
         raise HTTPException(status_code=404, detail="Simulation not run yet.")
     summary = latest.summary
@@ -186,60 +592,135 @@ def get_summary(storage: SimulationStorage = Depends(get_storage)) -> SummaryRes
 
 @app.get(
     "/graph.png",
-    response_class=FileResponse,
+    response_class=Response,
+    responses={200: {"content": {"image/png": {}}}, 304: {"description": "Not modified"}},
     summary="Visualise the dependency graph",
     tags=["Visualisations"],
 )
-def graph_image(
+async def graph_image(
+    request: Request,
     storage: SimulationStorage = Depends(get_storage),
     engine: RiskEngine = Depends(get_engine),
-) -> FileResponse:
-    """Generate and return the dependency graph visualisation."""
-    latest = storage.latest_result
+    compute: ComputeExecutor = Depends(get_compute),
+    dpi: int = Query(DEFAULT_DPI, ge=50, le=600),
+) -> Response:
+    """Return the dependency graph visualisation of the latest run."""
+    return await _image_response(request, RenderKind.GRAPH, storage, engine, compute, dpi)
+
+
+@app.get(
+    "/graph/layout",
+    response_model=GraphLayout,
+    summary="Node positions of the dependency graph",
+    tags=["Visualisations"],
+)
+async def graph_layout(
+    storage: SimulationStorage = Depends(get_storage),
+    engine: RiskEngine = Depends(get_engine),
+    compute: ComputeExecutor = Depends(get_compute),
+) -> GraphLayout:
+    """Return the cached layout of the latest run so front ends can draw the graph."""
+    latest = storage.latest_run
     if latest is None:
-        latest = _execute_simulation(engine, storage)
-    output_path = settings.graph_image_path
-    render_dependency_graph(latest, output_path)
-    return FileResponse(output_path, media_type="image/png")
+        latest = await _execute_simulation(engine, storage, compute)
+    layout = await _layout(latest, compute)
+    rows = zip(
+        latest.service_names,
+        layout.positions.tolist(),
+        latest.table.risk_scores.tolist(),
+        latest.table.decisions(),
+    )
+    return GraphLayout(
+        topology_hash=layout.topology_hash,
+        algorithm=layout.algorithm,
+        warm_started=layout.warm_started,
+        nodes=[
+            LayoutNode(service_name=name, x=x, y=y, risk_score=risk, decision=decision)
+            for name, (x, y), risk, decision in rows
+        ],
+        edges=[GraphEdge(source=source, target=target) for source, target in latest.edge_names()],
+    )
 
 
 @app.get(
     "/barchart.png",
-    response_class=FileResponse,
+    response_class=Response,
+    responses={200: {"content": {"image/png": {}}}, 304: {"description": "Not modified"}},
     summary="Visualise service risk comparison",
     tags=["Visualisations"],
 )
-def barchart_image(
+async def barchart_image(
+    request: Request,
     storage: SimulationStorage = Depends(get_storage),
     engine: RiskEngine = Depends(get_engine),
-) -> FileResponse:
-    """Generate and return the risk comparison bar chart."""
-    latest = storage.latest_result
-    if latest is None:
-        latest = _execute_simulation(engine, storage)
-    output_path = settings.barchart_image_path
-    render_risk_barchart(latest, output_path)
-    return FileResponse(output_path, media_type="image/png")
+    compute: ComputeExecutor = Depends(get_compute),
+    dpi: int = Query(DEFAULT_DPI, ge=50, le=600),
+) -> Response:
+    """Return the risk comparison bar chart of the latest run."""
+    return await _image_response(request, RenderKind.BARCHART, storage, engine, compute, dpi)
 
 
 @app.post(
     "/export",
     response_model=ExportResponse,
-    summary="Export current run to CSV",
+    summary="Export current run to a file",
     tags=["Insights"],
 )
-def export_data(
+async def export_data(
     engine: RiskEngine = Depends(get_engine),
     storage: SimulationStorage = Depends(get_storage),
+    compute: ComputeExecutor = Depends(get_compute),
+    export_format: ExportFormat = Query(ExportFormat.CSV, alias="format"),
 ) -> ExportResponse:
-    """Export the latest simulation data to CSV and return file metadata."""
-    latest = storage.latest_result
+    """Export the latest simulation data and return file metadata."""
+    latest = storage.latest_run
     if latest is None:
-        latest = _execute_simulation(engine, storage)
-    export_metadata = storage.export(engine, latest)
+        latest = await _execute_simulation(engine, storage, compute)
+    export_metadata = await compute.run(storage.export, engine, latest, export_format)
     return export_metadata
 
 
+@app.get(
+    "/export/stream",
+    summary="Stream stored runs as CSV, NDJSON, Parquet or Arrow IPC",
+    response_class=StreamingResponse,
+    tags=["Insights"],
+)
+def export_stream(
+    request: Request,
+    storage: SimulationStorage = Depends(get_storage),
+    scope: ExportScope = Query(ExportScope.LATEST, description="Latest run or the full history"),
+    export_format: Optional[ExportFormat] = Query(
+        None, alias="format", description="Overrides the Accept header; defaults to CSV"
+    ),
+    start: Optional[datetime] = Query(None, description="History runs at or after (UTC if naive)"),
+    end: Optional[datetime] = Query(None, description="History runs before (UTC if naive)"),
+    gzip: bool = Query(False, description="Gzip-compress the payload"),
+) -> StreamingResponse:
+    """Stream rows straight from stored runs without building a DataFrame or file."""
+    if scope == ExportScope.LATEST:
+        latest = storage.latest_run
+        if latest is None:
+            raise HTTPException(status_code=404, detail="Simulation not run yet.")
+        runs: Iterable[ColumnarResult] = (latest,)
+    else:
+        # Pinned now, so runs recorded meanwhile cannot mix in; read lazily in chunks.
+        runs = storage.iter_runs(start, end)
+    export_format = export_format or negotiate_format(request.headers.get("accept"))
+    chunks = iter_export(runs, export_format)
+    filename = f"risk_estimator_{scope.value}{FILE_EXTENSIONS[export_format]}"
+    media_type = MEDIA_TYPES[export_format]
+    if gzip:
+        chunks = gzip_chunks(chunks)
+        filename += ".gz"
+        media_type = "application/gzip"
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
 @app.post(
     "/cicd-hook",
     response_model=CICDHookResponse,
@@ -260,15 +741,160 @@ def export_data(
         }
     },
 )
-def cicd_hook(
+async def cicd_hook(
     payload: CICDHookRequest,
     engine: RiskEngine = Depends(get_engine),
     storage: SimulationStorage = Depends(get_storage),
+    compute: ComputeExecutor = Depends(get_compute),
 ) -> CICDHookResponse:
-    """Perform a risk assessment for a CI/CD deployment trigger."""
-    result = _execute_simulation(engine, storage)
-    service_metric = _find_service_metric(result, payload.service_name)
+    """
+    Perform a risk assessment for a CI/CD deployment trigger.
+
+    Hook calls that overlap an in-flight simulation, or arrive within
+    ``CICD_COALESCE_WINDOW_SECONDS`` of its start, share that simulation.
+    """
+    result = await cicd_flight.do("cicd-hook", lambda: _execute_simulation(engine, storage, compute))
+    return _hook_response(_find_service_metric(result, payload.service_name))
+
+
+@app.post(
+    "/cicd-hook/batch",
+    response_model=CICDBatchResponse,
+    summary="Assess a multi-service release from CI/CD",
+    tags=["CI/CD"],
+)
+async def cicd_hook_batch(
+    payloads: List[CICDHookRequest] = Body(..., min_items=1),
+    engine: RiskEngine = Depends(get_engine),
+    storage: SimulationStorage = Depends(get_storage),
+    compute: ComputeExecutor = Depends(get_compute),
+) -> CICDBatchResponse:
+    """
+    Evaluate every service of a release against a single simulation.
+
+    The release may go ahead only if no service is blocked. The batch shares
+    its simulation with concurrent ``/cicd-hook`` calls.
+    """
+    result = await cicd_flight.do("cicd-hook", lambda: _execute_simulation(engine, storage, compute))
+    metrics = [_find_service_metric(result, payload.service_name) for payload in payloads]
+    decision = max((metric.decision for metric in metrics), key=DECISION_ORDER.index)
+    blocked = [
+        metric.service_name
+        for metric in metrics
+        if metric.decision == DeploymentDecision.BLOCK_DEPLOYMENT
+    ]
+    return CICDBatchResponse(
+        go=not blocked,
+        decision=decision,
+        blocked_services=list(dict.fromkeys(blocked)),
+        results=[_hook_response(metric) for metric in metrics],
+    )
 
+
+async def _execute_simulation(
+    engine: RiskEngine,
+    storage: SimulationStorage,
+    compute: ComputeExecutor,
+    seed: Optional[int] = None,
+    centrality: Optional[CentralityOptions] = None,
+) -> ColumnarResult:
+    """Helper to execute a simulation on the compute executor and persist its history."""
+    history_snapshot = storage.latest_context()
+    result = await compute.run(_simulate, engine, compute, history_snapshot, seed, centrality)
+    result = storage.record_run(result)
+    for hook in post_simulation_hooks:
+        hook(result)
+    return result
+
+
+def _simulate(
+    engine: RiskEngine,
+    compute: ComputeExecutor,
+    history: Sequence[HistoryEntry],
+    seed: Optional[int],
+    centrality: Optional[CentralityOptions],
+) -> ColumnarResult:
+    """Compute-thread body of a simulation; cache misses go to worker processes if configured."""
+    if not compute.uses_processes:
+        return engine.run_simulation_cached(history, seed=seed, centrality=centrality)
+
+    topology = engine.live_topology
+    snapshot = topology.snapshot() if topology is not None else None
+
+    def run_in_worker(
+        history: Sequence[HistoryEntry],
+        seed: Optional[int],
+        centrality: Optional[CentralityOptions],
+    ) -> ColumnarResult:
+        return compute.offload(simulate_in_worker, settings, history, seed, centrality, snapshot)
+
+    return engine.run_simulation_cached(history, seed=seed, centrality=centrality, runner=run_in_worker)
+
+
+async def _image_response(
+    request: Request,
+    kind: RenderKind,
+    storage: SimulationStorage,
+    engine: RiskEngine,
+    compute: ComputeExecutor,
+    dpi: int,
+) -> Response:
+    """Serve a cached PNG of the latest run, or ``304`` if the client already has it."""
+    latest = storage.latest_run
+    if latest is None:
+        latest = await _execute_simulation(engine, storage, compute)
+    layout = await _layout(latest, compute) if _uses_layout(kind, latest) else None
+    options = _render_options(kind)
+    etag = render_etag(kind, latest, dpi, layout, **options)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    png = await _cached_render(etag, kind, latest, dpi, layout, options, compute)
+    return Response(png, media_type="image/png", headers=headers)
+
+
+async def _cached_render(
+    etag: str,
+    kind: RenderKind,
+    run: ColumnarResult,
+    dpi: int,
+    layout: Optional[Layout],
+    options: Dict[str, object],
+    compute: ComputeExecutor,
+) -> bytes:
+    """PNG for ``etag`` from the render cache, or rendered once on the compute executor."""
+
+    async def render() -> bytes:
+        png = render_cache.get(etag)
+        if png is None:
+            extra = (layout,) if layout is not None else ()
+            renderer = partial(RENDERERS[kind], **options)
+            png = await compute.run(compute.offload, renderer, run, dpi, *extra)
+            render_cache.put(etag, png, len(png))
+        return png
+
+    return await render_flight.do(etag, render)
+
+
+async def _layout(run: ColumnarResult, compute: ComputeExecutor) -> Layout:
+    """Cached layout of the run's topology, computed on the compute executor on a miss."""
+    cached = layout_engine.cached(run)
+    if cached is not None:
+        return cached
+    return await layout_flight.do(topology_hash(run), lambda: compute.run(layout_engine.build, run))
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an ``If-None-Match`` header against ``etag``."""
+    if not if_none_match:
+        return False
+    candidates = {candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def _hook_response(service_metric: ServiceMetrics) -> CICDHookResponse:
+    """Build the CI/CD hook reply for one service's metrics."""
     message = (
         "Risk Estimator Hook Triggered → Calculated Risk Score = "
         f"{service_metric.risk_score:.0f}. {service_metric.decision.value}."
@@ -280,26 +906,26 @@ def cicd_hook(
     )
 
 
-def _execute_simulation(
-    engine: RiskEngine,
-    storage: SimulationStorage,
-    seed: Optional[int] = None,
-) -> SimulationResult:
-    """Helper to execute a simulation and persist its history."""
-    history_snapshot = storage.snapshot()
-    result = engine.run_simulation(history_snapshot, seed=seed)
-    history_entry = engine.build_history_entry(result)
-    storage.record(history_entry, result=result)
-    return result
+def _topology_response(
+    topology: IncrementalDependencyMetrics, update: TopologyUpdate
+) -> TopologyResponse:
+    """Describe the live topology after ``update`` was applied."""
+    return TopologyResponse(
+        service_count=len(topology.nodes),
+        edge_count=topology.edge_count,
+        added=update.added,
+        removed=update.removed,
+        affected_sources=update.affected_sources,
+        max_verification_error=update.max_verification_error,
+    )
 
 
-def _find_service_metric(result: SimulationResult, service_name: str) -> ServiceMetrics:
+def _find_service_metric(result: ColumnarResult, service_name: str) -> ServiceMetrics:
     """Locate metrics for a specific service within a result set."""
-    for metric in result.services:
-        if metric.service_name == service_name:
-            return metric
+    metric = result.service_metric(service_name)
+    if metric is not None:
+        return metric
     # Default to the highest risk service when requested service is absent.
-    highest = max(result.services, key=lambda svc: svc.risk_score)
-    return highest
+    return result.highest_risk_metric()
 
 
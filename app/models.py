@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from datetime import datetime
 from enum import Enum
-from typing import List, Literal, Optional
+from typing import Dict, List, Literal, Optional
 
 from pydantic import BaseModel, Field
 
@@ -17,6 +17,82 @@ class DeploymentDecision(str, Enum):
     BLOCK_DEPLOYMENT = "Block Deployment"
 
 
+class CentralityStrategy(str, Enum):
+    """How betweenness centrality is computed for dependency impact scores."""
+
+    EXACT = "exact"
+    SAMPLED = "sampled"
+    AUTO = "auto"
+
+
+class ComputeMode(str, Enum):
+    """Where simulation and rendering work is executed."""
+
+    THREAD = "thread"
+    PROCESS = "process"
+
+
+class HistoryBackendKind(str, Enum):
+    """Where recorded simulation runs are persisted."""
+
+    MEMORY = "memory"
+    SQLITE = "sqlite"
+    PARQUET = "parquet"
+
+
+class ExportScope(str, Enum):
+    """Which stored runs an export covers."""
+
+    LATEST = "latest"
+    HISTORY = "history"
+
+
+class RenderKind(str, Enum):
+    """Images served by the visualisation endpoints."""
+
+    GRAPH = "graph"
+    BARCHART = "barchart"
+
+
+class LayoutAlgorithm(str, Enum):
+    """Force-directed layout used to position dependency graph nodes."""
+
+    SPRING = "spring"
+    BARNES_HUT = "barnes_hut"
+    AUTO = "auto"
+
+
+class ClusterRisk(str, Enum):
+    """How a service cluster's colour summarises its members' risk."""
+
+    MAX = "max"
+    MEAN = "mean"
+
+
+class ExportFormat(str, Enum):
+    """Encodings supported by the export endpoints."""
+
+    CSV = "csv"
+    NDJSON = "ndjson"
+    PARQUET = "parquet"
+    ARROW = "arrow"
+
+
+class CentralityReport(BaseModel):
+    """Precision of the betweenness centrality behind dependency impact scores."""
+
+    requested_strategy: CentralityStrategy
+    strategy: CentralityStrategy = Field(..., description="Strategy actually used")
+    pivots: Optional[int] = Field(None, description="Sampled source nodes, if sampled")
+    confidence: float = Field(..., gt=0, lt=1)
+    betweenness_error_bound: float = Field(
+        ..., ge=0, le=1, description="Max additive error on normalised betweenness"
+    )
+    dependency_score_error_bound: float = Field(
+        ..., ge=0, le=100, description="Max additive error on dependency_impact_score"
+    )
+
+
 class ServiceMetrics(BaseModel):
     """Aggregated risk metrics for an individual microservice node."""
 
@@ -53,6 +129,56 @@ class GraphEdge(BaseModel):
     target: str = Field(..., description="Downstream dependent service")
 
 
+class LayoutNode(BaseModel):
+    """Position and risk of one service in a graph layout."""
+
+    service_name: str
+    x: float = Field(..., ge=-1, le=1)
+    y: float = Field(..., ge=-1, le=1)
+    risk_score: float = Field(..., ge=0, le=100)
+    decision: DeploymentDecision
+
+
+class GraphLayout(BaseModel):
+    """Node positions of the latest dependency graph for client-side drawing."""
+
+    topology_hash: str
+    algorithm: LayoutAlgorithm
+    warm_started: bool = Field(..., description="Started from the previous topology's positions")
+    nodes: List[LayoutNode]
+    edges: List[GraphEdge]
+
+
+class TopologyRequest(BaseModel):
+    """Full replacement of the live service topology."""
+
+    services: Optional[List[str]] = Field(
+        None, description="Services in the topology; defaults to the configured services"
+    )
+    edges: List[GraphEdge]
+    verify: bool = Field(
+        False, description="Check every incremental update against a full recomputation"
+    )
+
+
+class TopologyDelta(BaseModel):
+    """Edge insertions and deletions applied to the live topology."""
+
+    added: List[GraphEdge] = Field(default_factory=list)
+    removed: List[GraphEdge] = Field(default_factory=list)
+
+
+class TopologyResponse(BaseModel):
+    """State of the live topology after an update."""
+
+    service_count: int = Field(..., ge=0)
+    edge_count: int = Field(..., ge=0)
+    added: int = Field(..., ge=0)
+    removed: int = Field(..., ge=0)
+    affected_sources: int = Field(..., ge=0)
+    max_verification_error: Optional[float] = None
+
+
 class SimulationSummary(BaseModel):
     """High-level summary for a simulation run."""
 
@@ -70,6 +196,7 @@ class SimulationResult(BaseModel):
     summary: SimulationSummary
     services: List[ServiceMetrics]
     edges: List[GraphEdge]
+    centrality: Optional[CentralityReport] = None
 
 
 class HistoricalRecord(BaseModel):
@@ -85,6 +212,89 @@ class HistoricalSimulationResult(SimulationResult):
     history: List[HistoricalRecord]
 
 
+class ServiceHistoryPoint(BaseModel):
+    """Risk score and decision of one service at one point in time."""
+
+    timestamp_utc: datetime
+    risk_score: float = Field(..., ge=0, le=100)
+    decision: DeploymentDecision
+
+
+class ServiceHistoryResponse(BaseModel):
+    """Time series of a single service's risk across recorded runs."""
+
+    service_name: str
+    total_points: int = Field(..., ge=0, description="Points in the range before downsampling")
+    points: List[ServiceHistoryPoint]
+
+
+class ServiceRiskDistribution(BaseModel):
+    """Distribution of a service's risk score across an ensemble of runs."""
+
+    service_name: str
+    mean_risk: float = Field(..., ge=0, le=100)
+    p50_risk: float = Field(..., ge=0, le=100)
+    p90_risk: float = Field(..., ge=0, le=100)
+    p99_risk: float = Field(..., ge=0, le=100)
+    decision_probabilities: Dict[DeploymentDecision, float] = Field(
+        ..., description="Share of runs that produced each deployment decision"
+    )
+
+
+class EnsembleResult(BaseModel):
+    """Response payload describing a Monte Carlo ensemble of simulations."""
+
+    n_runs: int = Field(..., ge=1)
+    seed: Optional[int] = None
+    services: List[ServiceRiskDistribution]
+    centrality: Optional[CentralityReport] = None
+    generated_at_utc: datetime
+
+
+class JobKind(str, Enum):
+    """Work performed by an asynchronous job."""
+
+    SIMULATION = "simulation"
+    ENSEMBLE = "ensemble"
+
+
+class JobStatus(str, Enum):
+    """Lifecycle state of an asynchronous job."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+class SimulationJobRequest(BaseModel):
+    """Payload accepted by ``POST /jobs/simulate``."""
+
+    kind: JobKind = JobKind.SIMULATION
+    seed: Optional[int] = None
+    n_runs: int = Field(100, ge=1, description="Ensemble size, ignored for single simulations")
+    centrality: Optional[CentralityStrategy] = None
+    centrality_pivots: Optional[int] = Field(None, ge=2)
+    centrality_budget_ms: Optional[float] = Field(None, gt=0)
+
+
+class JobInfo(BaseModel):
+    """Status, progress and, once finished, result of an asynchronous job."""
+
+    job_id: str
+    kind: JobKind
+    status: JobStatus
+    progress: float = Field(..., ge=0, le=1)
+    created_at_utc: datetime
+    started_at_utc: Optional[datetime] = None
+    finished_at_utc: Optional[datetime] = None
+    expires_at_utc: Optional[datetime] = None
+    error: Optional[str] = None
+    simulation: Optional[SimulationResult] = None
+    ensemble: Optional[EnsembleResult] = None
+
+
 class ExportResponse(BaseModel):
     """Metadata returned after exporting the current run as CSV."""
 
@@ -111,6 +321,45 @@ class CICDHookResponse(BaseModel):
     decision: DeploymentDecision
 
 
+class CICDBatchResponse(BaseModel):
+    """Per-service hook decisions and the aggregate verdict for a release train."""
+
+    go: bool = Field(..., description="True when no service is blocked")
+    decision: DeploymentDecision = Field(..., description="Most restrictive decision in the batch")
+    blocked_services: List[str]
+    results: List[CICDHookResponse] = Field(..., description="Decisions in request order")
+
+
+class CacheStats(BaseModel):
+    """Counters describing the state of an in-memory cache."""
+
+    name: str
+    entries: int = Field(..., ge=0)
+    size_bytes: int = Field(..., ge=0)
+    max_entries: int = Field(..., ge=0)
+    max_bytes: int = Field(..., ge=0)
+    hits: int = Field(..., ge=0)
+    misses: int = Field(..., ge=0)
+    evictions: int = Field(..., ge=0)
+    expirations: int = Field(0, ge=0)
+    ttl_seconds: Optional[float] = Field(None, gt=0)
+
+
+class ComputeStats(BaseModel):
+    """Queue depth and throughput counters of the compute executor."""
+
+    mode: ComputeMode
+    max_workers: int = Field(..., ge=1)
+    max_queue: int = Field(..., ge=0)
+    running: int = Field(..., ge=0)
+    queued: int = Field(..., ge=0)
+    peak_queued: int = Field(..., ge=0)
+    submitted: int = Field(..., ge=0)
+    completed: int = Field(..., ge=0)
+    failed: int = Field(..., ge=0)
+    rejected: int = Field(..., ge=0)
+
+
 class HealthResponse(BaseModel):
     """Response contract for the /health endpoint."""
 
@@ -0,0 +1,108 @@
+"""Process-pool execution of Monte Carlo ensemble batches and simulations."""
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, FrozenSet, Iterable, Iterator, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .centrality import CentralityOptions, ResolvedCentrality
+from .columnar import ColumnarResult, HistoryEntry
+from .config import Settings
+from .ensemble import EnsembleAccumulator
+from .incremental import TopologySnapshot
+from .risk_engine import RiskEngine
+
+# Engines are rebuilt lazily inside each worker process and reused across
+# batches submitted with the same settings.
+_WORKER_ENGINES: Dict[str, RiskEngine] = {}
+
+
+def _worker_engine(settings: Settings) -> RiskEngine:
+    """Return the per-process engine for ``settings``, creating it on first use."""
+    key = settings.json()
+    engine = _WORKER_ENGINES.get(key)
+    if engine is None:
+        engine = _WORKER_ENGINES[key] = RiskEngine(settings=settings)
+    return engine
+
+
+def _run_batch(
+    settings: Settings,
+    blocked_services: FrozenSet[str],
+    n_runs: int,
+    seed_sequence: np.random.SeedSequence,
+    plan: Optional[ResolvedCentrality],
+) -> EnsembleAccumulator:
+    """Worker entry point simulating a single ensemble batch."""
+    engine = _worker_engine(settings)
+    return engine._simulate_batch(n_runs, blocked_services, seed_sequence, plan)
+
+
+def simulate_in_worker(
+    settings: Settings,
+    history: Sequence[HistoryEntry],
+    seed: Optional[int],
+    centrality: Optional[CentralityOptions],
+    topology: Optional[TopologySnapshot],
+) -> ColumnarResult:
+    """Worker entry point running one simulation, optionally on a live topology snapshot."""
+    engine = _worker_engine(settings)
+    return engine.run_simulation_columnar(history, seed=seed, centrality=centrality, topology=topology)
+
+
+class ParallelEnsembleExecutor:
+    """Spread ensemble batches across a ``ProcessPoolExecutor``.
+
+    Batches and their seed sequences are planned by the engine independently
+    of the worker count, and partial aggregates are merged in batch order, so
+    results are bit-for-bit identical to a single-process run.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None) -> None:
+        self._max_workers = max_workers or os.cpu_count() or 1
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def max_workers(self) -> int:
+        """Number of worker processes used by the pool."""
+        return self._max_workers
+
+    def map_batches(
+        self,
+        settings: Settings,
+        blocked_services: Iterable[str],
+        batches: Sequence[Tuple[int, np.random.SeedSequence]],
+        plan: Optional[ResolvedCentrality] = None,
+    ) -> Iterator[EnsembleAccumulator]:
+        """Simulate ``batches`` in parallel and yield their partial aggregates in order.
+
+        Batches still pending when the iterator is closed early are cancelled.
+        """
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self._max_workers)
+        blocked = frozenset(blocked_services)
+        futures = [
+            self._pool.submit(_run_batch, settings, blocked, n_runs, seed_sequence, plan)
+            for n_runs, seed_sequence in batches
+        ]
+        try:
+            for future in futures:
+                yield future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def shutdown(self) -> None:
+        """Stop the worker processes, if any were started."""
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+    def __enter__(self) -> "ParallelEnsembleExecutor":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.shutdown()
@@ -0,0 +1,86 @@
+"""Background pre-rendering of visual assets for the newest simulation."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, Optional, Sequence, Set, Tuple
+
+from .columnar import ColumnarResult
+from .compute import ComputeQueueFull
+from .models import RenderKind
+
+logger = logging.getLogger(__name__)
+
+RenderVariant = Tuple[RenderKind, int]
+
+
+class Prerenderer:
+    """Render configured image variants of each new run in a background task.
+
+    ``render(run, kind, dpi)`` is a coroutine expected to fill the render
+    cache, normally through the same layout and render paths as requests.
+    Variants are rendered one at a time. Each call to ``schedule``
+    supersedes every earlier run: queued or in-progress work for an older
+    run stops before its next variant, so a burst of simulations only
+    renders the newest one. When the compute queue is full the rest of the
+    run is dropped rather than competing with requests. Counters are plain
+    attributes.
+    """
+
+    def __init__(
+        self,
+        render: Callable[[ColumnarResult, RenderKind, int], Awaitable[None]],
+        variants: Sequence[RenderVariant],
+    ) -> None:
+        self._render = render
+        self._variants = tuple(variants)
+        self._generation = 0
+        self._turn: Optional[asyncio.Lock] = None
+        self._tasks: Set["asyncio.Task[None]"] = set()
+        self.scheduled = 0
+        self.rendered = 0
+        self.superseded = 0
+        self.dropped = 0
+        self.failed = 0
+
+    def schedule(self, run: ColumnarResult) -> None:
+        """Queue renders of ``run``, superseding any pending older run.
+
+        Must be called from the event loop.
+        """
+        self._generation += 1
+        self.scheduled += 1
+        task = asyncio.get_running_loop().create_task(self._work(self._generation, run))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def shutdown(self) -> None:
+        """Cancel queued and in-progress work."""
+        for task in list(self._tasks):
+            task.cancel()
+
+    async def idle(self) -> None:
+        """Wait until every scheduled run has been rendered, superseded or dropped."""
+        while self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _work(self, generation: int, run: ColumnarResult) -> None:
+        """Render every variant of ``run`` until a newer run is scheduled."""
+        if self._turn is None:
+            self._turn = asyncio.Lock()
+        async with self._turn:
+            for kind, dpi in self._variants:
+                if generation != self._generation:
+                    self.superseded += 1
+                    return
+                try:
+                    await self._render(run, kind, dpi)
+                except ComputeQueueFull:
+                    self.dropped += 1
+                    return
+                except Exception:  # noqa: BLE001 - a failed prerender only costs a cache miss
+                    logger.exception("Pre-rendering %s at %s dpi failed", kind.value, dpi)
+                    self.failed += 1
+                else:
+                    self.rendered += 1
@@ -0,0 +1,207 @@
+"""Preallocated ring buffer holding the rolling simulation history."""
+
+from __future__ import annotations
+
+import threading
+from datetime import datetime
+from typing import Iterator, List, Optional, Sequence, Tuple, Union, overload
+
+import numpy as np
+
+from .columnar import METRIC_COLUMNS, ColumnarResult, ServiceScoreTable
+from .models import CentralityReport, SimulationSummary
+from .timestamps import as_datetime64
+
+
+class HistoryOverwritten(LookupError):
+    """Raised when a view reads a run whose ring slot has since been reused or cleared."""
+
+
+class HistoryRing:
+    """Fixed-capacity history stored in ``(capacity, n_services, n_metrics)`` arrays.
+
+    Appending copies a run's columns into the next slot, overwriting the
+    oldest run once full, so memory stays constant after the first record.
+    The service axis grows only if a run has more services than any before.
+    Readers receive ``HistoryView`` objects addressed by sequence number.
+    Reads copy a run's rows out under the lock rather than returning views,
+    because a view of a slot would change under its reader when a later run
+    overwrites that slot. Reading a run overwritten since the view was taken
+    raises ``HistoryOverwritten`` instead of returning a newer run.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        self._capacity = capacity
+        self._metrics = np.zeros((capacity, 0, len(METRIC_COLUMNS)))
+        self._codes = np.zeros((capacity, 0), dtype=np.int8)
+        self._timestamps = np.zeros(capacity, dtype="datetime64[us]")
+        self._names: List[Tuple[str, ...]] = [()] * capacity
+        self._edges: List[Tuple[np.ndarray, np.ndarray]] = [(np.empty(0, np.int32),) * 2] * capacity
+        self._summaries: List[SimulationSummary] = [None] * capacity  # type: ignore[list-item]
+        self._centrality: List[Optional[CentralityReport]] = [None] * capacity
+        self._written = 0
+        self._cleared = 0
+        self._lock = threading.Lock()
+
+    @property
+    def capacity(self) -> int:
+        """Maximum number of runs retained."""
+        return self._capacity
+
+    @property
+    def written(self) -> int:
+        """Total number of runs ever appended."""
+        return self._written
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the preallocated arrays."""
+        return self._metrics.nbytes + self._codes.nbytes + self._timestamps.nbytes
+
+    def __len__(self) -> int:
+        return self._written - self._oldest()
+
+    def append(self, run: ColumnarResult) -> None:
+        """Copy ``run`` into the next slot in O(n_services)."""
+        n_services = len(run.service_names)
+        with self._lock:
+            if n_services > self._metrics.shape[1]:
+                self._grow(n_services)
+            slot = self._written % self._capacity
+            self._metrics[slot, :n_services] = run.table.metrics
+            self._codes[slot, :n_services] = run.table.decision_codes
+            self._timestamps[slot] = as_datetime64(run.summary.timestamp_utc)
+            self._names[slot] = run.service_names
+            self._edges[slot] = (run.edge_sources, run.edge_targets)
+            self._summaries[slot] = run.summary
+            self._centrality[slot] = run.centrality
+            self._written += 1
+
+    def clear(self) -> None:
+        """Forget every run while keeping the allocated arrays.
+
+        Sequence numbers keep counting, so views taken before the clear raise
+        ``HistoryOverwritten`` rather than reading later runs.
+        """
+        with self._lock:
+            self._cleared = self._written
+
+    def view(self) -> "HistoryView":
+        """Return a view of the retained runs, oldest first."""
+        with self._lock:
+            return HistoryView(self, self._oldest(), self._written)
+
+    def timestamps(self, start: int, stop: int) -> np.ndarray:
+        """Timestamps of runs ``start..stop`` (sequence numbers), oldest first."""
+        with self._lock:
+            self._check(start, stop)
+            return self._timestamps[np.arange(start, stop) % self._capacity]
+
+    def oldest_timestamp(self) -> Optional[np.datetime64]:
+        """Timestamp of the oldest run still held, or ``None`` when empty."""
+        with self._lock:
+            oldest = self._oldest()
+            return self._timestamps[oldest % self._capacity] if oldest < self._written else None
+
+    def entry(self, sequence: int) -> ColumnarResult:
+        """Copy the run numbered ``sequence`` out of its slot."""
+        return self.entries(sequence, sequence + 1)[0]
+
+    def entries(self, start: int, stop: int) -> Tuple[ColumnarResult, ...]:
+        """Copy runs ``start..stop`` out of the ring in one consistent read."""
+        with self._lock:
+            self._check(start, stop)
+            return tuple(self._read(sequence) for sequence in range(start, stop))
+
+    def _oldest(self) -> int:
+        """Sequence number of the oldest run still held."""
+        return max(self._cleared, self._written - self._capacity)
+
+    def _check(self, start: int, stop: int) -> None:
+        """Raise unless runs ``start..stop`` are all still held; caller holds the lock."""
+        if start < stop and (start < self._oldest() or stop > self._written):
+            raise HistoryOverwritten(f"history runs {start}..{stop} are no longer held")
+
+    def _read(self, sequence: int) -> ColumnarResult:
+        """Build a ``ColumnarResult`` from copies of a slot's arrays; caller holds the lock."""
+        slot = sequence % self._capacity
+        names = self._names[slot]
+        n_services = len(names)
+        sources, targets = self._edges[slot]
+        metrics = self._metrics[slot, :n_services].copy()
+        codes = self._codes[slot, :n_services].copy()
+        metrics.flags.writeable = codes.flags.writeable = False
+        return ColumnarResult(
+            table=ServiceScoreTable(service_names=names, metrics=metrics, decision_codes=codes),
+            edge_sources=sources,
+            edge_targets=targets,
+            summary=self._summaries[slot],
+            centrality=self._centrality[slot],
+        )
+
+    def _grow(self, n_services: int) -> None:
+        """Widen the service axis to ``n_services``, keeping existing rows."""
+        width = self._metrics.shape[1]
+        metrics = np.zeros((self._capacity, n_services, len(METRIC_COLUMNS)))
+        codes = np.zeros((self._capacity, n_services), dtype=np.int8)
+        metrics[:, :width] = self._metrics
+        codes[:, :width] = self._codes
+        self._metrics, self._codes = metrics, codes
+
+
+class HistoryView(Sequence[ColumnarResult]):
+    """Read-only window over a ``HistoryRing`` addressed by run sequence numbers.
+
+    Reading a run that the ring no longer holds raises ``HistoryOverwritten``;
+    call ``detach`` to copy the whole window out at once.
+    """
+
+    def __init__(self, ring: HistoryRing, start: int, stop: int) -> None:
+        self._ring = ring
+        self._start = start
+        self._stop = stop
+
+    def __len__(self) -> int:
+        return self._stop - self._start
+
+    @overload
+    def __getitem__(self, index: int) -> ColumnarResult: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "HistoryView": ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[ColumnarResult, "HistoryView"]:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                raise ValueError("HistoryView slices must be contiguous")
+            return HistoryView(self._ring, self._start + start, self._start + max(start, stop))
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("history index out of range")
+        return self._ring.entry(self._start + index)
+
+    def __iter__(self) -> Iterator[ColumnarResult]:
+        for sequence in range(self._start, self._stop):
+            yield self._ring.entry(sequence)
+
+    def timestamps(self) -> np.ndarray:
+        """Timestamps of the viewed runs as ``datetime64[us]`` (UTC)."""
+        return self._ring.timestamps(self._start, self._stop)
+
+    def between(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> "HistoryView":
+        """Narrow the view to runs recorded within ``[start, end)``; naive bounds are UTC."""
+        timestamps = self.timestamps()
+        lower = 0 if start is None else int(np.searchsorted(timestamps, as_datetime64(start)))
+        upper = len(self) if end is None else int(np.searchsorted(timestamps, as_datetime64(end)))
+        return self[lower:upper]
+
+    def detach(self) -> Tuple[ColumnarResult, ...]:
+        """Copy every viewed run out of the ring under one lock acquisition.
+
+        The result is unaffected by later overwrites; raises
+        ``HistoryOverwritten`` if any viewed run is already gone.
+        """
+        return self._ring.entries(self._start, self._stop)
+
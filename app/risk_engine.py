@@ -2,49 +2,315 @@
 
 from __future__ import annotations
 
+import dataclasses
+import hashlib
 from datetime import datetime, timezone
-from typing import Iterable, List, Optional, Sequence
+from typing import TYPE_CHECKING, Callable, Hashable, Iterable, List, Optional, Sequence
 
-import networkx as nx
 import numpy as np
 import pandas as pd
 
+from .cache import LRUCache
+from .centrality import (
+    CentralityOptions,
+    ResolvedCentrality,
+    build_report,
+    compute_betweenness,
+    resolve_centrality,
+)
+from .columnar import (
+    BLOCK_CODE,
+    DECISION_ORDER,
+    METRIC_COLUMNS,
+    RISK_COLUMN,
+    ColumnarResult,
+    HistoryEntry,
+    ResultLike,
+    ServiceScoreTable,
+    as_columnar,
+    name_order,
+)
 from .config import Settings, get_settings
+from .ensemble import EnsembleAccumulator
+from .graph import DependencyGraph, TopologySampler
+from .incremental import IncrementalDependencyMetrics, TopologySnapshot
 from .models import (
+    CacheStats,
+    CentralityStrategy,
     DeploymentDecision,
-    GraphEdge,
+    EnsembleResult,
     HistoricalRecord,
     ServiceMetrics,
     SimulationResult,
     SimulationSummary,
 )
 
+if TYPE_CHECKING:  # pragma: no cover
+    from .parallel import ParallelEnsembleExecutor
+
+# Weights applied to (dependency, rollback, change, error spike, latency).
+_RISK_WEIGHTS = np.array([0.4, 0.2, 0.15, 0.15, 0.1])
+
+# Upper-exclusive risk score bounds for Auto Approve and Manual Review.
+_DECISION_THRESHOLDS = np.array([40.0, 70.0])
+
+_EXACT_CENTRALITY = ResolvedCentrality(CentralityStrategy.EXACT, CentralityStrategy.EXACT)
+
+# Approximate bookkeeping cost of one centrality cache entry beyond its arrays.
+_CACHE_ENTRY_OVERHEAD = 256
+
+# Approximate size of a cached run's summary and names beyond its arrays.
+_RESULT_ENTRY_OVERHEAD = 1024
+
+# Computes a result on a cache miss: (history, seed, centrality) -> result.
+SimulationRunner = Callable[
+    [Sequence[HistoryEntry], Optional[int], Optional[CentralityOptions]], ColumnarResult
+]
+
 
 class RiskEngine:
     """Core risk engine responsible for graph simulation and scoring."""
 
     def __init__(self, settings: Optional[Settings] = None) -> None:
         self._settings = settings or get_settings()
+        self._centrality_cache: LRUCache[tuple[np.ndarray, np.ndarray]] = LRUCache(
+            "centrality",
+            max_entries=self._settings.centrality_cache_max_entries,
+            max_bytes=self._settings.centrality_cache_max_bytes,
+        )
+        self._result_cache: LRUCache[ColumnarResult] = LRUCache(
+            "simulation_result",
+            max_entries=self._settings.result_cache_max_entries,
+            max_bytes=self._settings.result_cache_max_bytes,
+            ttl_seconds=self._settings.result_cache_ttl_seconds,
+        )
+        self._live_topology: Optional[IncrementalDependencyMetrics] = None
+
+        self._sampler = TopologySampler.compile(
+            self._settings.service_names, self._settings.dependency_candidates
+        )
+        self._node_names = self._sampler.names
+        self._topology_digest = self._sampler.digest()
+
+    @property
+    def live_topology(self) -> Optional[IncrementalDependencyMetrics]:
+        """Live topology used by ``run_simulation`` instead of random graphs."""
+        return self._live_topology
+
+    def attach_topology(self, topology: Optional[IncrementalDependencyMetrics]) -> None:
+        """Simulate against ``topology`` from now on, or random graphs when ``None``.
+
+        Ensembles always sample random topologies.
+        """
+        self._live_topology = topology
+
+    def cache_stats(self) -> List[CacheStats]:
+        """Return counters for the engine's internal caches."""
+        return [self._centrality_cache.stats(), self._result_cache.stats()]
 
     def run_simulation(
         self,
-        history: Sequence[HistoricalRecord] | None = None,
+        history: Sequence[HistoryEntry] | None = None,
         seed: Optional[int] = None,
+        centrality: Optional[CentralityOptions] = None,
     ) -> SimulationResult:
         """Create a new simulation using optional history for adjustments."""
+        return self.run_simulation_columnar(history, seed=seed, centrality=centrality).to_model()
+
+    def run_simulation_columnar(
+        self,
+        history: Sequence[HistoryEntry] | None = None,
+        seed: Optional[int] = None,
+        centrality: Optional[CentralityOptions] = None,
+        topology: Optional[TopologySnapshot] = None,
+    ) -> ColumnarResult:
+        """Run a simulation and return it in columnar form without pydantic models.
+
+        ``topology`` overrides the attached live topology, which lets worker
+        processes score a snapshot taken in the parent.
+        """
         history = list(history or [])
         rng = np.random.default_rng(seed)
+        blocked_services = self._collect_blocked_services(history)
+        if topology is None and self._live_topology is not None:
+            topology = self._live_topology.snapshot()
+        if topology is not None:
+            return self._simulate_live_topology(topology, blocked_services, rng)
 
         graph = self._generate_dependency_graph(rng)
-        blocked_services = self._collect_blocked_services(history)
-        services = self._generate_service_metrics(graph, blocked_services, rng)
-        summary = self._summarise_services(services)
-        edges = [GraphEdge(source=u, target=v) for u, v in graph.edges()]
+        plan = resolve_centrality(graph.n_nodes, graph.n_edges, centrality, self._settings)
+        table = self._score_services(graph, blocked_services, rng, plan)
+
+        _, rank = self._name_ranks(graph.names)
+        return ColumnarResult(
+            table=table,
+            edge_sources=rank[graph.sources],
+            edge_targets=rank[graph.targets],
+            summary=self._summarise_table(table),
+            centrality=build_report(plan, len(table), self._settings.centrality_confidence),
+        )
+
+    def run_simulation_cached(
+        self,
+        history: Sequence[HistoryEntry] | None = None,
+        seed: Optional[int] = None,
+        centrality: Optional[CentralityOptions] = None,
+        runner: Optional[SimulationRunner] = None,
+    ) -> ColumnarResult:
+        """Like ``run_simulation_columnar`` but reuse results of seeded reruns.
+
+        A seeded run is fully determined by the seed, the configured topology,
+        the blocked-service set taken from ``history`` and the centrality
+        options, so those form the cache key. Unseeded runs and runs against a
+        live topology are never cached. Hits get a fresh summary timestamp.
+        Misses are computed by ``runner``, defaulting to this engine.
+        """
+        history = list(history or [])
+        run = runner or self._run_columnar
+        key = self._result_cache_key(history, seed, centrality)
+        if key is None:
+            return run(history, seed, centrality)
+
+        cached = self._result_cache.get(key)
+        if cached is not None:
+            summary = cached.summary.copy(update={"timestamp_utc": datetime.now(timezone.utc)})
+            return dataclasses.replace(cached, summary=summary)
+
+        result = run(history, seed, centrality)
+        self._result_cache.put(key, result, result.nbytes + _RESULT_ENTRY_OVERHEAD)
+        return result
+
+    def _run_columnar(
+        self,
+        history: Sequence[HistoryEntry],
+        seed: Optional[int],
+        centrality: Optional[CentralityOptions],
+    ) -> ColumnarResult:
+        """Default ``SimulationRunner`` computing the result in this process."""
+        return self.run_simulation_columnar(history, seed=seed, centrality=centrality)
+
+    def _result_cache_key(
+        self,
+        history: Sequence[HistoryEntry] | None,
+        seed: Optional[int],
+        centrality: Optional[CentralityOptions],
+    ) -> Optional[Hashable]:
+        """Return the result cache key, or ``None`` when the run is not cacheable."""
+        if seed is None or self._live_topology is not None:
+            return None
+        blocked = sorted(self._collect_blocked_services(list(history or [])))
+        blocked_digest = hashlib.sha256("\0".join(blocked).encode()).hexdigest()
+        return seed, self._topology_digest, blocked_digest, centrality or CentralityOptions()
+
+    def _simulate_live_topology(
+        self,
+        snapshot: TopologySnapshot,
+        blocked_services: Iterable[str],
+        rng: np.random.Generator,
+    ) -> ColumnarResult:
+        """Score services on a live topology using its maintained centrality."""
+        dependency_score = self._normalise_to_percentage_array(
+            0.6 * snapshot.betweenness + 0.4 * snapshot.normalised_in_degree
+        )
+        table = self._score_columns(snapshot.nodes, dependency_score, blocked_services, rng)
+        position = {name: index for index, name in enumerate(table.service_names)}
+        edges = np.array(
+            [(position[u], position[v]) for u, v in snapshot.edges], dtype=np.int32
+        ).reshape(-1, 2)
+        return ColumnarResult(
+            table=table,
+            edge_sources=edges[:, 0],
+            edge_targets=edges[:, 1],
+            summary=self._summarise_table(table),
+            centrality=build_report(
+                _EXACT_CENTRALITY, len(table), self._settings.centrality_confidence
+            ),
+        )
 
-        return SimulationResult(summary=summary, services=services, edges=edges)
+    def run_ensemble(
+        self,
+        n_runs: int,
+        seed: Optional[int] = None,
+        history: Sequence[HistoryEntry] | None = None,
+        executor: Optional["ParallelEnsembleExecutor"] = None,
+        centrality: Optional[CentralityOptions] = None,
+        progress: Optional[Callable[[int, int], None]] = None,
+    ) -> EnsembleResult:
+        """Run ``n_runs`` simulations as batched array work and summarise them.
+
+        Runs are split into fixed-size batches, each drawing from its own
+        ``SeedSequence`` child so a given seed always yields the same result,
+        whether the batches run in-process or on ``executor``'s workers. The
+        centrality strategy is resolved once against the largest graph the
+        candidate table can produce and shared by every run. ``progress`` is
+        called with ``(runs_done, n_runs)`` after each batch; exceptions it
+        raises abort the ensemble.
+        """
+        if n_runs < 1:
+            raise ValueError("n_runs must be at least 1")
+        blocked_services = self._collect_blocked_services(list(history or []))
+        nodes, sorted_names = self._ensemble_nodes()
+        plan = resolve_centrality(len(nodes), self._sampler.max_edge_count, centrality, self._settings)
+        batches = self._plan_ensemble_batches(n_runs, seed)
+        if executor is not None and len(batches) > 1:
+            partials = executor.map_batches(self._settings, blocked_services, batches, plan)
+        else:
+            partials = (
+                self._simulate_batch(batch_runs, blocked_services, seed_sequence, plan)
+                for batch_runs, seed_sequence in batches
+            )
 
-    def build_history_entry(self, result: SimulationResult) -> HistoricalRecord:
+        accumulator = EnsembleAccumulator.empty(sorted_names)
+        for partial in partials:
+            accumulator.merge(partial)
+            if progress is not None:
+                progress(accumulator.n_runs, n_runs)
+        result = accumulator.summarise(seed=seed)
+        result.centrality = build_report(plan, len(nodes), self._settings.centrality_confidence)
+        return result
+
+    def _plan_ensemble_batches(
+        self, n_runs: int, seed: Optional[int]
+    ) -> List[tuple[int, np.random.SeedSequence]]:
+        """Split ``n_runs`` into batches paired with independent seed sequences."""
+        batch_size = self._settings.ensemble_batch_size
+        sizes = [min(batch_size, n_runs - start) for start in range(0, n_runs, batch_size)]
+        children = np.random.SeedSequence(seed).spawn(len(sizes))
+        return list(zip(sizes, children))
+
+    def _ensemble_nodes(self) -> tuple[tuple[str, ...], tuple[str, ...]]:
+        """Return graph node order and the name-sorted order used in results."""
+        return self._node_names, name_order(self._node_names)[1]
+
+    def _simulate_batch(
+        self,
+        n_runs: int,
+        blocked_services: Iterable[str],
+        seed_sequence: np.random.SeedSequence,
+        plan: Optional[ResolvedCentrality] = None,
+    ) -> EnsembleAccumulator:
+        """Simulate ``n_runs`` independent runs and accumulate their risk scores."""
+        rng = np.random.default_rng(seed_sequence)
+        nodes, sorted_names = self._ensemble_nodes()
+
+        dependency_score = np.empty((n_runs, len(nodes)))
+        for run in range(n_runs):
+            graph = self._generate_dependency_graph(rng)
+            dependency_score[run] = self._dependency_scores(graph, plan)
+
+        draws = rng.uniform(0, 100, size=(n_runs, len(nodes), 4))
+        metrics = self._compose_metrics(dependency_score, draws, self._blocked_mask(nodes, blocked_services))
+
+        order, _ = name_order(self._node_names)
+        risk_scores = metrics[:, order, RISK_COLUMN]
+        accumulator = EnsembleAccumulator.empty(sorted_names)
+        accumulator.add(risk_scores, self._classify_risk_array(risk_scores))
+        return accumulator
+
+    def build_history_entry(self, result: ResultLike) -> HistoricalRecord:
         """Convert a simulation result into a persisted history record."""
+        if isinstance(result, ColumnarResult):
+            return result.to_history_record()
         return HistoricalRecord(summary=result.summary, services=result.services)
 
     def update_history(
@@ -56,56 +322,29 @@ class RiskEngine:
             new_history = new_history[-self._settings.history_limit :]
         return new_history
 
-    def results_to_dataframe(self, result: SimulationResult) -> pd.DataFrame:
+    def results_to_dataframe(self, result: ResultLike) -> pd.DataFrame:
         """Convert a simulation result into a pandas DataFrame for export."""
-        records = [
-            {
-                "service_name": metrics.service_name,
-                "dependency_impact_score": metrics.dependency_impact_score,
-                "rollback_rate": metrics.rollback_rate,
-                "change_frequency": metrics.change_frequency,
-                "error_spike_history": metrics.error_spike_history,
-                "latency_instability": metrics.latency_instability,
-                "risk_score": metrics.risk_score,
-                "decision": metrics.decision.value,
-                "timestamp_utc": result.summary.timestamp_utc.isoformat(),
-            }
-            for metrics in result.services
-        ]
-        return pd.DataFrame.from_records(records)
-
-    def _generate_dependency_graph(self, rng: np.random.Generator) -> nx.DiGraph:
+        run = as_columnar(result)
+        dataframe = pd.DataFrame(run.table.metrics, columns=list(METRIC_COLUMNS))
+        dataframe.insert(0, "service_name", list(run.service_names))
+        decision_labels = np.array([decision.value for decision in DECISION_ORDER], dtype=object)
+        dataframe["decision"] = decision_labels[run.table.decision_codes]
+        dataframe["timestamp_utc"] = run.summary.timestamp_utc.isoformat()
+        return dataframe
+
+    def _generate_dependency_graph(self, rng: np.random.Generator) -> DependencyGraph:
         """Create a directed dependency graph with randomised edges."""
-        graph = nx.DiGraph()
-        service_names = self._settings.service_names
-        graph.add_nodes_from(service_names)
-
-        for service in service_names:
-            candidates = self._settings.dependency_candidates.get(service, [])
-            if not candidates:
-                continue
-            max_edges = max(1, len(candidates) // 2)
-            edge_count = int(rng.integers(0, max_edges + 1))
-            chosen = rng.choice(candidates, size=edge_count, replace=False) if edge_count else []
-            for dependency in chosen:
-                if dependency != service:
-                    graph.add_edge(dependency, service)
-
-        # Ensure the graph remains weakly connected by connecting isolated nodes.
-        isolated_nodes = list(nx.isolates(graph))
-        for node in isolated_nodes:
-            other = rng.choice([n for n in service_names if n != node])
-            graph.add_edge(other, node)
-
-        return graph
+        return self._sampler.sample(rng)
 
     def _collect_blocked_services(
-        self, history: Sequence[HistoricalRecord]
+        self, history: Sequence[HistoryEntry]
     ) -> set[str]:
         """Identify services that were blocked in the latest history entry."""
         if not history:
             return set()
         latest = history[-1]
+        if isinstance(latest, ColumnarResult):
+            return latest.table.blocked_services()
         return {
             metrics.service_name
             for metrics in latest.services
@@ -114,74 +353,112 @@ class RiskEngine:
 
     def _generate_service_metrics(
         self,
-        graph: nx.DiGraph,
+        graph: DependencyGraph,
         blocked_services: Iterable[str],
         rng: np.random.Generator,
     ) -> List[ServiceMetrics]:
         """Produce risk metrics for each service in the graph."""
-        blocked_lookup = set(blocked_services)
-        betweenness = nx.betweenness_centrality(graph, normalized=True, weight=None)
-        in_degrees = dict(graph.in_degree())
-        max_in_degree = max(in_degrees.values()) if in_degrees else 1
-
-        services: List[ServiceMetrics] = []
-        for service in graph.nodes():
-            dependency_score = self._normalise_to_percentage(
-                0.6 * betweenness.get(service, 0.0)
-                + 0.4 * (in_degrees.get(service, 0) / max_in_degree if max_in_degree else 0)
-            )
+        return self._score_services(graph, blocked_services, rng).to_models()
+
+    def _score_services(
+        self,
+        graph: DependencyGraph,
+        blocked_services: Iterable[str],
+        rng: np.random.Generator,
+        plan: Optional[ResolvedCentrality] = None,
+    ) -> ServiceScoreTable:
+        """Score every service in the graph as NumPy columns, sorted by name."""
+        dependency_score = self._dependency_scores(graph, plan)
+        return self._score_columns(graph.names, dependency_score, blocked_services, rng)
 
-            rollback_rate = float(rng.uniform(0, 100))
-            if service in blocked_lookup:
-                rollback_rate *= 0.85
-
-            metrics = {
-                "dependency_impact_score": dependency_score,
-                "rollback_rate": self._normalise_to_percentage(rollback_rate / 100),
-                "change_frequency": float(rng.uniform(0, 100)),
-                "error_spike_history": float(rng.uniform(0, 100)),
-                "latency_instability": float(rng.uniform(0, 100)),
-            }
-
-            for key in ("change_frequency", "error_spike_history", "latency_instability"):
-                metrics[key] = round(metrics[key], 2)
-
-            final_metrics = self._build_service_metrics(service, metrics)
-            services.append(final_metrics)
-
-        return sorted(services, key=lambda item: item.service_name)
-
-    def _build_service_metrics(
-        self, service: str, metrics: dict[str, float]
-    ) -> ServiceMetrics:
-        """Calculate the final service metrics record."""
-        dependency_score = metrics["dependency_impact_score"]
-        rollback_rate = metrics["rollback_rate"]
-        change_frequency = metrics["change_frequency"]
-        error_spike_history = metrics["error_spike_history"]
-        latency_instability = metrics["latency_instability"]
-
-        risk_score = (
-            0.4 * dependency_score
-            + 0.2 * rollback_rate
-            + 0.15 * change_frequency
-            + 0.15 * error_spike_history
-            + 0.1 * latency_instability
+    def _score_columns(
+        self,
+        nodes: Sequence[str],
+        dependency_score: np.ndarray,
+        blocked_services: Iterable[str],
+        rng: np.random.Generator,
+    ) -> ServiceScoreTable:
+        """Draw the random metric columns for ``nodes`` and score them."""
+        # One draw per service and column, in the same row-major order as the
+        # historical per-service loop: rollback, change, error spike, latency.
+        draws = rng.uniform(0, 100, size=(len(nodes), 4))
+        metrics = self._compose_metrics(dependency_score, draws, self._blocked_mask(nodes, blocked_services))
+
+        order, sorted_names = name_order(tuple(nodes))
+        metrics = metrics[order]
+        return ServiceScoreTable(
+            service_names=sorted_names,
+            metrics=metrics,
+            decision_codes=self._classify_risk_array(metrics[:, RISK_COLUMN]),
         )
 
-        risk_score = round(min(max(risk_score, 0), 100), 2)
-        decision = self._classify_risk(risk_score)
-
-        return ServiceMetrics(
-            service_name=service,
-            dependency_impact_score=round(dependency_score, 2),
-            rollback_rate=round(rollback_rate, 2),
-            change_frequency=round(change_frequency, 2),
-            error_spike_history=round(error_spike_history, 2),
-            latency_instability=round(latency_instability, 2),
-            risk_score=risk_score,
-            decision=decision,
+    def _dependency_scores(
+        self,
+        graph: DependencyGraph,
+        plan: Optional[ResolvedCentrality] = None,
+    ) -> np.ndarray:
+        """Return the 0-100 dependency impact score for every node in graph order."""
+        centrality, in_degree = self._topology_metrics(graph, plan or _EXACT_CENTRALITY)
+        return self._normalise_to_percentage_array(0.6 * centrality + 0.4 * in_degree)
+
+    def _topology_metrics(
+        self,
+        graph: DependencyGraph,
+        plan: ResolvedCentrality,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Return betweenness and normalised in-degree, cached by topology digest."""
+        digest = graph.digest()
+        key = (digest, plan.strategy, plan.pivots)
+        cached = self._centrality_cache.get(key)
+        if cached is not None:
+            return cached
+
+        centrality = compute_betweenness(graph, plan, digest=digest)
+        in_degree = graph.in_degree().astype(float)
+        max_in_degree = in_degree.max() if graph.n_nodes else 0.0
+        if max_in_degree:
+            in_degree = in_degree / max_in_degree
+        centrality.flags.writeable = False
+        in_degree.flags.writeable = False
+
+        size_bytes = centrality.nbytes + in_degree.nbytes + _CACHE_ENTRY_OVERHEAD
+        self._centrality_cache.put(key, (centrality, in_degree), size_bytes)
+        return centrality, in_degree
+
+    @staticmethod
+    def _name_ranks(nodes: Sequence[str]) -> tuple[np.ndarray, np.ndarray]:
+        """Return the name-sorting permutation of ``nodes`` and its inverse."""
+        order, _ = name_order(tuple(nodes))
+        rank = np.empty(len(order), dtype=np.int32)
+        rank[order] = np.arange(len(order), dtype=np.int32)
+        return order, rank
+
+    @staticmethod
+    def _blocked_mask(nodes: Sequence[str], blocked_services: Iterable[str]) -> np.ndarray:
+        """Return a boolean mask marking previously blocked services."""
+        blocked_lookup = set(blocked_services)
+        return np.fromiter((node in blocked_lookup for node in nodes), bool, len(nodes))
+
+    def _compose_metrics(
+        self,
+        dependency_score: np.ndarray,
+        draws: np.ndarray,
+        blocked_mask: np.ndarray,
+    ) -> np.ndarray:
+        """Combine dependency scores and uniform draws into ``METRIC_COLUMNS``.
+
+        ``dependency_score`` has shape ``(..., n)`` and ``draws`` ``(..., n, 4)``;
+        any leading dimensions are treated as independent simulation runs.
+        """
+        rollback_rate = np.where(blocked_mask, draws[..., 0] * 0.85, draws[..., 0])
+        rollback_rate = self._normalise_to_percentage_array(rollback_rate / 100)
+        rounded_draws = np.round(draws[..., 1:], 2)
+
+        components = np.concatenate(
+            (dependency_score[..., None], rollback_rate[..., None], rounded_draws), axis=-1
         )
+        risk_score = np.round(np.clip(components @ _RISK_WEIGHTS, 0, 100), 2)
+        return np.concatenate((np.round(components, 2), risk_score[..., None]), axis=-1)
 
     @staticmethod
     def _classify_risk(score: float) -> DeploymentDecision:
@@ -192,6 +469,11 @@ class RiskEngine:
             return DeploymentDecision.MANUAL_REVIEW
         return DeploymentDecision.BLOCK_DEPLOYMENT
 
+    @staticmethod
+    def _classify_risk_array(scores: np.ndarray) -> np.ndarray:
+        """Vectorised ``_classify_risk`` returning ``DECISION_ORDER`` codes."""
+        return np.searchsorted(_DECISION_THRESHOLDS, scores, side="right").astype(np.int8)
+
     @staticmethod
     def _normalise_to_percentage(value: float) -> float:
         """Normalise a floating point number into the 0-100 range."""
@@ -201,6 +483,11 @@ class RiskEngine:
             return 100.0
         return value * 100
 
+    @staticmethod
+    def _normalise_to_percentage_array(values: np.ndarray) -> np.ndarray:
+        """Vectorised ``_normalise_to_percentage``."""
+        return np.clip(values, 0, 1) * 100
+
     def _summarise_services(self, services: Sequence[ServiceMetrics]) -> SimulationSummary:
         """Build a summary for the provided service metrics."""
         risks = [service.risk_score for service in services]
@@ -217,4 +504,21 @@ class RiskEngine:
             timestamp_utc=datetime.now(timezone.utc),
         )
 
+    def _summarise_table(self, table: ServiceScoreTable) -> SimulationSummary:
+        """Build a summary directly from a columnar score table."""
+        risks = table.risk_scores
+        highest = int(np.argmax(risks))
+        blocked = [
+            name
+            for name, code in zip(table.service_names, table.decision_codes.tolist())
+            if code == BLOCK_CODE
+        ]
 
+        return SimulationSummary(
+            average_risk=round(float(risks.mean()), 2),
+            highest_risk_service=table.service_names[highest],
+            highest_risk_score=float(risks[highest]),
+            blocked_services=blocked,
+            blocked_count=len(blocked),
+            timestamp_utc=datetime.now(timezone.utc),
+        )
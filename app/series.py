@@ -0,0 +1,148 @@
+"""Per-service time-series index over recorded simulation runs."""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Optional
+
+import numpy as np
+
+from .columnar import ColumnarResult
+from .timestamps import as_datetime64
+
+
+@dataclass(frozen=True)
+class ServiceSeries:
+    """Timestamps, risk scores and decision codes of one service, oldest first."""
+
+    timestamps: np.ndarray
+    risk_scores: np.ndarray
+    decision_codes: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def downsample(self, max_points: int) -> "ServiceSeries":
+        """Merge consecutive points into at most ``max_points`` buckets.
+
+        Each bucket keeps its last timestamp, the mean risk score and the most
+        restrictive decision, so a blocked run is never averaged away.
+        """
+        if len(self) <= max_points:
+            return self
+        starts = np.linspace(0, len(self), max_points, endpoint=False).astype(np.intp)
+        ends = np.append(starts[1:], len(self))
+        return ServiceSeries(
+            timestamps=self.timestamps[ends - 1],
+            risk_scores=np.add.reduceat(self.risk_scores, starts) / (ends - starts),
+            decision_codes=np.maximum.reduceat(self.decision_codes, starts),
+        )
+
+
+class _Column:
+    """Append-only arrays for one service with amortised O(1) appends.
+
+    Storage is twice ``retention``; when it fills, the newest ``retention``
+    points are moved to the front, so old points are dropped in bulk rather
+    than per append.
+    """
+
+    def __init__(self, retention: int) -> None:
+        self._retention = retention
+        size = min(2 * retention, 64)
+        self.timestamps = np.empty(size, dtype="datetime64[us]")
+        self.risk_scores = np.empty(size)
+        self.decision_codes = np.empty(size, dtype=np.int8)
+        self.length = 0
+
+    def append(self, timestamp: np.datetime64, risk_score: float, decision_code: int) -> None:
+        if self.length == len(self.timestamps):
+            self._make_room()
+        self.timestamps[self.length] = timestamp
+        self.risk_scores[self.length] = risk_score
+        self.decision_codes[self.length] = decision_code
+        self.length += 1
+
+    def _make_room(self) -> None:
+        size = len(self.timestamps)
+        if size < 2 * self._retention:
+            grown = min(2 * size, 2 * self._retention)
+            for name in ("timestamps", "risk_scores", "decision_codes"):
+                column = getattr(self, name)
+                replacement = np.empty(grown, dtype=column.dtype)
+                replacement[:size] = column
+                setattr(self, name, replacement)
+            return
+        keep = slice(self.length - self._retention, self.length)
+        for column in (self.timestamps, self.risk_scores, self.decision_codes):
+            column[: self._retention] = column[keep]
+        self.length = self._retention
+
+
+class ServiceSeriesIndex:
+    """Incrementally maintained per-service history of risk score and decision.
+
+    ``append`` costs O(n_services) per run and each service keeps its last
+    ``retention`` points. ``series`` locates a time range by binary search, so
+    a query costs O(log n + points returned) regardless of how much history
+    is held. Runs must be appended in timestamp order, which
+    ``SimulationStorage`` guarantees by stamping runs when it records them.
+    """
+
+    def __init__(self, retention: int) -> None:
+        self._retention = retention
+        self._columns: Dict[str, _Column] = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, service_name: object) -> bool:
+        return service_name in self._columns
+
+    def append(self, run: ColumnarResult) -> None:
+        """Add one point per service in ``run``."""
+        timestamp = as_datetime64(run.summary.timestamp_utc)
+        risks = run.table.risk_scores.tolist()
+        codes = run.table.decision_codes.tolist()
+        with self._lock:
+            for name, risk, code in zip(run.service_names, risks, codes):
+                column = self._columns.get(name)
+                if column is None:
+                    column = self._columns[name] = _Column(self._retention)
+                column.append(timestamp, risk, code)
+
+    def clear(self) -> None:
+        """Forget every service."""
+        with self._lock:
+            self._columns = {}
+
+    def series(
+        self,
+        service_name: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> Optional[ServiceSeries]:
+        """Copy the points of ``service_name`` within ``[start, end)``.
+
+        Returns ``None`` if the service has never been recorded.
+        """
+        with self._lock:
+            column = self._columns.get(service_name)
+            if column is None:
+                return None
+            first = max(0, column.length - self._retention)
+            timestamps = column.timestamps[first : column.length]
+            lower = 0 if start is None else _search(timestamps, start)
+            upper = len(timestamps) if end is None else _search(timestamps, end)
+            window = slice(first + lower, first + max(lower, upper))
+            return ServiceSeries(
+                timestamps=column.timestamps[window].copy(),
+                risk_scores=column.risk_scores[window].copy(),
+                decision_codes=column.decision_codes[window].copy(),
+            )
+
+
+def _search(timestamps: np.ndarray, moment: datetime) -> int:
+    """Index of the first timestamp at or after ``moment``."""
+    return int(np.searchsorted(timestamps, as_datetime64(moment), side="left"))
+
@@ -1,70 +1,275 @@
-"""In-memory storage utilities for simulation history and exports."""
+"""Storage utilities for simulation history and exports."""
 
 from __future__ import annotations
 
-from datetime import datetime, timezone
+import dataclasses
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import List, Optional, Sequence, TYPE_CHECKING
+from typing import Iterator, List, Optional, Tuple, TYPE_CHECKING
 
+import numpy as np
+
+from .columnar import ColumnarResult, HistoryEntry, ResultLike, as_columnar
 from .config import Settings, get_settings
-from .models import ExportResponse, HistoricalRecord, SimulationResult
+from .exporters import FILE_EXTENSIONS, iter_export
+from .history import HistoryBackend, MemoryHistoryBackend, SeriesHistoryBackend
+from .ring_buffer import HistoryOverwritten, HistoryRing, HistoryView
+from .models import ExportFormat, ExportResponse, HistoricalRecord, SimulationResult
+from .series import ServiceSeries, ServiceSeriesIndex
+from .timestamps import as_datetime64, as_utc, from_datetime64
 
 if TYPE_CHECKING:  # pragma: no cover
     from .risk_engine import RiskEngine
 
+logger = logging.getLogger(__name__)
+
+# Hot-tier runs copied out of the ring at a time when streaming history.
+STREAM_CHUNK_RUNS = 64
+
+_MICROSECOND = timedelta(microseconds=1)
+
 
 class SimulationStorage:
-    """Stateful helper that tracks simulation history and handles exports."""
+    """Stateful helper that tracks simulation history and handles exports.
 
-    def __init__(self, settings: Optional[Settings] = None) -> None:
+    Runs are held in columnar form; pydantic models are only built when the
+    ``history`` or ``latest_result`` properties are read. The last
+    ``history_limit`` runs form an in-memory hot tier, a preallocated
+    ``HistoryRing`` that serves ``snapshot`` and ``latest_result``; every run
+    is also appended to ``backend``, which warms the hot tier on start-up.
+    Backend appends run in order on a dedicated writer thread, so recording
+    never blocks the caller (the event loop) on database or file I/O.
+    A ``ServiceSeriesIndex`` over the same runs answers per-service trend
+    queries without scanning whole runs.
+    """
+
+    def __init__(
+        self,
+        settings: Optional[Settings] = None,
+        backend: Optional[HistoryBackend] = None,
+    ) -> None:
         self._settings = settings or get_settings()
-        self._history: List[HistoricalRecord] = []
-        self._latest_result: Optional[SimulationResult] = None
+        self._backend: HistoryBackend = backend or MemoryHistoryBackend()
+        self._history = HistoryRing(self._settings.history_limit)
+        self._series = ServiceSeriesIndex(self._settings.history_limit)
+        recent = self._backend.recent(self._settings.history_limit)
+        for run in recent:
+            self._history.append(run)
+            self._series.append(run)
+        self._latest_run: Optional[ColumnarResult] = recent[-1] if recent else None
+        self._last_stamp: Optional[datetime] = recent[-1].summary.timestamp_utc if recent else None
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="history-writer")
+        self._last_write: Optional[Future[None]] = None
 
     @property
     def history(self) -> List[HistoricalRecord]:
-        """Return a copy of the stored simulation history."""
-        return list(self._history)
+        """Return the stored simulation history as pydantic records."""
+        return [run.to_history_record() for run in self._history.view().detach()]
+
+    @property
+    def latest_run(self) -> Optional[ColumnarResult]:
+        """Return the most recent simulation result in columnar form."""
+        return self._latest_run
 
     @property
     def latest_result(self) -> Optional[SimulationResult]:
         """Return the most recent simulation result, if available."""
-        return self._latest_result
+        return self._latest_run.to_model() if self._latest_run is not None else None
 
     def record(
-        self, entry: HistoricalRecord, *, result: Optional[SimulationResult] = None
-    ) -> None:
-        """Persist a new history entry while observing the configured limit."""
-        self._history.append(entry)
-        if len(self._history) > self._settings.history_limit:
-            self._history = self._history[-self._settings.history_limit :]
+        self, entry: HistoryEntry, *, result: Optional[ResultLike] = None
+    ) -> ColumnarResult:
+        """Persist a new history entry while observing the configured limit.
+
+        The entry is re-stamped with the recording time, never earlier than
+        the previous record, so stored runs are in timestamp order even when
+        simulations finish out of order. The hot tier and series index are
+        updated before returning; the backend append is queued on the writer
+        thread. Returns the stamped run.
+        """
+        run = self._stamp(as_columnar(entry))
+        self._last_write = self._writer.submit(self._append_to_backend, run)
+        self._history.append(run)
+        self._series.append(run)
         if result is not None:
-            self._latest_result = result
+            self._latest_run = run if result is entry else as_columnar(result)
+        return run
+
+    def record_run(self, run: ColumnarResult) -> ColumnarResult:
+        """Persist a columnar run as both a history entry and the latest result.
+
+        Returns the run as stored, stamped with its recording time.
+        """
+        return self.record(run, result=run)
+
+    def recent_runs(self, limit: int) -> List[ColumnarResult]:
+        """Return up to ``limit`` recent runs, reading past the hot tier if needed."""
+        view = self._history.view()
+        if limit <= len(view):
+            return list(view[len(view) - limit :].detach())
+        self.flush()
+        return self._backend.recent(limit) or list(view.detach())
+
+    def service_series(
+        self,
+        service_name: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> Optional[ServiceSeries]:
+        """Return the history of one service, or ``None`` if never recorded.
+
+        The in-memory series index answers when ``start`` lies within the hot
+        tier. An unbounded or earlier ``start`` is pushed down to the backend
+        instead when it can answer trend queries (the Parquet log).
+        """
+        if isinstance(self._backend, SeriesHistoryBackend):
+            hot_start = self._history.oldest_timestamp()
+            if start is None or hot_start is None or as_datetime64(start) < hot_start:
+                self.flush()
+                series = self._backend.service_series(service_name, start, end)
+                if series is not None:
+                    return series
+        return self._series.series(service_name, start, end)
+
+    def flush(self) -> None:
+        """Wait until every recorded run has been handed to the backend."""
+        last_write = self._last_write
+        if last_write is not None:
+            last_write.result()
+
+    def close(self) -> None:
+        """Finish queued backend writes and release the history backend."""
+        self._writer.shutdown(wait=True)
+        self._backend.close()
+
+    def _stamp(self, run: ColumnarResult) -> ColumnarResult:
+        """Copy of ``run`` timestamped now, or at the previous stamp if the clock went back."""
+        now = datetime.now(timezone.utc)
+        if self._last_stamp is not None and now < self._last_stamp:
+            now = self._last_stamp
+        self._last_stamp = now
+        return dataclasses.replace(run, summary=run.summary.copy(update={"timestamp_utc": now}))
+
+    def _append_to_backend(self, run: ColumnarResult) -> None:
+        """Writer-thread body persisting one run."""
+        try:
+            self._backend.append(run)
+        except Exception:  # noqa: BLE001 - the hot tier still holds the run
+            logger.exception("Persisting a simulation run to the history backend failed")
 
     def clear(self) -> None:
-        """Erase all stored history."""
+        """Erase the in-memory hot tier; persisted history is kept."""
         self._history.clear()
-        self._latest_result = None
+        self._series.clear()
+        self._latest_run = None
+
+    def snapshot(self) -> HistoryView:
+        """Obtain a read-only view of the history, oldest first.
+
+        Reading a run overwritten since the view was taken raises
+        ``HistoryOverwritten``; ``detach`` the view to keep its runs.
+        """
+        return self._history.view()
 
-    def snapshot(self) -> Sequence[HistoricalRecord]:
-        """Obtain a read-only snapshot of the history."""
-        return tuple(self._history)
+    def iter_runs(
+        self, start: Optional[datetime] = None, end: Optional[datetime] = None
+    ) -> Iterator[ColumnarResult]:
+        """Stream every run recorded within ``[start, end)``, oldest first.
 
-    def export(self, engine: "RiskEngine", result: SimulationResult) -> ExportResponse:
-        """Persist the provided result to a timestamped CSV file."""
-        dataframe = engine.results_to_dataframe(result)
+        The range is pinned when this is called, so runs recorded while the
+        iterator is consumed never join it. Runs older than the hot tier are
+        read from the backend; hot-tier runs are copied out of the ring
+        ``STREAM_CHUNK_RUNS`` at a time, the first chunk before returning, so
+        memory stays bounded however many runs are streamed. A chunk
+        overwritten before it is copied is re-read from the backend, and
+        ``HistoryOverwritten`` is raised if the backend does not have it.
+        """
+        while True:
+            view = self._history.view()
+            try:
+                window = view.between(start, end)
+                timestamps = window.timestamps()
+                first_chunk = window[:STREAM_CHUNK_RUNS].detach()
+                hot_start = from_datetime64(view[:1].timestamps()[0]) if len(view) else None
+            except HistoryOverwritten:
+                continue
+            break
+        if hot_start is None and self._last_stamp is not None:
+            hot_start = self._last_stamp + _MICROSECOND
+        cold_end = hot_start if end is None or hot_start is None else min(as_utc(end), hot_start)
+        return self._stream(start, cold_end, window, timestamps, first_chunk)
 
+    def _stream(
+        self,
+        start: Optional[datetime],
+        cold_end: Optional[datetime],
+        window: HistoryView,
+        timestamps: np.ndarray,
+        first_chunk: Tuple[ColumnarResult, ...],
+    ) -> Iterator[ColumnarResult]:
+        """Body of ``iter_runs``: backend runs before ``cold_end``, then ``window``."""
+        if cold_end is not None and (start is None or as_utc(start) < cold_end):
+            self.flush()
+            yield from self._backend.iter_runs(start, cold_end)
+        yield from first_chunk
+        for offset in range(len(first_chunk), len(window), STREAM_CHUNK_RUNS):
+            try:
+                chunk = window[offset : offset + STREAM_CHUNK_RUNS].detach()
+            except HistoryOverwritten:
+                yield from self._reread(timestamps[offset:])
+                return
+            yield from chunk
+
+    def _reread(self, timestamps: np.ndarray) -> Iterator[ColumnarResult]:
+        """Yield the overwritten hot-tier runs stamped ``timestamps`` from the backend."""
+        self.flush()
+        found = 0
+        for run in self._backend.iter_runs(
+            from_datetime64(timestamps[0]), from_datetime64(timestamps[-1]) + _MICROSECOND
+        ):
+            found += 1
+            yield run
+        if found < len(timestamps):
+            raise HistoryOverwritten(
+                f"{len(timestamps) - found} streamed runs were overwritten in the hot tier"
+                " and are not in the history backend"
+            )
+
+    def latest_context(self) -> tuple[ColumnarResult, ...]:
+        """Detached copy of the newest history entry, the only one the engine reads.
+
+        Use this when handing history to work that may run after further
+        records have overwritten the ring slot.
+        """
+        return self._history.view()[-1:].detach()
+
+    def export(
+        self,
+        engine: "RiskEngine",
+        result: ResultLike,
+        export_format: ExportFormat = ExportFormat.CSV,
+    ) -> ExportResponse:
+        """Persist the provided result to a timestamped file in ``export_format``."""
         timestamp = result.summary.timestamp_utc.strftime("%Y%m%dT%H%M%SZ")
-        filename = f"risk_estimator_{timestamp}.csv"
+        filename = f"risk_estimator_{timestamp}{FILE_EXTENSIONS[export_format]}"
         export_path = self._settings.export_directory / filename
         export_path.parent.mkdir(parents=True, exist_ok=True)
 
-        dataframe.to_csv(export_path, index=False)
+        if export_format == ExportFormat.CSV:
+            dataframe = engine.results_to_dataframe(result)
+            dataframe.to_csv(export_path, index=False)
+            record_count = len(dataframe)
+        else:
+            run = as_columnar(result)
+            with export_path.open("wb") as handle:
+                for chunk in iter_export((run,), export_format):
+                    handle.write(chunk)
+            record_count = len(run.service_names)
 
         return ExportResponse(
             export_path=str(export_path.resolve()),
-            record_count=len(dataframe),
+            record_count=record_count,
             generated_at_utc=datetime.now(timezone.utc),
         )
-
-
@@ -0,0 +1,48 @@
+"""UTC timestamp conversions shared by the history tiers and exporters.
+
+Naive datetimes are always taken to be UTC already, never local time, so the
+ring buffer, the series index, the Parquet log and the exporters agree on
+which instant (and which UTC day) a run belongs to.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def as_utc(moment: datetime) -> datetime:
+    """Aware UTC form of ``moment``."""
+    if moment.tzinfo is None:
+        return moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(timezone.utc)
+
+
+def naive_utc(moment: datetime) -> datetime:
+    """Naive UTC form of ``moment``."""
+    return as_utc(moment).replace(tzinfo=None)
+
+
+def epoch_micros(moment: datetime) -> int:
+    """Exact microseconds since the Unix epoch, computed without floats."""
+    return (as_utc(moment) - EPOCH) // _MICROSECOND
+
+
+def as_datetime64(moment: datetime) -> np.datetime64:
+    """``moment`` as a naive UTC ``datetime64[us]``."""
+    return np.datetime64(epoch_micros(moment), "us")
+
+
+def from_datetime64(moment: np.datetime64) -> datetime:
+    """Aware UTC ``datetime`` of a naive UTC ``datetime64``."""
+    return EPOCH + timedelta(microseconds=int(moment.astype("datetime64[us]").astype(np.int64)))
+
+
+def utc_day(moment: datetime) -> str:
+    """ISO date of ``moment`` in UTC."""
+    return as_utc(moment).date().isoformat()
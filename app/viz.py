@@ -1,92 +1,253 @@
-"""Visualisation helpers for the risk estimator service."""
+"""Visualisation helpers for the risk estimator service.
+
+Renderers build a private ``Figure`` on its own Agg canvas and never touch
+``pyplot``'s global state, so they are safe to run concurrently in threads
+or processes.
+"""
 
 from __future__ import annotations
 
-from pathlib import Path
-from typing import Iterable, Sequence
+import hashlib
+import io
+from typing import Callable, Dict, Iterable, Optional
 
-import matplotlib.pyplot as plt
+import matplotlib
 import networkx as nx
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.cm import ScalarMappable
+from matplotlib.collections import LineCollection
+from matplotlib.colors import Normalize
+from matplotlib.figure import Figure
+
+from .clustering import cluster_services
+from .columnar import ColumnarResult, ResultLike, as_columnar
+from .layout import Layout, barnes_hut_layout
+from .models import ClusterRisk, RenderKind
+
+# Resolution used when a request does not ask for one.
+DEFAULT_DPI = 220
+
+# Above these sizes the renderers switch to their aggregated views.
+DEFAULT_MAX_GRAPH_NODES = 200
+DEFAULT_MAX_CLUSTERS = 150
+DEFAULT_MAX_BARS = 40
+
+_LABELLED_CLUSTERS = 12
+
+_RISK_CMAP = matplotlib.colormaps["RdYlGn_r"]
 
-from .models import ServiceMetrics, SimulationResult
 
+def render_dependency_graph(
+    result: ResultLike,
+    dpi: int = DEFAULT_DPI,
+    layout: Optional[Layout] = None,
+    *,
+    max_nodes: int = DEFAULT_MAX_GRAPH_NODES,
+    max_clusters: int = DEFAULT_MAX_CLUSTERS,
+    cluster_risk: ClusterRisk = ClusterRisk.MAX,
+) -> bytes:
+    """Render a dependency graph highlighting service risk scores as PNG bytes.
 
-def render_dependency_graph(result: SimulationResult, output_path: Path) -> Path:
-    """Render a dependency graph highlighting service risk scores."""
-    _ensure_parent_directory(output_path)
+    Node positions come from ``layout`` when given, typically a cached one
+    from ``LayoutEngine``; otherwise a spring layout is computed here. Graphs
+    with more than ``max_nodes`` services are drawn as clusters instead.
+    """
+    run = as_columnar(result)
+    if len(run.service_names) > max_nodes:
+        return _render_clustered_graph(run, dpi, max_clusters, cluster_risk)
 
     graph = nx.DiGraph()
-    for service in result.services:
-        graph.add_node(service.service_name, risk=service.risk_score)
-    for edge in result.edges:
-        graph.add_edge(edge.source, edge.target)
+    risk_values = run.table.risk_scores.tolist()
+    for name, risk in zip(run.service_names, risk_values):
+        graph.add_node(name, risk=risk)
+    graph.add_edges_from(run.edge_names())
 
-    risk_values = [metrics.risk_score for metrics in result.services]
     if not risk_values:
         raise ValueError("Cannot render graph without service metrics.")
 
     normalised_colors = _get_colour_gradient(risk_values)
-    pos = nx.spring_layout(graph, seed=42, k=0.7)
-
-    plt.figure(figsize=(10, 8))
-    nx.draw_networkx_edges(graph, pos, edge_color="#cccccc", arrows=True, arrowstyle="-|>", arrowsize=12)
-    nx.draw_networkx_nodes(
-        graph,
-        pos,
-        node_color=normalised_colors,
-        node_size=1200,
-        cmap=plt.cm.get_cmap("RdYlGn_r"),
+    pos = layout.position_map() if layout is not None else nx.spring_layout(graph, seed=42, k=0.7)
+
+    figure = Figure(figsize=(10, 8))
+    ax = figure.add_subplot()
+    nx.draw_networkx_edges(
+        graph, pos, ax=ax, edge_color="#cccccc", arrows=True, arrowstyle="-|>", arrowsize=12
     )
-    nx.draw_networkx_labels(graph, pos, font_size=9, font_weight="bold")
+    nx.draw_networkx_nodes(graph, pos, ax=ax, node_color=normalised_colors, node_size=1200, cmap=_RISK_CMAP)
+    nx.draw_networkx_labels(graph, pos, ax=ax, font_size=9, font_weight="bold")
 
-    sm = plt.cm.ScalarMappable(cmap=plt.cm.get_cmap("RdYlGn_r"))
-    sm.set_array([])
-    cbar = plt.colorbar(sm, shrink=0.75)
+    scale = ScalarMappable(Normalize(min(risk_values), max(risk_values)), cmap=_RISK_CMAP)
+    cbar = figure.colorbar(scale, ax=ax, shrink=0.75)
     cbar.ax.set_ylabel("Risk Score", rotation=270, labelpad=15)
 
-    plt.title("Microservice Dependency Risk Map")
-    plt.tight_layout()
-    plt.savefig(output_path, format="png", dpi=220)
-    plt.close()
+    ax.set_title("Microservice Dependency Risk Map")
+    figure.tight_layout()
+    return _to_png(figure, dpi)
+
+
+def render_risk_barchart(
+    result: ResultLike, dpi: int = DEFAULT_DPI, *, max_bars: int = DEFAULT_MAX_BARS
+) -> bytes:
+    """Render a bar chart comparing risk scores across services as PNG bytes.
+
+    With more than ``max_bars`` services only the riskiest ``max_bars`` get a
+    bar, next to a histogram of every service's risk.
+    """
+    run = as_columnar(result)
+    if len(run.service_names) > max_bars:
+        return _render_top_k_barchart(run, dpi, max_bars)
+
+    order = _sort_by_risk(run.table.risk_scores)
+    names = [run.service_names[index] for index in order.tolist()]
+    risks = run.table.risk_scores[order].tolist()
+    colours = _RISK_CMAP(_get_colour_gradient(risks))
+
+    figure = Figure(figsize=(12, 6))
+    ax = figure.add_subplot()
+    bars = ax.bar(names, risks, color=colours)
+    ax.tick_params(axis="x", labelrotation=45)
+    for label in ax.get_xticklabels():
+        label.set_horizontalalignment("right")
+    ax.set_ylabel("Risk Score")
+    ax.set_ylim(0, 100)
+    ax.set_title("Service Risk Comparison")
+    ax.bar_label(bars, labels=[f"{risk:.1f}" for risk in risks], padding=2, fontsize=8)
+
+    figure.tight_layout()
+    return _to_png(figure, dpi)
+
+
+def _render_clustered_graph(
+    run: ColumnarResult, dpi: int, max_clusters: int, cluster_risk: ClusterRisk
+) -> bytes:
+    """Draw services collapsed into clusters, sized by membership and coloured by risk.
+
+    Edges between clusters are drawn as one ``LineCollection`` whose widths
+    grow with the number of underlying dependencies.
+    """
+    risk_scores = run.table.risk_scores
+    clusters = cluster_services(len(risk_scores), run.edge_sources, run.edge_targets, max_clusters)
+    risk = clusters.risk(risk_scores, cluster_risk)
+    positions = barnes_hut_layout(len(clusters), clusters.edge_sources, clusters.edge_targets)
+
+    figure = Figure(figsize=(10, 8))
+    ax = figure.add_subplot()
+    segments = np.stack([positions[clusters.edge_sources], positions[clusters.edge_targets]], axis=1)
+    ax.add_collection(
+        LineCollection(
+            segments,
+            linewidths=0.4 + 0.6 * np.log1p(clusters.edge_weights),
+            colors="#bbbbbb",
+            alpha=0.6,
+            zorder=1,
+        )
+    )
+    points = ax.scatter(
+        positions[:, 0],
+        positions[:, 1],
+        s=30 + 1200 * np.sqrt(clusters.sizes / clusters.sizes.max()),
+        c=risk,
+        cmap=_RISK_CMAP,
+        edgecolors="white",
+        linewidths=0.5,
+        zorder=2,
+    )
+
+    # Name the riskiest clusters after their riskiest member.
+    by_risk = np.lexsort((-risk_scores, clusters.labels))
+    leaders = by_risk[np.r_[True, np.diff(clusters.labels[by_risk]) != 0]]
+    for cluster in np.argsort(-risk, kind="stable")[:_LABELLED_CLUSTERS].tolist():
+        extra = int(clusters.sizes[cluster]) - 1
+        name = run.service_names[int(leaders[cluster])]
+        ax.annotate(
+            f"{name} +{extra}" if extra else name,
+            positions[cluster],
+            fontsize=7,
+            fontweight="bold",
+            ha="center",
+            va="center",
+            zorder=3,
+        )
+    ax.set_xticks([])
+    ax.set_yticks([])
+    ax.margins(0.05)
+
+    cbar = figure.colorbar(points, ax=ax, shrink=0.75)
+    cbar.ax.set_ylabel(f"{cluster_risk.value.title()} Risk Score", rotation=270, labelpad=15)
+    ax.set_title(
+        f"Microservice Dependency Risk Map ({len(risk_scores)} services in {len(clusters)} clusters)"
+    )
+    figure.tight_layout()
+    return _to_png(figure, dpi)
+
+
+def _render_top_k_barchart(run: ColumnarResult, dpi: int, top_k: int) -> bytes:
+    """Bars for the ``top_k`` riskiest services beside a histogram of all risk scores."""
+    risk_scores = run.table.risk_scores
+    order = _sort_by_risk(risk_scores)[:top_k]
+    names = [run.service_names[index] for index in order.tolist()]
+    risks = risk_scores[order].tolist()
 
-    return output_path
+    figure = Figure(figsize=(14, 6))
+    bar_ax, histogram_ax = figure.subplots(1, 2, gridspec_kw={"width_ratios": [3, 2]})
+    bar_ax.bar(names, risks, color=_RISK_CMAP(np.asarray(risks) / 100))
+    bar_ax.tick_params(axis="x", labelrotation=60, labelsize=7)
+    for label in bar_ax.get_xticklabels():
+        label.set_horizontalalignment("right")
+    bar_ax.set_ylabel("Risk Score")
+    bar_ax.set_ylim(0, 100)
+    bar_ax.set_title(f"Top {len(names)} of {len(risk_scores)} Services by Risk")
 
+    edges = np.linspace(0, 100, 21)
+    counts, _ = np.histogram(risk_scores, bins=edges)
+    centres = (edges[:-1] + edges[1:]) / 2
+    histogram_ax.bar(centres, counts, width=np.diff(edges), color=_RISK_CMAP(centres / 100), edgecolor="white")
+    histogram_ax.set_xlim(0, 100)
+    histogram_ax.set_xlabel("Risk Score")
+    histogram_ax.set_ylabel("Services")
+    histogram_ax.set_title("Risk Distribution")
 
-def render_risk_barchart(result: SimulationResult, output_path: Path) -> Path:
-    """Render a bar chart comparing risk scores across services."""
-    _ensure_parent_directory(output_path)
+    figure.tight_layout()
+    return _to_png(figure, dpi)
 
-    services = _sort_services_by_risk(result.services)
-    names = [service.service_name for service in services]
-    risks = [service.risk_score for service in services]
-    colours = _get_colour_gradient(risks)
 
-    plt.figure(figsize=(12, 6))
-    bars = plt.bar(names, risks, color=colours)
-    plt.xticks(rotation=45, ha="right")
-    plt.ylabel("Risk Score")
-    plt.ylim(0, 100)
-    plt.title("Service Risk Comparison")
+RENDERERS: Dict[RenderKind, Callable[..., bytes]] = {
+    RenderKind.GRAPH: render_dependency_graph,
+    RenderKind.BARCHART: render_risk_barchart,
+}
 
-    for bar, risk in zip(bars, risks, strict=False):
-        height = bar.get_height()
-        plt.text(bar.get_x() + bar.get_width() / 2, height + 1, f"{risk:.1f}", ha="center", va="bottom", fontsize=8)
 
-    plt.tight_layout()
-    plt.savefig(output_path, format="png", dpi=220)
-    plt.close()
+def render_etag(
+    kind: RenderKind,
+    result: ResultLike,
+    dpi: int = DEFAULT_DPI,
+    layout: Optional[Layout] = None,
+    **options: object,
+) -> str:
+    """Strong ETag of a render, derived from its inputs rather than its bytes.
 
-    return output_path
+    Rendering is deterministic, so equal inputs always give identical PNGs and
+    a matching ``If-None-Match`` can be answered without rendering.
+    ``options`` are the keyword arguments passed to the renderer.
+    """
+    layout_digest = layout.digest if layout is not None else ""
+    settings = ",".join(f"{name}={value}" for name, value in sorted(options.items()))
+    key = f"{kind.value}:{dpi}:{layout_digest}:{settings}:{as_columnar(result).fingerprint()}"
+    return '"' + hashlib.sha256(key.encode()).hexdigest()[:32] + '"'
 
 
-def _ensure_parent_directory(path: Path) -> None:
-    """Create the parent directory for the output file if necessary."""
-    path.parent.mkdir(parents=True, exist_ok=True)
+def _to_png(figure: Figure, dpi: int) -> bytes:
+    """Encode ``figure`` as PNG through its own Agg canvas."""
+    buffer = io.BytesIO()
+    FigureCanvasAgg(figure)
+    figure.savefig(buffer, format="png", dpi=dpi)
+    return buffer.getvalue()
 
 
-def _sort_services_by_risk(services: Sequence[ServiceMetrics]) -> list[ServiceMetrics]:
-    """Return services ordered by risk score descending."""
-    return sorted(services, key=lambda svc: svc.risk_score, reverse=True)
+def _sort_by_risk(risk_scores: np.ndarray) -> np.ndarray:
+    """Return indices ordering services by risk score descending, ties stable."""
+    return np.argsort(-risk_scores, kind="stable")
 
 
 def _get_colour_gradient(values: Iterable[float]) -> list[float]:
@@ -0,0 +1,213 @@
+"""API-level tests for the FastAPI application."""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import io
+import json
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import Settings
+from app.history_log import ParquetHistoryLog
+from app.incremental import IncrementalDependencyMetrics
+from app.main import (
+    app,
+    compute_executor,
+    export_stream,
+    get_storage,
+    risk_engine,
+    settings,
+    simulation_storage,
+)
+from app.models import ExportFormat, ExportScope
+from app.storage import SimulationStorage
+
+
+def test_cicd_batch_runs_one_simulation_for_the_release() -> None:
+    """A batch should record one history entry and return decisions in order."""
+    client = TestClient(app)
+    simulation_storage.clear()
+    services = list(settings.service_names)
+
+    response = client.post(
+        "/cicd-hook/batch",
+        json=[{"pipeline_id": f"release-{name}", "service_name": name} for name in services],
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert len(simulation_storage.snapshot()) == 1
+    latest = simulation_storage.latest_run
+    expected = [latest.service_metric(name) for name in services]
+    assert [item["risk_score"] for item in body["results"]] == [m.risk_score for m in expected]
+    assert body["go"] == (not body["blocked_services"])
+    assert client.post("/cicd-hook/batch", json=[]).status_code == 422
+
+
+def test_export_stream_matches_dataframe_csv_and_gzips_history() -> None:
+    """Streamed CSV should equal the pandas export, and history gzip should decompress."""
+    client = TestClient(app)
+    simulation_storage.clear()
+    for seed in range(3):
+        client.post("/simulate", params={"seed": seed})
+
+    latest = client.get("/export/stream")
+    assert latest.status_code == 200
+    expected = risk_engine.results_to_dataframe(simulation_storage.latest_run).to_csv(index=False)
+    assert latest.text == expected
+
+    history = client.get("/export/stream", params={"scope": "history", "gzip": True})
+    assert history.headers["content-type"] == "application/gzip"
+    rows = gzip.decompress(history.content).decode().splitlines()
+    assert len(rows) == 1 + 3 * len(settings.service_names)
+
+
+def test_history_export_is_unaffected_by_runs_recorded_while_streaming() -> None:
+    """Runs recorded mid-download must not replace or join the exported ones."""
+    simulation_storage.clear()
+    runs = [risk_engine.run_simulation_columnar(seed=seed) for seed in range(3)]
+    for run in runs:
+        simulation_storage.record_run(run)
+    response = export_stream(
+        request=None,
+        storage=simulation_storage,
+        scope=ExportScope.HISTORY,
+        export_format=ExportFormat.CSV,
+        start=None,
+        end=None,
+        gzip=False,
+    )
+
+    async def download() -> bytes:
+        chunks = []
+        async for chunk in response.body_iterator:
+            if not chunks:
+                for seed in range(10, 10 + settings.history_limit):
+                    simulation_storage.record_run(risk_engine.run_simulation_columnar(seed=seed))
+            chunks.append(chunk)
+        return b"".join(chunks)
+
+    rows = asyncio.run(download()).decode().splitlines()[1:]
+    expected = [score for run in runs for score in run.table.risk_scores.tolist()]
+    assert [float(row.split(",")[-3]) for row in rows] == expected
+
+
+def test_export_stream_binary_formats_keep_types() -> None:
+    """Parquet and Arrow exports should round-trip with dictionary columns and timestamps."""
+    client = TestClient(app)
+    simulation_storage.clear()
+    for seed in range(3):
+        client.post("/simulate", params={"seed": seed})
+    runs = list(simulation_storage.snapshot())
+    rows = len(settings.service_names)
+
+    parquet = client.get("/export/stream", params={"scope": "history", "format": "parquet"})
+    table = pq.read_table(io.BytesIO(parquet.content))
+    assert table.num_rows == 3 * rows
+    assert pa.types.is_dictionary(table.schema.field("service_name").type)
+    assert pa.types.is_dictionary(table.schema.field("decision").type)
+    assert table.column("risk_score").to_pylist() == [
+        score for run in runs for score in run.table.risk_scores.tolist()
+    ]
+
+    arrow = client.get(
+        "/export/stream",
+        params={"scope": "history", "start": runs[1].summary.timestamp_utc.isoformat()},
+        headers={"Accept": "application/vnd.apache.arrow.file"},
+    )
+    recent = pa.ipc.open_file(pa.BufferReader(arrow.content)).read_all()
+    assert recent.num_rows == 2 * rows
+    assert recent.column("timestamp_utc").type == pa.timestamp("us", tz="UTC")
+
+    ndjson = client.get("/export/stream", params={"format": "ndjson"})
+    records = [json.loads(line) for line in ndjson.text.splitlines()]
+    assert [record["decision"] for record in records] == [
+        decision.value for decision in runs[-1].table.decisions()
+    ]
+
+
+def test_images_are_cached_and_revalidated_with_etags() -> None:
+    """Repeat polls reuse the cached PNG and a matching ETag yields 304."""
+    client = TestClient(app)
+    simulation_storage.clear()
+    client.post("/simulate", params={"seed": 5})
+
+    first = client.get("/barchart.png", params={"dpi": 50})
+    assert first.status_code == 200 and first.content.startswith(b"\x89PNG")
+    etag = first.headers["etag"]
+
+    again = client.get("/barchart.png", params={"dpi": 50})
+    assert again.content == first.content and again.headers["etag"] == etag
+    assert client.get("/barchart.png", params={"dpi": 50}, headers={"If-None-Match": etag}).status_code == 304
+    assert client.get("/barchart.png", params={"dpi": 60}).headers["etag"] != etag
+
+    client.post("/simulate", params={"seed": 6})
+    changed = client.get("/barchart.png", params={"dpi": 50}, headers={"If-None-Match": etag})
+    assert changed.status_code == 200 and changed.headers["etag"] != etag
+    assert client.get("/graph.png", params={"dpi": 50}).status_code == 200
+
+
+def test_topology_updates_run_on_the_compute_executor() -> None:
+    """PUT and PATCH /topology should be admitted and counted by the compute executor."""
+    client = TestClient(app)
+    services = list(settings.service_names)
+    submitted = compute_executor.stats().submitted
+
+    loaded = client.put(
+        "/topology",
+        json={"services": services, "edges": [{"source": services[0], "target": services[1]}]},
+    )
+    patched = client.patch("/topology", json={"added": [{"source": services[1], "target": services[2]}]})
+    rejected = client.patch("/topology", json={"added": [{"source": services[0], "target": "unknown"}]})
+    client.delete("/topology")
+
+    assert (loaded.status_code, patched.status_code, rejected.status_code) == (200, 200, 422)
+    assert patched.json()["edge_count"] == 2
+    assert compute_executor.stats().submitted == submitted + 3
+
+
+def test_diverging_topology_patch_is_rejected_and_rolled_back(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A verification failure should answer 409 and leave the live topology as it was."""
+    client = TestClient(app)
+    services = list(settings.service_names)
+    edge = {"source": services[0], "target": services[1]}
+    loaded = client.put("/topology", json={"services": services, "edges": [edge], "verify": True})
+    assert loaded.status_code == 200
+    topology = risk_engine.live_topology
+    before = topology.snapshot()
+    monkeypatch.setattr(IncrementalDependencyMetrics, "_verification_error", lambda self: 1.0)
+
+    response = client.patch("/topology", json={"added": [{"source": services[1], "target": services[2]}]})
+    client.delete("/topology")
+
+    assert response.status_code == 409
+    assert "diverged" in response.json()["detail"]
+    assert topology.snapshot().edges == before.edges
+
+
+def test_service_history_before_the_hot_tier_is_read_from_the_parquet_log(tmp_path) -> None:
+    """Ranges starting before the in-memory window should be answered by the Parquet log."""
+    storage = SimulationStorage(Settings(history_limit=2), backend=ParquetHistoryLog(tmp_path, flush_runs=2))
+    runs = [storage.record_run(risk_engine.run_simulation_columnar(seed=seed)) for seed in range(5)]
+    name = runs[0].service_names[0]
+    stamps = [run.summary.timestamp_utc.isoformat() for run in runs]
+    app.dependency_overrides[get_storage] = lambda: storage
+    client = TestClient(app)
+    try:
+        full = client.get(f"/services/{name}/history").json()
+        older = client.get(f"/services/{name}/history", params={"start": stamps[1], "end": stamps[3]}).json()
+        hot = client.get(f"/services/{name}/history", params={"start": stamps[3]}).json()
+    finally:
+        del app.dependency_overrides[get_storage]
+        storage.close()
+
+    scores = [run.service_metric(name).risk_score for run in runs]
+    assert full["total_points"] == 5 and [point["risk_score"] for point in full["points"]] == scores
+    assert [point["timestamp_utc"] for point in older["points"]] == stamps[1:3]
+    assert [point["risk_score"] for point in hot["points"]] == scores[3:]
+    assert full["points"][0]["decision"] == runs[0].service_metric(name).decision.value
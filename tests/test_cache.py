@@ -0,0 +1,62 @@
+"""Tests for the bounded in-memory caches."""
+
+from __future__ import annotations
+
+from app.cache import LRUCache
+from app.risk_engine import RiskEngine
+
+
+def test_lru_cache_evicts_least_recently_used_entry() -> None:
+    """The byte bound should evict the coldest entry and count it."""
+    cache: LRUCache[str] = LRUCache("test", max_entries=10, max_bytes=20)
+    cache.put("a", "alpha", 10)
+    cache.put("b", "beta", 10)
+    assert cache.get("a") == "alpha"
+
+    cache.put("c", "gamma", 10)
+
+    assert cache.get("b") is None
+    stats = cache.stats()
+    assert (stats.entries, stats.size_bytes, stats.evictions) == (2, 20, 1)
+    assert (stats.hits, stats.misses) == (1, 1)
+
+
+def test_repeated_topology_reuses_centrality() -> None:
+    """A seeded rerun yields the same topology and hits the centrality cache."""
+    engine = RiskEngine()
+    first = engine.run_simulation(seed=42)
+    second = engine.run_simulation(seed=42)
+
+    stats = engine.cache_stats()[0]
+    assert stats.hits == 1 and stats.misses == 1
+    assert [m.dependency_impact_score for m in first.services] == [
+        m.dependency_impact_score for m in second.services
+    ]
+
+
+def test_lru_cache_expires_entries_after_ttl() -> None:
+    """Entries older than the TTL should be dropped and counted as misses."""
+    now = [0.0]
+    cache: LRUCache[str] = LRUCache("ttl", max_entries=4, max_bytes=100, ttl_seconds=5, clock=lambda: now[0])
+    cache.put("a", "alpha", 10)
+    now[0] = 4.0
+    assert cache.get("a") == "alpha"
+    now[0] = 5.0
+    assert cache.get("a") is None
+
+    stats = cache.stats()
+    assert (stats.entries, stats.size_bytes, stats.expirations, stats.misses) == (0, 0, 1, 1)
+
+
+def test_seeded_reruns_hit_result_cache() -> None:
+    """Seeded runs with the same blocked set should be served from the result cache."""
+    engine = RiskEngine()
+    first = engine.run_simulation_cached(seed=7)
+    second = engine.run_simulation_cached(seed=7)
+    engine.run_simulation_cached()
+
+    result_stats = engine.cache_stats()[1]
+    assert result_stats.name == "simulation_result"
+    assert (result_stats.hits, result_stats.misses, result_stats.entries) == (1, 1, 1)
+    assert second.to_model().dict(exclude={"summary"}) == first.to_model().dict(exclude={"summary"})
+    assert second.summary.timestamp_utc >= first.summary.timestamp_utc
@@ -0,0 +1,52 @@
+"""Tests for betweenness centrality strategy selection."""
+
+from __future__ import annotations
+
+import networkx as nx
+import numpy as np
+
+from app.centrality import (
+    CentralityOptions,
+    betweenness_error_bound,
+    compute_betweenness,
+    resolve_centrality,
+)
+from app.config import Settings
+from app.graph import DependencyGraph
+from app.models import CentralityStrategy
+from app.risk_engine import RiskEngine
+
+
+def test_auto_strategy_switches_to_sampling_for_large_graphs() -> None:
+    """Auto selection keeps small graphs exact and samples once over budget."""
+    settings = Settings(centrality_strategy=CentralityStrategy.AUTO)
+    small = resolve_centrality(10, 20, None, settings)
+    large = resolve_centrality(5000, 20000, CentralityOptions(latency_budget_ms=100), settings)
+
+    assert small.strategy == CentralityStrategy.EXACT
+    assert large.strategy == CentralityStrategy.SAMPLED
+    assert large.pivots is not None and large.pivots >= settings.centrality_min_pivots
+
+
+def test_sampled_betweenness_is_deterministic_and_within_bound() -> None:
+    """Pivot sampling is seeded by topology and stays within the reported bound."""
+    graph = DependencyGraph.from_networkx(nx.gnm_random_graph(200, 600, directed=True, seed=4))
+    plan = resolve_centrality(
+        200, 600, CentralityOptions(strategy=CentralityStrategy.SAMPLED, pivots=40), Settings()
+    )
+
+    exact = compute_betweenness(graph, resolve_centrality(200, 600, None, Settings()))
+    sampled = compute_betweenness(graph, plan)
+
+    assert np.array_equal(sampled, compute_betweenness(graph, plan))
+    assert np.abs(sampled - exact).max() <= betweenness_error_bound(200, 40, 0.95)
+
+
+def test_simulation_reports_centrality_precision() -> None:
+    """Simulation results record which centrality strategy was applied."""
+    result = RiskEngine().run_simulation(
+        seed=5, centrality=CentralityOptions(strategy=CentralityStrategy.SAMPLED, pivots=4)
+    )
+    assert result.centrality is not None
+    assert result.centrality.strategy == CentralityStrategy.SAMPLED
+    assert result.centrality.dependency_score_error_bound > 0
@@ -0,0 +1,35 @@
+"""Tests for single-flight request coalescing."""
+
+from __future__ import annotations
+
+import asyncio
+
+from app.coalesce import SingleFlight
+
+
+def test_concurrent_calls_share_one_flight() -> None:
+    """Overlapping callers should share one call; failures are not reused."""
+    flight: SingleFlight[int] = SingleFlight(window_seconds=60)
+    calls = []
+
+    async def work() -> int:
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return len(calls)
+
+    async def failing() -> int:
+        raise RuntimeError("boom")
+
+    async def scenario() -> None:
+        results = await asyncio.gather(*(flight.do("hook", work) for _ in range(20)))
+        assert results == [1] * 20
+        assert await flight.do("hook", work) == 1
+
+        errors = await asyncio.gather(
+            flight.do("other", failing), flight.do("other", failing), return_exceptions=True
+        )
+        assert all(isinstance(error, RuntimeError) for error in errors)
+        assert await flight.do("other", work) == 2
+
+    asyncio.run(scenario())
+    assert (flight.leaders, flight.followers) == (3, 21)
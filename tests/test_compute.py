@@ -0,0 +1,52 @@
+"""Tests for the bounded compute executor."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+
+import pytest
+
+from app.compute import ComputeExecutor, ComputeQueueFull
+from app.config import Settings
+from app.models import ComputeMode
+from app.parallel import simulate_in_worker
+from app.risk_engine import RiskEngine
+
+
+def test_compute_executor_rejects_work_beyond_queue_capacity() -> None:
+    """Tasks past ``max_workers + max_queue`` should be rejected and counted."""
+    executor = ComputeExecutor(ComputeMode.THREAD, max_workers=1, max_queue=1)
+    release = threading.Event()
+
+    async def scenario() -> None:
+        blocked = [asyncio.ensure_future(executor.run(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        stats = executor.stats()
+        assert (stats.running, stats.queued) == (1, 1)
+        with pytest.raises(ComputeQueueFull):
+            await executor.run(release.wait)
+        release.set()
+        await asyncio.gather(*blocked)
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        executor.shutdown()
+
+    stats = executor.stats()
+    assert (stats.submitted, stats.completed, stats.rejected, stats.queued) == (2, 2, 1, 0)
+    assert stats.peak_queued == 1
+
+
+def test_process_mode_offload_matches_in_process_simulation() -> None:
+    """Simulations offloaded to worker processes should equal in-process runs."""
+    settings = Settings()
+    executor = ComputeExecutor(ComputeMode.PROCESS, max_workers=1, max_queue=0)
+    try:
+        remote = executor.offload(simulate_in_worker, settings, [], 17, None, None)
+    finally:
+        executor.shutdown()
+
+    local = RiskEngine(settings).run_simulation_columnar(seed=17)
+    assert remote.to_model().dict(exclude={"summary"}) == local.to_model().dict(exclude={"summary"})
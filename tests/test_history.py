@@ -0,0 +1,152 @@
+"""Tests for persistent history backends."""
+
+from __future__ import annotations
+
+import dataclasses
+import sqlite3
+import threading
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from app import storage as storage_module
+from app.config import Settings
+from app.history import MemoryHistoryBackend, SQLiteHistoryBackend
+from app.history_log import ParquetHistoryLog
+from app.ring_buffer import HistoryOverwritten
+from app.risk_engine import RiskEngine
+from app.storage import SimulationStorage
+
+
+def test_sqlite_history_survives_restart(tmp_path) -> None:
+    """Runs written to SQLite should reload into the hot tier and beyond it."""
+    database = tmp_path / "history.sqlite3"
+    settings = Settings(history_limit=2)
+    engine = RiskEngine(settings)
+    storage = SimulationStorage(settings, backend=SQLiteHistoryBackend(database))
+    for seed in range(4):
+        storage.record_run(engine.run_simulation_columnar(storage.snapshot(), seed=seed))
+    expected = storage.latest_result
+    storage.close()
+
+    reopened = SimulationStorage(settings, backend=SQLiteHistoryBackend(database))
+    assert len(reopened.snapshot()) == 2
+    assert reopened.latest_result == expected
+    assert len(reopened.recent_runs(10)) == 4
+    reopened.close()
+
+    connection = sqlite3.connect(database)
+    assert connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert connection.execute("SELECT COUNT(*) FROM service_metrics").fetchone()[0] == 4 * len(
+        expected.services
+    )
+    connection.close()
+
+
+def test_parquet_log_prunes_days_and_reads_buffered_runs(tmp_path) -> None:
+    """Scans should skip out-of-range days and include runs not yet flushed."""
+    log = ParquetHistoryLog(tmp_path, flush_runs=2)
+    engine = RiskEngine()
+    now = datetime.now(timezone.utc)
+    for seed, age in enumerate([40, 40, 3, 2, 0]):
+        run = engine.run_simulation_columnar(seed=seed)
+        summary = run.summary.copy(update={"timestamp_utc": now - timedelta(days=age)})
+        log.append(dataclasses.replace(run, summary=summary))
+
+    timestamps, values = log.metric_series("payment-service", "risk_score", start=now - timedelta(days=30))
+    assert len(values) == 3
+    assert np.all(np.diff(timestamps.astype(np.int64)) > 0)
+    assert sorted(path.parent.name for path in (tmp_path / "metrics").rglob("*.parquet"))[0] == (
+        f"date={(now - timedelta(days=40)).date().isoformat()}"
+    )
+
+    streamed = log.iter_runs(start=now - timedelta(days=30), end=now)
+    assert [run.summary.timestamp_utc for run in streamed] == [now - timedelta(days=age) for age in [3, 2]]
+
+    recent = log.recent(4)
+    assert [run.summary.timestamp_utc for run in recent] == [
+        now - timedelta(days=age) for age in [40, 3, 2, 0]
+    ]
+    log.close()
+    assert ParquetHistoryLog(tmp_path).recent(1)[0].edge_names() == recent[-1].edge_names()
+
+
+def test_parquet_log_keeps_exact_microseconds_and_utc_days(tmp_path) -> None:
+    """Timestamps must round-trip exactly and naive ones must be stored as UTC."""
+    log = ParquetHistoryLog(tmp_path)
+    run = RiskEngine().run_simulation_columnar(seed=1)
+    moments = [
+        datetime(2107, 12, 26, 19, 0, 0, 945989, tzinfo=timezone.utc),
+        datetime(2107, 12, 27, 23, 59, 59, 999999),
+    ]
+    for moment in moments:
+        log.append(dataclasses.replace(run, summary=run.summary.copy(update={"timestamp_utc": moment})))
+    log.close()
+
+    stored = [entry.summary.timestamp_utc for entry in ParquetHistoryLog(tmp_path).recent(2)]
+    assert stored == [moments[0], moments[1].replace(tzinfo=timezone.utc)]
+    assert sorted(path.name for path in (tmp_path / "runs").glob("date=*")) == [
+        "date=2107-12-26",
+        "date=2107-12-27",
+    ]
+
+
+def test_recording_does_not_wait_for_the_backend() -> None:
+    """A slow backend append must not delay the hot tier or the caller."""
+    release = threading.Event()
+    persisted = []
+
+    class SlowBackend(MemoryHistoryBackend):
+        def append(self, run) -> None:
+            release.wait(5)
+            persisted.append(run)
+
+    storage = SimulationStorage(Settings(history_limit=2), backend=SlowBackend())
+    run = RiskEngine().run_simulation_columnar(seed=1)
+    stored = storage.record_run(run)
+
+    assert storage.snapshot()[-1].summary == stored.summary and not persisted
+    release.set()
+    storage.flush()
+    assert persisted == [stored]
+    storage.close()
+
+
+def test_history_stream_reads_older_and_overwritten_runs_from_the_backend(
+    tmp_path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Runs before the hot tier, or overwritten mid-stream, should be read from SQLite."""
+    monkeypatch.setattr(storage_module, "STREAM_CHUNK_RUNS", 2)
+    settings = Settings(history_limit=4)
+    engine = RiskEngine(settings)
+    storage = SimulationStorage(settings, backend=SQLiteHistoryBackend(tmp_path / "history.sqlite3"))
+    runs = [storage.record_run(engine.run_simulation_columnar(seed=seed)) for seed in range(8)]
+
+    stream = storage.iter_runs(start=runs[1].summary.timestamp_utc)
+    for seed in range(8, 12):
+        storage.record_run(engine.run_simulation_columnar(seed=seed))
+
+    streamed = list(stream)
+    assert [run.summary for run in streamed] == [run.summary for run in runs[1:]]
+    np.testing.assert_array_equal(streamed[-1].table.metrics, runs[-1].table.metrics)
+    storage.close()
+
+
+def test_history_stream_fails_cleanly_when_overwritten_runs_are_not_persisted(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Without a persistent backend an overwritten chunk must raise, not be skipped."""
+    monkeypatch.setattr(storage_module, "STREAM_CHUNK_RUNS", 2)
+    engine = RiskEngine()
+    storage = SimulationStorage(Settings(history_limit=4))
+    for seed in range(4):
+        storage.record_run(engine.run_simulation_columnar(seed=seed))
+
+    stream = storage.iter_runs()
+    for seed in range(4, 8):
+        storage.record_run(engine.run_simulation_columnar(seed=seed))
+
+    with pytest.raises(HistoryOverwritten):
+        list(stream)
+    storage.close()
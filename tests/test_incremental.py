@@ -0,0 +1,77 @@
+"""Tests for incrementally maintained dependency metrics."""
+
+from __future__ import annotations
+
+import random
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from app.incremental import IncrementalDependencyMetrics, TopologyVerificationError
+from app.risk_engine import RiskEngine
+
+
+def test_incremental_updates_match_full_recomputation() -> None:
+    """Random insert/delete sequences stay equal to nx.betweenness_centrality."""
+    rng = random.Random(3)
+    nodes = [f"svc-{index}" for index in range(30)]
+    edges = {tuple(rng.sample(nodes, 2)) for _ in range(40)}
+    topology = IncrementalDependencyMetrics(nodes, edges, verify=True)
+
+    for _ in range(60):
+        edge = tuple(rng.sample(nodes, 2))
+        if edge in edges:
+            topology.remove_edge(*edge)
+            edges.discard(edge)
+        else:
+            topology.add_edge(*edge)
+            edges.add(edge)
+
+    expected = nx.betweenness_centrality(topology.to_networkx(), normalized=True)
+    snapshot = topology.snapshot()
+    assert np.allclose(snapshot.betweenness, [expected[node] for node in snapshot.nodes])
+
+
+def test_failed_verification_leaves_the_topology_unchanged() -> None:
+    """A diverging update must roll back the graph and its betweenness."""
+    nodes = [f"svc-{index}" for index in range(6)]
+    chain = list(zip(nodes[:4], nodes[1:5]))
+    # A negative tolerance makes every verification fail.
+    topology = IncrementalDependencyMetrics(nodes, chain, verify=True, tolerance=-1.0)
+    before = topology.snapshot()
+
+    with pytest.raises(TopologyVerificationError):
+        topology.apply(added=[("svc-4", "svc-5")], removed=[("svc-0", "svc-1")])
+
+    after = topology.snapshot()
+    assert after.edges == before.edges
+    np.testing.assert_array_equal(after.betweenness, before.betweenness)
+
+
+def test_update_only_touches_sources_upstream_of_the_edge() -> None:
+    """Extending the tail of a chain only affects sources that reach it."""
+    nodes = [f"svc-{index}" for index in range(10)]
+    chain = list(zip(nodes[:8], nodes[1:9]))
+    topology = IncrementalDependencyMetrics(nodes, chain)
+
+    update = topology.add_edge("svc-8", "svc-9")
+
+    assert update.affected_sources == 9
+    assert topology.edge_count == 9
+
+
+def test_engine_simulates_against_attached_topology() -> None:
+    """An attached live topology replaces randomly generated graphs."""
+    engine = RiskEngine()
+    services = ["auth-service", "orders-service", "payment-service"]
+    engine.attach_topology(
+        IncrementalDependencyMetrics(services, [("auth-service", "orders-service")])
+    )
+
+    result = engine.run_simulation(seed=1)
+
+    assert [metric.service_name for metric in result.services] == sorted(services)
+    assert [(edge.source, edge.target) for edge in result.edges] == [
+        ("auth-service", "orders-service")
+    ]
@@ -0,0 +1,58 @@
+"""Tests for the asynchronous job queue."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.jobs import JobCancelled, JobControl, JobManager
+from app.models import JobKind, JobStatus
+from app.risk_engine import RiskEngine
+
+
+def test_job_manager_bounds_concurrency_and_cancels_queued_jobs() -> None:
+    """A second job should wait for a slot and be cancellable while queued."""
+    engine = RiskEngine()
+    release = asyncio.Event()
+
+    async def simulate(control: JobControl):
+        await release.wait()
+        return engine.run_simulation(seed=3)
+
+    async def scenario() -> None:
+        manager = JobManager(max_concurrency=1, max_jobs=5, ttl_seconds=60)
+        first = manager.submit(JobKind.SIMULATION, simulate)
+        second = manager.submit(JobKind.SIMULATION, simulate)
+        await asyncio.sleep(0)
+        assert manager.get(first.job_id).status == JobStatus.RUNNING
+        assert manager.get(second.job_id).status == JobStatus.QUEUED
+
+        assert manager.cancel(second.job_id).status == JobStatus.CANCELLED
+        release.set()
+        await asyncio.sleep(0.05)
+
+        finished = manager.get(first.job_id)
+        assert finished.status == JobStatus.SUCCEEDED and finished.progress == 1.0
+        assert finished.simulation is not None and finished.expires_at_utc is not None
+        assert manager.get(second.job_id).status == JobStatus.CANCELLED
+
+    asyncio.run(scenario())
+
+
+def test_ensemble_progress_reports_batches_and_honours_cancellation() -> None:
+    """The progress callback sees every batch and can abort the ensemble."""
+    engine = RiskEngine()
+    control = JobControl()
+    seen = []
+
+    def report(done: int, total: int) -> None:
+        seen.append(done)
+        control.report(done, total)
+        if done >= 512:
+            control.cancel()
+
+    with pytest.raises(JobCancelled):
+        engine.run_ensemble(1024, seed=1, progress=report)
+    assert seen == [256, 512, 768]
+    assert control.progress == 0.5
@@ -0,0 +1,45 @@
+"""Tests for cached and warm-started graph layouts."""
+
+from __future__ import annotations
+
+import dataclasses
+
+import numpy as np
+
+from app.layout import LayoutEngine, barnes_hut_layout
+from app.models import LayoutAlgorithm
+from app.risk_engine import RiskEngine
+
+
+def test_layouts_are_cached_per_topology_and_warm_started_on_small_edits() -> None:
+    """The same topology reuses its layout; dropping one edge starts from the old positions."""
+    engine = LayoutEngine(LayoutAlgorithm.SPRING, warm_start_iterations=5)
+    run = RiskEngine().run_simulation_columnar(seed=3)
+
+    first = engine.layout(run)
+    assert engine.layout(run) is first and not first.warm_started
+    assert engine.stats().hits == 1
+
+    edited = dataclasses.replace(run, edge_sources=run.edge_sources[1:], edge_targets=run.edge_targets[1:])
+    warm = engine.layout(edited)
+    assert warm.warm_started and warm.topology_hash != first.topology_hash
+    cold = LayoutEngine(LayoutAlgorithm.SPRING).layout(edited)
+    moved = np.linalg.norm(warm.positions - first.positions, axis=1).mean()
+    assert moved < np.linalg.norm(cold.positions - first.positions, axis=1).mean()
+
+
+def test_barnes_hut_layout_keeps_edges_short_on_large_graphs() -> None:
+    """The grid approximation should pull neighbours together and spread the rest."""
+    rng = np.random.default_rng(0)
+    n_nodes = 2000
+    sources = rng.integers(0, n_nodes, 2 * n_nodes)
+    targets = (sources + rng.integers(1, 4, 2 * n_nodes)) % n_nodes
+
+    positions = barnes_hut_layout(n_nodes, sources, targets)
+
+    assert positions.shape == (n_nodes, 2) and np.isfinite(positions).all()
+    assert np.abs(positions).max() <= 1.0 + 1e-9
+    edge_length = np.linalg.norm(positions[sources] - positions[targets], axis=1).mean()
+    pairs = rng.integers(0, n_nodes, (2, 5000))
+    random_length = np.linalg.norm(positions[pairs[0]] - positions[pairs[1]], axis=1).mean()
+    assert edge_length < random_length / 5
@@ -0,0 +1,18 @@
+"""Tests for process-pool ensemble execution."""
+
+from __future__ import annotations
+
+from app.config import Settings
+from app.parallel import ParallelEnsembleExecutor
+from app.risk_engine import RiskEngine
+
+
+def test_parallel_ensemble_matches_serial_run() -> None:
+    """Worker count must not change a seeded ensemble result."""
+    engine = RiskEngine(Settings(ensemble_batch_size=16))
+    serial = engine.run_ensemble(64, seed=29)
+
+    with ParallelEnsembleExecutor(max_workers=2) as executor:
+        parallel = engine.run_ensemble(64, seed=29, executor=executor)
+
+    assert parallel.dict(exclude={"generated_at_utc"}) == serial.dict(exclude={"generated_at_utc"})
@@ -0,0 +1,62 @@
+"""Tests for background pre-rendering."""
+
+from __future__ import annotations
+
+import asyncio
+
+from app.compute import ComputeQueueFull
+from app.models import RenderKind
+from app.prerender import Prerenderer
+from app.risk_engine import RiskEngine
+
+
+def test_newer_runs_supersede_pending_prerenders() -> None:
+    """Only the newest run should be rendered in full once a burst has been scheduled."""
+    engine = RiskEngine()
+    runs = [engine.run_simulation_columnar(seed=seed) for seed in range(4)]
+    rendered = []
+
+    async def scenario() -> Prerenderer:
+        started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def render(run, kind, dpi):
+            started.set()
+            await release.wait()
+            rendered.append((runs.index(run), kind, dpi))
+
+        variants = [(RenderKind.GRAPH, 100), (RenderKind.BARCHART, 100), (RenderKind.GRAPH, 200)]
+        prerenderer = Prerenderer(render, variants)
+        prerenderer.schedule(runs[0])
+        await asyncio.wait_for(started.wait(), 5)
+        for run in runs[1:]:
+            prerenderer.schedule(run)
+        release.set()
+        await asyncio.wait_for(prerenderer.idle(), 5)
+        return prerenderer
+
+    prerenderer = asyncio.run(scenario())
+
+    variants = [(RenderKind.GRAPH, 100), (RenderKind.BARCHART, 100), (RenderKind.GRAPH, 200)]
+    assert rendered == [(0, RenderKind.GRAPH, 100), *[(3, kind, dpi) for kind, dpi in variants]]
+    assert prerenderer.superseded == 3 and prerenderer.failed == 0
+
+
+def test_prerender_is_dropped_when_the_compute_queue_is_full() -> None:
+    """A full compute queue should drop the run's remaining variants without failing."""
+    calls = []
+
+    async def render(run, kind, dpi):
+        calls.append(kind)
+        raise ComputeQueueFull("Compute queue is full; retry later.")
+
+    async def scenario() -> Prerenderer:
+        prerenderer = Prerenderer(render, [(RenderKind.GRAPH, 100), (RenderKind.BARCHART, 100)])
+        prerenderer.schedule(RiskEngine().run_simulation_columnar(seed=1))
+        await asyncio.wait_for(prerenderer.idle(), 5)
+        return prerenderer
+
+    prerenderer = asyncio.run(scenario())
+
+    assert calls == [RenderKind.GRAPH]
+    assert (prerenderer.dropped, prerenderer.rendered, prerenderer.failed) == (1, 0, 0)
@@ -2,8 +2,11 @@
 
 from __future__ import annotations
 
+import numpy as np
 import pytest
 
+from app.columnar import DECISION_ORDER
+from app.ensemble import EnsembleAccumulator
 from app.models import DeploymentDecision, SimulationResult
 from app.risk_engine import RiskEngine
 
@@ -51,3 +54,43 @@ def test_decision_thresholds_reflect_risk_score() -> None:
             assert metric.decision == DeploymentDecision.BLOCK_DEPLOYMENT
 
 
+def test_vectorised_classification_matches_scalar_thresholds() -> None:
+    """The array classifier should agree with ``_classify_risk`` at the boundaries."""
+    scores = np.array([0.0, 39.99, 40.0, 69.99, 70.0, 100.0])
+    codes = RiskEngine._classify_risk_array(scores)
+    decoded = [DECISION_ORDER[code] for code in codes]
+    assert decoded == [RiskEngine._classify_risk(score) for score in scores]
+
+
+def test_ensemble_is_reproducible_and_well_formed() -> None:
+    """Seeded ensembles should repeat exactly and report ordered percentiles."""
+    engine = RiskEngine()
+    first = engine.run_ensemble(50, seed=11)
+    second = engine.run_ensemble(50, seed=11)
+
+    assert first.n_runs == 50
+    assert first.dict(exclude={"generated_at_utc"}) == second.dict(exclude={"generated_at_utc"})
+    for service in first.services:
+        assert service.p50_risk <= service.p90_risk <= service.p99_risk
+        assert sum(service.decision_probabilities.values()) == pytest.approx(1.0)
+
+
+def test_ensemble_histograms_merge_exactly_with_bounded_memory() -> None:
+    """Merged histograms should give NumPy's statistics and not grow with the run count."""
+    rng = np.random.default_rng(5)
+    names = ("a", "b", "c")
+    blocks = [np.round(rng.uniform(20, 30, (runs, len(names))), 2) for runs in (1, 40, 400, 4000)]
+    merged = EnsembleAccumulator.empty(names)
+    for block in blocks:
+        partial = EnsembleAccumulator.empty(names)
+        partial.add(block, np.zeros(block.shape, dtype=np.int8))
+        merged.merge(partial)
+
+    scores = np.concatenate(blocks)
+    result = merged.summarise()
+    assert result.n_runs == len(scores)
+    assert [service.mean_risk for service in result.services] == np.round(scores.mean(axis=0), 2).tolist()
+    assert [[service.p50_risk, service.p90_risk, service.p99_risk] for service in result.services] == (
+        np.round(np.percentile(scores, (50, 90, 99), axis=0), 2).T.tolist()
+    )
+    assert len(merged.risk_bins) <= len(names) * 1001
@@ -0,0 +1,61 @@
+"""Tests for the per-service time-series index."""
+
+from __future__ import annotations
+
+import dataclasses
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from app.config import Settings
+from app.risk_engine import RiskEngine
+from app.series import ServiceSeriesIndex
+from app.storage import SimulationStorage
+
+_EPOCH = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _runs(count: int):
+    engine = RiskEngine()
+    for seed in range(count):
+        run = engine.run_simulation_columnar(seed=seed)
+        summary = run.summary.copy(update={"timestamp_utc": _EPOCH + timedelta(minutes=seed)})
+        yield dataclasses.replace(run, summary=summary)
+
+
+def test_series_index_filters_by_time_and_keeps_retention() -> None:
+    """Range queries use the index and only the last ``retention`` points survive."""
+    runs = list(_runs(10))
+    index = ServiceSeriesIndex(retention=6)
+    for run in runs:
+        index.append(run)
+
+    service = runs[0].service_names[0]
+    everything = index.series(service)
+    assert len(everything) == 6
+    np.testing.assert_array_equal(
+        everything.risk_scores, [run.table.risk_scores[0] for run in runs[4:]]
+    )
+
+    window = index.series(service, _EPOCH + timedelta(minutes=5), _EPOCH + timedelta(minutes=8))
+    assert window.timestamps.astype(datetime).tolist() == [
+        (_EPOCH + timedelta(minutes=minute)).replace(tzinfo=None) for minute in (5, 6, 7)
+    ]
+    assert index.series("unknown-service") is None
+
+
+def test_downsample_keeps_worst_decision_and_mean_risk() -> None:
+    """Buckets average risk but never hide a more restrictive decision."""
+    storage = SimulationStorage(Settings(history_limit=100))
+    runs = list(_runs(9))
+    for run in runs:
+        storage.record_run(run)
+
+    service = runs[0].service_names[0]
+    series = storage.service_series(service)
+    sampled = series.downsample(3)
+
+    assert len(sampled) == 3
+    np.testing.assert_allclose(sampled.risk_scores, series.risk_scores.reshape(3, 3).mean(axis=1))
+    np.testing.assert_array_equal(sampled.decision_codes, series.decision_codes.reshape(3, 3).max(axis=1))
+    np.testing.assert_array_equal(sampled.timestamps, series.timestamps[2::3])
@@ -0,0 +1,135 @@
+"""Tests for columnar result storage."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+from pydantic import ValidationError
+
+from app.columnar import ColumnarResult
+from app.config import Settings
+from app.exporters import iter_export
+from app.models import ExportFormat
+from app.ring_buffer import HistoryOverwritten, HistoryRing
+from app.risk_engine import RiskEngine
+from app.storage import STREAM_CHUNK_RUNS, SimulationStorage
+
+
+def test_columnar_run_round_trips_to_models() -> None:
+    """Columnar runs should materialise the same models as the legacy path."""
+    engine = RiskEngine()
+    run = engine.run_simulation_columnar(history=[], seed=11)
+    model = engine.run_simulation(history=[], seed=11)
+
+    assert run.to_model().dict(exclude={"summary"}) == model.dict(exclude={"summary"})
+    restored = ColumnarResult.from_model(model)
+    assert restored.edge_names() == run.edge_names()
+    assert restored.table.decisions() == run.table.decisions()
+
+
+def test_storage_keeps_runs_columnar_within_limit() -> None:
+    """Storage should hold columnar runs and trim history to the configured limit."""
+    engine = RiskEngine()
+    storage = SimulationStorage(Settings(history_limit=3))
+    for seed in range(5):
+        storage.record_run(engine.run_simulation_columnar(storage.snapshot(), seed=seed))
+
+    snapshot = storage.snapshot()
+    assert len(snapshot) == 3
+    assert all(isinstance(run, ColumnarResult) for run in snapshot)
+    assert storage.latest_run.summary == snapshot[-1].summary
+    assert [record.summary for record in storage.history] == [run.summary for run in snapshot]
+    assert snapshot[-1].nbytes < len(storage.latest_result.json())
+
+
+def test_history_ring_overwrites_oldest_slot_without_reallocating() -> None:
+    """Appends past capacity reuse the same arrays and views expose the newest runs."""
+    engine = RiskEngine()
+    ring = HistoryRing(capacity=3)
+    runs = [engine.run_simulation_columnar(seed=seed) for seed in range(5)]
+    ring.append(runs[0])
+    buffers = ring.nbytes
+
+    for run in runs[1:]:
+        ring.append(run)
+
+    view = ring.view()
+    assert ring.nbytes == buffers and len(view) == 3
+    assert [entry.summary for entry in view] == [run.summary for run in runs[2:]]
+    assert np.shares_memory(view[0].table.metrics, view[-1].table.metrics) is False
+    assert not view[-1].table.metrics.flags.writeable
+
+    detached = view[-1:].detach()[0]
+    ring.append(runs[0])
+    np.testing.assert_array_equal(detached.table.metrics, runs[4].table.metrics)
+    assert ring.view()[0].summary == runs[3].summary
+
+
+def test_history_views_refuse_runs_overwritten_after_they_were_taken() -> None:
+    """A held snapshot must never yield newer runs or see fetched entries change."""
+    engine = RiskEngine()
+    storage = SimulationStorage(Settings(history_limit=3))
+    runs = [storage.record_run(engine.run_simulation_columnar(seed=seed)) for seed in range(3)]
+    snapshot = storage.snapshot()
+    fetched = snapshot[0]
+
+    for seed in range(3, 5):
+        storage.record_run(engine.run_simulation_columnar(seed=seed))
+
+    with pytest.raises(HistoryOverwritten):
+        list(snapshot)
+    with pytest.raises(HistoryOverwritten):
+        snapshot.detach()
+    assert fetched.summary == runs[0].summary
+    np.testing.assert_array_equal(fetched.table.metrics, runs[0].table.metrics)
+    assert [run.summary for run in snapshot[2:]] == [runs[2].summary]
+
+
+def test_history_limit_must_fit_the_memory_budget() -> None:
+    """A hot tier too large for the configured services should be rejected at start-up."""
+    services = [f"svc-{index}" for index in range(4000)]
+    assert Settings(history_limit=100, service_names=services).history_limit == 100
+    with pytest.raises(ValidationError, match="history_max_bytes"):
+        Settings(history_limit=1000, service_names=services)
+    with pytest.raises(ValidationError):
+        Settings(history_limit=1_000_000)
+
+
+def test_runs_recorded_out_of_order_are_restamped_in_order() -> None:
+    """A run computed earlier but recorded later must not fall out of time-range queries."""
+    engine = RiskEngine()
+    storage = SimulationStorage(Settings(history_limit=5))
+    slow = engine.run_simulation_columnar(seed=1)
+    fast = engine.run_simulation_columnar(seed=2)
+
+    first = storage.record_run(fast)
+    second = storage.record_run(slow)
+
+    assert first.summary.timestamp_utc <= second.summary.timestamp_utc
+    assert storage.latest_run is second
+    window = storage.snapshot().between(start=first.summary.timestamp_utc)
+    assert [run.summary for run in window] == [first.summary, second.summary]
+    service = slow.service_names[0]
+    assert len(storage.service_series(service, start=first.summary.timestamp_utc)) == 2
+
+
+def test_streaming_history_copies_one_bounded_chunk_at_a_time(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Exporting many runs must copy them out of the ring a fixed-size chunk at a time."""
+    run = RiskEngine().run_simulation_columnar(seed=0)
+    storage = SimulationStorage(Settings(history_limit=1000))
+    for _ in range(1000):
+        storage.record_run(run)
+    copied = []
+    entries = HistoryRing.entries
+    monkeypatch.setattr(
+        HistoryRing,
+        "entries",
+        lambda ring, start, stop: copied.append(stop - start) or entries(ring, start, stop),
+    )
+
+    stream = storage.iter_runs()
+    assert copied == [STREAM_CHUNK_RUNS]
+    rows = sum(chunk.count(b"\n") for chunk in iter_export(stream, ExportFormat.CSV)) - 1
+
+    assert rows == 1000 * len(run.service_names)
+    assert sum(copied) == 1000 and max(copied) == STREAM_CHUNK_RUNS
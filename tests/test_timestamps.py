@@ -0,0 +1,21 @@
+"""Tests for the shared UTC timestamp helpers."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from app.timestamps import as_datetime64, epoch_micros, from_datetime64, naive_utc, utc_day
+
+
+def test_naive_and_aware_datetimes_map_to_the_same_utc_instant() -> None:
+    """Naive inputs are UTC, offsets are converted, and microseconds stay exact."""
+    aware = datetime(2024, 3, 1, 0, 30, 0, 123457, tzinfo=timezone(timedelta(hours=2)))
+    naive = datetime(2024, 2, 29, 22, 30, 0, 123457)
+
+    assert epoch_micros(aware) == epoch_micros(naive) == 1_709_245_800_123_457
+    assert as_datetime64(aware) == np.datetime64("2024-02-29T22:30:00.123457", "us")
+    assert utc_day(aware) == utc_day(naive) == "2024-02-29"
+    assert naive_utc(aware) == naive
+    assert from_datetime64(as_datetime64(aware)) == aware
@@ -0,0 +1,98 @@
+"""Tests for the Matplotlib renderers."""
+
+from __future__ import annotations
+
+import dataclasses
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+from matplotlib.collections import LineCollection, PathCollection
+
+from app import viz
+from app.clustering import cluster_services
+from app.columnar import ColumnarResult, ServiceScoreTable
+from app.models import ClusterRisk
+from app.risk_engine import RiskEngine
+from app.viz import render_dependency_graph, render_risk_barchart
+
+
+def _large_run(n_services: int) -> ColumnarResult:
+    """A synthetic run with ``n_services`` services and local random dependencies."""
+    rng = np.random.default_rng(0)
+    sources = rng.integers(0, n_services, 2 * n_services)
+    targets = (sources + rng.integers(1, 50, 2 * n_services)) % n_services
+    table = ServiceScoreTable(
+        tuple(f"svc-{index}" for index in range(n_services)),
+        rng.random((n_services, 6)) * 100,
+        rng.integers(0, 3, n_services).astype(np.int8),
+    )
+    base = RiskEngine().run_simulation_columnar(seed=0)
+    return dataclasses.replace(
+        base, table=table, edge_sources=sources.astype(np.int32), edge_targets=targets.astype(np.int32)
+    )
+
+
+def test_concurrent_renders_match_serial_renders() -> None:
+    """Renders in parallel threads should be byte-identical and leave pyplot unused."""
+    engine = RiskEngine()
+    runs = [engine.run_simulation_columnar(seed=seed) for seed in range(3)]
+    jobs = [(render, run) for run in runs for render in (render_dependency_graph, render_risk_barchart)]
+    serial = [render(run, 40) for render, run in jobs]
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        parallel = list(pool.map(lambda job: job[0](job[1], 40), jobs * 2))
+
+    assert parallel == serial * 2
+    assert all(png.startswith(b"\x89PNG") for png in serial)
+    if "matplotlib.pyplot" in sys.modules:
+        import matplotlib.pyplot as plt
+
+        assert not plt.get_fignums()
+
+
+def test_cluster_services_bounds_clusters_and_keeps_communities_together() -> None:
+    """Clusters should never straddle disconnected groups and their count stays bounded."""
+    rng = np.random.default_rng(1)
+    groups, size = 40, 25
+    sources = rng.integers(0, size, 8 * groups * size) + np.repeat(np.arange(groups) * size, 8 * size)
+    targets = rng.integers(0, size, len(sources)) + np.repeat(np.arange(groups) * size, 8 * size)
+
+    clusters = cluster_services(groups * size, sources, targets, max_clusters=2 * groups)
+
+    assert len(clusters) <= 2 * groups and clusters.sizes.sum() == groups * size
+    group_of = np.arange(groups * size) // size
+    for cluster in range(len(clusters)):
+        assert len(np.unique(group_of[clusters.labels == cluster])) == 1
+    risk = np.arange(groups * size, dtype=float)
+    assert clusters.risk(risk, ClusterRisk.MAX).max() == risk.max()
+    assert np.isclose(
+        (clusters.risk(risk, ClusterRisk.MEAN) * clusters.sizes).sum(), risk.sum()
+    )
+
+
+def test_large_runs_render_aggregated_views(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Ten thousand services should be drawn as bounded clusters and a top-K chart."""
+    run = _large_run(10_000)
+    figures = []
+    monkeypatch.setattr(viz, "_to_png", lambda figure, dpi: figures.append(figure) or b"")
+
+    render_dependency_graph(run, 100, max_nodes=200, max_clusters=150)
+    render_risk_barchart(run, 100, max_bars=40)
+
+    graph_ax = figures[0].axes[0]
+    (edges,) = [item for item in graph_ax.collections if isinstance(item, LineCollection)]
+    (nodes,) = [item for item in graph_ax.collections if isinstance(item, PathCollection)]
+    assert len(nodes.get_offsets()) <= 150 and len(edges.get_segments()) > 0
+    assert "10000 services in" in graph_ax.get_title()
+    bar_ax, histogram_ax = figures[1].axes
+    assert len(bar_ax.patches) == 40 and len(bar_ax.get_xticklabels()) == 40
+    assert sum(patch.get_height() for patch in histogram_ax.patches) == 10_000
+
+
+def test_cluster_risk_aggregate_changes_the_render() -> None:
+    """Max and mean cluster risk should colour the clustered graph differently."""
+    run = _large_run(1_000)
+    by_max = render_dependency_graph(run, 40)
+    assert render_dependency_graph(run, 40, cluster_risk=ClusterRisk.MEAN) != by_max